@@ -6,7 +6,11 @@ Two reference policies that bracket the LLM agents:
   - greedy : apply rank_moves[0] each step (pure value-net greedy) — the ceiling
              the intuition-equipped LLM could reach if it always took the top move.
 
-Run at high N (cheap, no network) to anchor the figure.
+Run at high N (cheap, no network) to anchor the figure. The sweep runs all
+seeds of a depth in lockstep (*_solve_many): every greedy step scores the
+18 children of every unfinished cube in one value forward
+(CubeSession.rank_moves_many). The per-seed functions are kept as the
+reference (--serial); both give identical results.
 
     uv run python source/ablation_baselines.py --n 100 --depths 1-12
 """
@@ -22,7 +26,8 @@ _SRC = Path(__file__).resolve().parent
 if str(_SRC) not in sys.path:
     sys.path.insert(0, str(_SRC))
 
-from cube_tools import CubeSession, NOTATION  # noqa: E402
+from cube_tools import (CubeSession, DEFAULT_VALUE_CKPT, NOTATION,  # noqa: E402
+                        VALUE_MODELS)
 
 try:
     from data import _INV_IDX  # noqa: E402
@@ -36,43 +41,79 @@ def _budget(depth: int) -> int:
 
 def random_solve(seed: int, depth: int) -> bool:
     s = CubeSession(seed=seed)
-    s.scramble(depth)
+    s.scramble(depth, render=False)
     rng = random.Random(seed * 7919 + 1)
     last = -1
     for _ in range(_budget(depth)):
-        if s.observe()["is_solved"]:
+        if s.solved_counts()["is_solved"]:
             return True
         i = rng.randrange(18)
         if _INV_IDX is not None and last >= 0:
             while i == _INV_IDX[last]:
                 i = rng.randrange(18)
-        s.apply(NOTATION[i])
+        s.apply(NOTATION[i], render=False)
         last = i
-    return s.observe()["is_solved"]
+    return s.solved_counts()["is_solved"]
 
 
-def greedy_solve(seed: int, depth: int) -> bool:
+def greedy_solve(seed: int, depth: int, ckpt: str = DEFAULT_VALUE_CKPT) -> bool:
     """Perfect greedy on the learned value (the good heuristic) = the ceiling."""
-    s = CubeSession(seed=seed)
-    s.scramble(depth)
+    s = CubeSession(seed=seed, value_ckpt=ckpt)
+    s.scramble(depth, render=False)
     for _ in range(_budget(depth)):
-        if s.observe()["is_solved"]:
+        if s.solved_counts()["is_solved"]:
             return True
         best = s.rank_moves()["ranked_moves"][0]
-        s.apply(best["move"])
-    return s.observe()["is_solved"]
+        s.apply(best["move"], render=False)
+    return s.solved_counts()["is_solved"]
 
 
 def greedy_pieces_solve(seed: int, depth: int) -> bool:
     """Perfect greedy on pieces_solved (the bad heuristic the blind agent has)."""
     s = CubeSession(seed=seed)
-    s.scramble(depth)
+    s.scramble(depth, render=False)
     for _ in range(_budget(depth)):
-        if s.observe()["is_solved"]:
+        if s.solved_counts()["is_solved"]:
             return True
         best = s.rank_moves_pieces()["ranked_moves"][0]
-        s.apply(best["move"])
-    return s.observe()["is_solved"]
+        s.apply(best["move"], render=False)
+    return s.solved_counts()["is_solved"]
+
+
+def _lockstep(seeds: list[int], depth: int, pick, ckpt: str = DEFAULT_VALUE_CKPT) -> list[bool]:
+    """Run one session per seed, advancing the unfinished ones together.
+    pick(sessions) -> the move each of them applies next."""
+    sessions = [CubeSession(seed=seed, value_ckpt=ckpt) for seed in seeds]
+    for s in sessions:
+        s.scramble(depth, render=False)
+    active = sessions
+    for _ in range(_budget(depth)):
+        active = [s for s in active if not s.solved_counts()["is_solved"]]
+        if not active:
+            break
+        for s, move in zip(active, pick(active)):
+            s.apply(move, render=False)
+    return [s.solved_counts()["is_solved"] for s in sessions]
+
+
+def random_solve_many(seeds: list[int], depth: int) -> list[bool]:
+    # no model to batch: the per-seed RNG streams are simply run one by one
+    return [random_solve(seed, depth) for seed in seeds]
+
+
+def greedy_solve_many(seeds: list[int], depth: int,
+                      ckpt: str = DEFAULT_VALUE_CKPT) -> list[bool]:
+    """greedy_solve for many seeds; one forward of len(active) x 19 rows per step."""
+    def pick(active):
+        return [r["ranked_moves"][0]["move"]
+                for r in CubeSession.rank_moves_many(active)]
+    return _lockstep(seeds, depth, pick, ckpt)
+
+
+def greedy_pieces_solve_many(seeds: list[int], depth: int) -> list[bool]:
+    return _lockstep(seeds, depth,
+                     lambda active: [s.rank_moves_pieces()["ranked_moves"][0]["move"]
+                                     for s in active])
 
 
 def _parse_depths(spec: str) -> list[int]:
@@ -87,6 +128,10 @@ def main() -> None:
     ap.add_argument("--n", type=int, default=100)
     ap.add_argument("--depths", default="1-12")
     ap.add_argument("--out", default="")
+    ap.add_argument("--ckpt", default=DEFAULT_VALUE_CKPT,
+                    help="value checkpoint for gr_value (loaded once, shared)")
+    ap.add_argument("--serial", action="store_true",
+                    help="run seeds one at a time (reference path) instead of lockstep")
     args = ap.parse_args()
 
     depths = _parse_depths(args.depths)
@@ -98,11 +143,20 @@ def main() -> None:
             logf.write(m + "\n"); logf.flush()
 
     log(f"=== deterministic baselines | n={args.n} depths={depths} ===")
+    for r in VALUE_MODELS.preload(args.ckpt):
+        log(f"value model: {r['path']} [{r['hash']}] loaded in "
+            f"{r['load_secs']:.2f}s, {r['param_mb']:.1f} MB params")
     log(f"{'depth':>5} {'random':>8} {'gr_pieces':>10} {'gr_value':>9}")
+    seeds = list(range(args.n))
     for d in depths:
-        r = sum(random_solve(seed, d) for seed in range(args.n))
-        gp = sum(greedy_pieces_solve(seed, d) for seed in range(args.n))
-        gv = sum(greedy_solve(seed, d) for seed in range(args.n))
+        if args.serial:
+            r = sum(random_solve(seed, d) for seed in seeds)
+            gp = sum(greedy_pieces_solve(seed, d) for seed in seeds)
+            gv = sum(greedy_solve(seed, d, args.ckpt) for seed in seeds)
+        else:
+            r = sum(random_solve_many(seeds, d))
+            gp = sum(greedy_pieces_solve_many(seeds, d))
+            gv = sum(greedy_solve_many(seeds, d, args.ckpt))
         log(f"{d:>5} {r/args.n:>8.2f} {gp/args.n:>10.2f} {gv/args.n:>9.2f}")
     if logf:
         logf.close()
@@ -0,0 +1,402 @@
+"""Micro-benchmarks for the cube kernels, solver stages and search engines.
+
+Every benchmark times one small operation (a compose, a batch, one CFOP
+stage, one model forward, one rollout) and reports the median / min seconds
+per operation over several repeats. Results are written as a JSON baseline;
+`compare` reads two baselines and flags every benchmark that got slower than
+the noise threshold, exiting non-zero so it can gate CI.
+
+Runs on CPU (MLX default device is forced to cpu unless --device gpu).
+
+Usage
+-----
+    uv run python source/bench.py run --out runs/bench/base.json
+    uv run python source/bench.py run --quick --filter cfop
+    uv run python source/bench.py compare runs/bench/base.json runs/bench/new.json
+    uv run python source/bench.py compare runs/bench/base.json   # re-runs now
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import mlx.core as mx
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / "cube"))
+
+# A benchmark is a setup function returning (op, items): op() performs one
+# timed operation and processes `items` units (scrambles, samples, ...).
+_BENCHMARKS: dict[str, dict] = {}
+
+
+def benchmark(name: str, unit: str = "op", slow: bool = False):
+    """Register a setup function under `name` (slow ones are skipped by --quick)."""
+    def deco(setup: Callable[[], tuple[Callable[[], object], int]]):
+        _BENCHMARKS[name] = {"setup": setup, "unit": unit, "slow": slow}
+        return setup
+    return deco
+
+
+def _quiet():
+    """Swallow the progress prints of the cfop / data builders."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _scrambles(n: int, depth: int, seed: int = 0) -> list[tuple]:
+    from data import generate_walk_states
+    return generate_walk_states(n, depth, random.Random(seed))
+
+
+# ---------------------------------------------------------------------------
+# State kernels
+# ---------------------------------------------------------------------------
+
+@benchmark("state.matmul")
+def _bench_state_matmul():
+    from state import MOVES
+    a, b = MOVES["R"] @ MOVES["U"], MOVES["F"]
+
+    def op():
+        s = a @ b
+        mx.eval(s.corner_positions, s.corner_orientations,
+                s.edge_positions, s.edge_orientations)
+    return op, 1
+
+
+@benchmark("state.invert")
+def _bench_state_invert():
+    from state import MOVES
+    a = MOVES["R"] @ MOVES["U"] @ MOVES["F"]
+
+    def op():
+        s = ~a
+        mx.eval(s.corner_positions, s.corner_orientations,
+                s.edge_positions, s.edge_orientations)
+    return op, 1
+
+
+@benchmark("data._compose")
+def _bench_compose():
+    from data import _compose
+    a, b = _scrambles(2, 20)
+    return (lambda: _compose(a, b)), 1
+
+
+@benchmark("vis_util.state_to_net")
+def _bench_state_to_net():
+    from state import MOVES
+    from vis_util import state_to_net
+    s = MOVES["R"] @ MOVES["U"] @ MOVES["F"]
+    return (lambda: mx.eval(state_to_net(s))), 1
+
+
+# ---------------------------------------------------------------------------
+# Batch generators (per sample)
+# ---------------------------------------------------------------------------
+
+_GEN_BATCH = 64
+
+
+def _batch_bench(fn_name: str, **kwargs):
+    def setup():
+        import data
+        fn = getattr(data, fn_name)
+        random.seed(0)
+
+        def op():
+            mx.eval(*fn(_GEN_BATCH, **kwargs).values())
+        return op, _GEN_BATCH
+    return setup
+
+
+benchmark("data.generate_batch", unit="sample")(_batch_bench("generate_batch"))
+benchmark("data.generate_batch_hindsight", unit="sample")(
+    _batch_bench("generate_batch_hindsight"))
+benchmark("data.generate_batch_value_iter", unit="sample")(
+    _batch_bench("generate_batch_value_iter"))
+benchmark("data.cfop_batch", unit="sample", slow=True)(
+    _batch_bench("cfop_batch", scramble_depth=25))
+
+
+# ---------------------------------------------------------------------------
+# CFOP stages
+# ---------------------------------------------------------------------------
+
+@benchmark("cfop._build_cross_table", slow=True)
+def _bench_cross_table():
+    with _quiet():
+        import cfop
+
+    def op():
+        with _quiet():
+            cfop._build_cross_table()
+    return op, 1
+
+
+@benchmark("cfop._solve_f2l", unit="scramble")
+def _bench_solve_f2l():
+    with _quiet():
+        import cfop
+    crossed = []
+    for s in _scrambles(8, 25, seed=1):
+        crossed.append(cfop._apply_moves(s, cfop._solve_cross(s)))
+
+    def op():
+        for s in crossed:
+            cfop._solve_f2l(s)
+    return op, len(crossed)
+
+
+@benchmark("cfop.solve", unit="scramble")
+def _bench_cfop_solve():
+    with _quiet():
+        import cfop
+    scrambles = _scrambles(8, 25, seed=2)
+
+    def op():
+        for s in scrambles:
+            cfop.solve(s)
+    return op, len(scrambles)
+
+
+# ---------------------------------------------------------------------------
+# Model forward and search engines
+# ---------------------------------------------------------------------------
+
+_BENCH_MODEL_CFG = {"d_model": 128, "n_layers": 4, "n_heads": 4, "ffn_mult": 4}
+_MODEL = {}
+
+
+def _model():
+    """An untrained, fixed-seed CubeSolver (weights do not change the cost)."""
+    if "m" not in _MODEL:
+        from model.solver import CubeSolver
+        mx.random.seed(0)
+        m = CubeSolver(**_BENCH_MODEL_CFG)
+        mx.eval(m.parameters())
+        _MODEL["m"] = m
+    return _MODEL["m"]
+
+
+def _forward_bench(batch: int):
+    def setup():
+        with _quiet():
+            from infer import states_to_arrays
+        from data import _IDENTITY
+        model = _model()
+        curr = states_to_arrays(_scrambles(batch, 20))
+        goal = states_to_arrays([_IDENTITY] * batch)
+        t = mx.full((batch,), 20, dtype=mx.int32)
+        mx.eval(*curr, *goal, t)
+        return (lambda: mx.eval(model(goal, curr, t))), batch
+    return setup
+
+
+for _b in (1, 64, 512):
+    benchmark(f"model.forward[b={_b}]", unit="sample")(_forward_bench(_b))
+
+
+_SEARCH_N, _SEARCH_DEPTH, _SEARCH_STEPS = 4, 8, 12
+
+
+def _search_bench(spec: str):
+    def setup():
+        with _quiet():
+            import infer
+        search, width = infer.parse_search_spec(spec)
+        model = _model()
+        scrambles = _scrambles(_SEARCH_N, _SEARCH_DEPTH, seed=3)
+
+        def op():
+            infer._run_search(model, scrambles, _SEARCH_DEPTH, _SEARCH_STEPS,
+                              search, width, t_const=_SEARCH_DEPTH)
+        return op, _SEARCH_N
+    return setup
+
+
+for _spec in ("greedy", "beam:8", "value-beam:8", "value-astar:8"):
+    benchmark(f"infer.{_spec}", unit="scramble")(_search_bench(_spec))
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _time_op(op: Callable[[], object], min_time: float, repeats: int) -> tuple[int, list[float]]:
+    """Calibrate the loop count so one repeat takes ~min_time, then time
+    `repeats` repeats. Returns (number, seconds per op for every repeat)."""
+    op()  # warm-up (lazy imports, MLX kernel compilation)
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            op()
+        dt = time.perf_counter() - t0
+        if dt >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if dt <= 0 else max(2, min(10, int(min_time / dt) + 1))
+    times = [dt / number]
+    for _ in range(repeats - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            op()
+        times.append((time.perf_counter() - t0) / number)
+    return number, times
+
+
+def run(
+    pattern: str | None = None,
+    quick: bool = False,
+    repeats: int = 5,
+    min_time: float = 0.2,
+    verbose: bool = True,
+) -> dict:
+    """Run every registered benchmark whose name matches `pattern` (regex).
+
+    Returns the baseline dict: {"meta": {...}, "results": {name: {...}}} with
+    per-op and per-item (scramble / sample) median and min seconds.
+    """
+    results: dict[str, dict] = {}
+    for name, spec in _BENCHMARKS.items():
+        if pattern and not re.search(pattern, name):
+            continue
+        if quick and spec["slow"]:
+            continue
+        op, items = spec["setup"]()
+        reps = 1 if spec["slow"] else repeats
+        number, times = _time_op(op, min_time, reps)
+        med, best = statistics.median(times), min(times)
+        results[name] = {
+            "unit": spec["unit"], "items": items, "number": number,
+            "repeats": reps, "median_s": med, "min_s": best,
+            "median_per_item_s": med / items,
+            "stdev_s": statistics.stdev(times) if len(times) > 1 else 0.0,
+        }
+        if verbose:
+            print(f"  {name:<34} {_fmt_s(med / items):>10}/{spec['unit']:<8} "
+                  f"(min {_fmt_s(best / items)}, x{number}x{reps})", flush=True)
+    return {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "mlx": getattr(mx, "__version__", "?"),
+            "device": str(mx.default_device()),
+            "quick": quick, "repeats": repeats, "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def compare(base: dict, new: dict, threshold: float = 0.15) -> list[dict]:
+    """Compare two baselines benchmark by benchmark.
+
+    A benchmark regresses when both its median and its min got slower than
+    (1 + threshold) x the baseline -- requiring both keeps a single noisy
+    repeat from flagging. Returns one row per benchmark present in both.
+    """
+    rows = []
+    for name, b in base["results"].items():
+        n = new["results"].get(name)
+        if n is None:
+            continue
+        ratio = n["median_s"] / b["median_s"] if b["median_s"] > 0 else float("inf")
+        min_ratio = n["min_s"] / b["min_s"] if b["min_s"] > 0 else float("inf")
+        if ratio > 1 + threshold and min_ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 / (1 + threshold) and min_ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({"name": name, "base_s": b["median_s"], "new_s": n["median_s"],
+                     "ratio": ratio, "status": status})
+    return rows
+
+
+def _fmt_s(sec: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if sec >= scale:
+            return f"{sec / scale:.2f}{unit}"
+    return f"{sec / 1e-9:.0f}ns"
+
+
+def _print_compare(rows: list[dict]) -> None:
+    print(f"\n  {'benchmark':<34} {'base':>10} {'new':>10} {'ratio':>7}  status")
+    print("  " + "-" * 72)
+    for r in rows:
+        print(f"  {r['name']:<34} {_fmt_s(r['base_s']):>10} {_fmt_s(r['new_s']):>10} "
+              f"{r['ratio']:>6.2f}x  {r['status']}")
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cube kernel / solver micro-benchmarks.")
+    parser.add_argument("--device", choices=["cpu", "gpu"], default="cpu")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    def add_run_args(p):
+        p.add_argument("--filter", default=None, help="Regex on benchmark names.")
+        p.add_argument("--quick", action="store_true",
+                       help="Skip slow benchmarks (cross-table build, cfop_batch).")
+        p.add_argument("--repeats", type=int, default=5)
+        p.add_argument("--min-time", type=float, default=0.2,
+                       help="Target seconds per repeat (loop count is calibrated).")
+
+    p_run = sub.add_parser("run", help="Run the suite and write a JSON baseline.")
+    add_run_args(p_run)
+    p_run.add_argument("--out", default=None, help="Write the baseline JSON here.")
+
+    p_cmp = sub.add_parser("compare", help="Flag regressions against a baseline.")
+    p_cmp.add_argument("base", help="Baseline JSON.")
+    p_cmp.add_argument("new", nargs="?", default=None,
+                       help="Second baseline JSON (default: run the suite now).")
+    p_cmp.add_argument("--threshold", type=float, default=0.15,
+                       help="Relative slowdown tolerated as noise (default 0.15).")
+    add_run_args(p_cmp)
+
+    sub.add_parser("list", help="List benchmark names.")
+    args = parser.parse_args()
+    mx.set_default_device(mx.cpu if args.device == "cpu" else mx.gpu)
+
+    if args.cmd == "list":
+        for name, spec in _BENCHMARKS.items():
+            print(f"  {name:<34} per {spec['unit']}{'  (slow)' if spec['slow'] else ''}")
+        return
+
+    if args.cmd == "run":
+        res = run(args.filter, args.quick, args.repeats, args.min_time)
+        if args.out:
+            Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+            Path(args.out).write_text(json.dumps(res, indent=2))
+            print(f"wrote {args.out}")
+        return
+
+    base = json.loads(Path(args.base).read_text())
+    if args.new:
+        new = json.loads(Path(args.new).read_text())
+    else:
+        pattern = args.filter or "|".join(re.escape(k) for k in base["results"])
+        new = run(pattern, args.quick, args.repeats, args.min_time)
+    rows = compare(base, new, args.threshold)
+    _print_compare(rows)
+    n_reg = sum(r["status"] == "REGRESSION" for r in rows)
+    print(f"\n{n_reg} regression(s) beyond {args.threshold:.0%}")
+    sys.exit(1 if n_reg else 0)
+
+
+if __name__ == "__main__":
+    main()
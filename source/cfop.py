@@ -1,8 +1,10 @@
 """CFOP solver for behavioral cloning data generation.
 
 Stages:
-  1. Cross — solve 4 D-layer edges        (BFS, all 18 moves, depth ≤ 8)
-  2. F2L   — solve 4 corner-edge pairs     (BFS per pair, no-D moves)
+  1. Cross — solve 4 D-layer edges        (table lookup, depth ≤ 8; optionally
+                                           on any face via whole-cube rotation)
+  2. F2L   — solve 4 corner-edge pairs     (IDA* per pair, XCross /
+                                           pair+pair pattern databases)
   3. OLL   — orient last layer             (precomputed LL table)
   4. PLL   — permute last layer            (precomputed LL table)
 
@@ -10,8 +12,12 @@ Why the LL tables are built over a *subgroup*
 ---------------------------------------------
 After Cross+F2L the first two layers are fixed; only the U layer (corners
 0-3, edges 4-7) varies. That last-layer (LL) group has 62 208 elements.
-We build solution tables by BFS over *that* group, using standard
-F2L-preserving algorithms (Sune, T-perm, ...) as macro edges. A naive BFS
+We build solution tables by a shortest-path search over *that* group, using
+standard F2L-preserving algorithms (Sune, T-perm, ...) as macro edges
+weighted by their move count after cancelling same-face turns at the joins,
+so stored solutions are the shortest macro chains in *moves*, not in macro
+applications. Lookups also try the four pre-AUFs and keep the shortest.
+A naive BFS
 over all 18 single moves keyed by U-layer signature instead wanders through
 ~2·10^7 whole-cube states and never terminates in pure Python — that was the
 bug this design replaces.
@@ -27,14 +33,25 @@ Move index convention (same as data.py):
   Index: face_idx * 3 + (turns - 1),  range 0..17
 """
 
+import atexit
+import heapq
+import itertools
+import json
+import mmap
+import multiprocessing as mp
 import pickle
 import random as _random_module
+import statistics
 import sys
 import time
 from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "cube"))
+sys.path.insert(0, str(Path(__file__).parent))
+from data import _join_moves  # noqa: E402
+from group import PermGroup  # noqa: E402
 from state import MOVES  # noqa: E402
 
 # ---------------------------------------------------------------------------
@@ -209,6 +226,18 @@ _GENERATORS_NOTATION = {
     "Ua-perm":   "R U' R U R U R U' R' U' R2",
     "F-EO":      "F R U R' U' F'",
     "H-perm":    "R2 U2 R U2 R2 U2 R2 U2 R U2 R2",
+    "Jb-perm":   "R U R' F' R U R' U' R' F R2 U' R'",
+    "Ja-perm":   "R' U L' U2 R U' R' U2 R L",
+    "Na-perm":   "R U R' U R U R' F' R U R' U' R' F R2 U' R' U2 R U' R'",
+    "Gb-perm":   "R' U' R U D' R2 U R' U R U' R U' R2 D",
+    "V-perm":    "R' U R' U' B' R' B2 U' B' U B' R B R",
+    "T-OLL":     "R U R' U' R' F R F'",
+    "P-OLL":     "R' U' F U R U' R' F' R",
+    "L-OLL":     "F R U R' U' R U R' U' F'",
+    "Pi-OLL":    "R U2 R2 U' R2 U' R2 U2 R",
+    "H-OLL":     "R U R' U R U' R' U R U2 R'",
+    "W-OLL":     "F R U' R' U' R U R' F'",
+    "E-OLL":     "R U R' U' R' F R2 U R' U' F'",
 }
 
 
@@ -228,12 +257,21 @@ def _build_generators() -> list[tuple[tuple, list[int]]]:
     return gens
 
 
+_LL_ORDER = 62208  # 4!·4!/2 permutations x 3^3 twists x 2^3 flips
+
+
+def _ll_group_order(gens: list[tuple[tuple, list[int]]]) -> int:
+    """Order of the group the generator effects span (Schreier–Sims; no BFS).
+    Anything below _LL_ORDER leaves LL states the tables cannot solve."""
+    return PermGroup.from_states(eff for eff, _ in gens).order()
+
+
 # ---------------------------------------------------------------------------
 # Table construction (BFS over the LL group) — observable + cached
 # ---------------------------------------------------------------------------
 
 _CACHE_PATH = Path(__file__).parent / ".cfop_cache.pkl"
-_CACHE_VERSION = 4  # bump when generators / key scheme change
+_CACHE_VERSION = 5  # bump when generators / key scheme change
 
 
 def _build_cross_table() -> dict:
@@ -263,31 +301,41 @@ def _build_cross_table() -> dict:
     return table
 
 
-def _bfs_ll(sources: list[tuple], gens, label: str) -> dict:
-    """Multi-source BFS over the LL group.
-    Returns {ll_key: path_from_source} for every reachable LL state."""
+def _search_ll(sources: list[tuple], gens, label: str, total: int) -> dict:
+    """Multi-source shortest-path search over the LL group (Dijkstra).
+    Edge cost = moves a macro adds after merging with the path's last turn.
+    Returns {ll_key: path_from_source} for every reachable LL state; total
+    (the group order) is only used for progress output."""
     t0 = time.time()
     table: dict = {}
-    queue: deque = deque()
+    heap: list = []
     for src in sources:
         k = _ll_key(src)
         if k not in table:
             table[k] = []
-            queue.append((src, []))
-    n = 0
-    while queue:
-        state, path = queue.popleft()
-        n += 1
-        if n % 5000 == 0:
-            print(f"  [{label}] visited {len(table):>6} states "
+            heap.append((0, len(heap), src))
+    tie = len(heap)
+    done: set = set()
+    while heap:
+        _, _, state = heapq.heappop(heap)
+        key = _ll_key(state)
+        if key in done:
+            continue
+        done.add(key)
+        if len(done) % 5000 == 0:
+            print(f"  [{label}] settled {len(done):>6}/{total} states "
                   f"({time.time() - t0:5.1f}s)", flush=True)
+        path = table[key]
         for eff, seq in gens:
             ns = _compose(state, eff)
             k = _ll_key(ns)
-            if k in table:
+            if k in done:
                 continue
-            table[k] = path + seq
-            queue.append((ns, path + seq))
+            npath = _join_moves(path, seq)
+            if k not in table or len(npath) < len(table[k]):
+                table[k] = npath
+                tie += 1
+                heapq.heappush(heap, (len(npath), tie, ns))
     print(f"  [{label}] done: {len(table)} states ({time.time() - t0:.1f}s)",
           flush=True)
     return table
@@ -303,14 +351,17 @@ def _build_tables() -> dict:
     gens = _build_generators()
     print(f"  generators: {len(_GENERATORS_NOTATION)} algs verified "
           f"F2L-preserving", flush=True)
+    order = _ll_group_order(gens)
+    if order != _LL_ORDER:
+        raise AssertionError(f"generators span {order} of the {_LL_ORDER} LL states")
 
     # Full-LL table: BFS from solved -> path(solved -> state).
-    full = _bfs_ll([_IDENTITY], gens, "LL-full")
+    full = _search_ll([_IDENTITY], gens, "LL-full", order)
 
     # OLL sources = every reachable LL state that is already oriented.
     oll_sources = [_ll_state_from_key(k) for k in full
                    if oll_solved(_ll_state_from_key(k))]
-    oll = _bfs_ll(oll_sources, gens, "OLL")
+    oll = _search_ll(oll_sources, gens, "OLL", order)
 
     return {"version": _CACHE_VERSION, "cross": cross, "full": full, "oll": oll}
 
@@ -343,30 +394,135 @@ _LL_FULL: dict = _TABLES["full"]
 _OLL_TABLE: dict = _TABLES["oll"]
 
 
+# ---------------------------------------------------------------------------
+# Solve-time instrumentation (opt-in)
+# ---------------------------------------------------------------------------
+
+def _histogram(values: list) -> dict:
+    """Summary + power-of-two bucket counts ("<=1", "<=2", "<=4", ...)."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pct(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    buckets: dict[str, int] = {}
+    for v in ordered:
+        edge = 1
+        while edge < v:
+            edge *= 2
+        buckets[f"<={edge}"] = buckets.get(f"<={edge}", 0) + 1
+    return {"count": len(ordered), "mean": statistics.fmean(ordered),
+            "min": ordered[0], "p50": pct(0.5), "p90": pct(0.9),
+            "p99": pct(0.99), "max": ordered[-1], "buckets": buckets}
+
+
+class SolveStats:
+    """Counters collected by solve()/solve_stages() when passed stats=...
+
+    One instance can be shared across many solves (e.g. a whole pool build);
+    every observation is kept so summary() can report histograms:
+
+      stage_ms[stage]   wall time of each Cross / F2L / OLL / PLL call (ms)
+      ida_nodes[pair]   nodes expanded by each _ida_pair call
+      ida_iterations[pair]  IDA* bound iterations of each _ida_pair call
+      deadlock_breaks   deadlock-break searches per F2L solve
+      bfs_nodes         nodes expanded by each deadlock-break _bfs call
+    """
+
+    STAGES = ("cross", "f2l", "oll", "pll")
+
+    def __init__(self):
+        self.n_solves = 0
+        self.stage_ms: dict[str, list[float]] = {s: [] for s in self.STAGES}
+        self.ida_nodes: dict[int, list[int]] = {pi: [] for pi in range(4)}
+        self.ida_iterations: dict[int, list[int]] = {pi: [] for pi in range(4)}
+        self.deadlock_breaks: list[int] = []
+        self.bfs_nodes: list[int] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_ms[name].append((time.perf_counter() - t0) * 1000.0)
+
+    def summary(self) -> dict:
+        """JSON-ready histograms; `stage_share` is each stage's fraction of
+        the total solve time, i.e. where to optimise first."""
+        totals = {s: sum(v) for s, v in self.stage_ms.items()}
+        grand = sum(totals.values()) or 1.0
+        all_nodes = [n for v in self.ida_nodes.values() for n in v]
+        return {
+            "n_solves": self.n_solves,
+            "stage_ms": {s: _histogram(v) for s, v in self.stage_ms.items()},
+            "stage_share": {s: round(t / grand, 4) for s, t in totals.items()},
+            "ida_nodes": _histogram(all_nodes),
+            "ida_nodes_per_pair": {str(pi): _histogram(v)
+                                   for pi, v in self.ida_nodes.items()},
+            "ida_iterations_per_pair": {str(pi): _histogram(v)
+                                        for pi, v in self.ida_iterations.items()},
+            "deadlock_breaks": _histogram(self.deadlock_breaks),
+            "bfs_nodes": _histogram(self.bfs_nodes),
+        }
+
+    def merge(self, other: "SolveStats") -> None:
+        """Fold in the counters of another instance (e.g. from a worker)."""
+        self.n_solves += other.n_solves
+        for s in self.STAGES:
+            self.stage_ms[s].extend(other.stage_ms[s])
+        for pi in range(4):
+            self.ida_nodes[pi].extend(other.ida_nodes[pi])
+            self.ida_iterations[pi].extend(other.ida_iterations[pi])
+        self.deadlock_breaks.extend(other.deadlock_breaks)
+        self.bfs_nodes.extend(other.bfs_nodes)
+
+    def write_json(self, path: str | Path) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(self.summary(), indent=2))
+
+
+@contextmanager
+def _no_timer(name: str):
+    """Stand-in for SolveStats.stage when no stats are collected."""
+    yield
+
+
 # ---------------------------------------------------------------------------
 # Per-instance BFS (Cross, F2L)
 # ---------------------------------------------------------------------------
 
-def _bfs(start: tuple, goal_fn, move_set: list[int], max_depth: int) -> list[int] | None:
+def _bfs(start: tuple, goal_fn, move_set: list[int], max_depth: int,
+         stats: SolveStats | None = None) -> list[int] | None:
     if goal_fn(start):
+        if stats is not None:
+            stats.bfs_nodes.append(0)
         return []
     queue: deque = deque([(start, [])])
     visited: set = {_state_key(start)}
-    while queue:
-        state, path = queue.popleft()
-        if len(path) >= max_depth:
-            continue
-        for mi in move_set:
-            ns = _compose(state, _MOVES_PY[mi])
-            key = _state_key(ns)
-            if key in visited:
+    nodes = 0
+    try:
+        while queue:
+            state, path = queue.popleft()
+            nodes += 1
+            if len(path) >= max_depth:
                 continue
-            visited.add(key)
-            npath = path + [mi]
-            if goal_fn(ns):
-                return npath
-            queue.append((ns, npath))
-    return None
+            for mi in move_set:
+                ns = _compose(state, _MOVES_PY[mi])
+                key = _state_key(ns)
+                if key in visited:
+                    continue
+                visited.add(key)
+                npath = path + [mi]
+                if goal_fn(ns):
+                    return npath
+                queue.append((ns, npath))
+        return None
+    finally:
+        if stats is not None:
+            stats.bfs_nodes.append(nodes)
 
 
 # ---------------------------------------------------------------------------
@@ -444,20 +600,214 @@ def _build_pdbs() -> dict:
 _PDB = _build_pdbs()
 
 
-def _ida_pair(state: tuple, sv: frozenset, pi: int, max_bound: int = 24) -> list[int] | None:
-    """IDA* insertion of pair pi (restricted moves) guided by the pair PDB."""
+# ---------------------------------------------------------------------------
+# Multi-piece pattern databases (XCross, pair+pair)
+# ---------------------------------------------------------------------------
+# Each table tracks 4 pieces under one pair's restricted move set. A piece
+# coordinate is slot*3+twist (corner) or slot*2+flip (edge), both < 24, and the
+# table index is the mixed-radix number sum(coord_k * 24**k). Distances are
+# stored two per byte (low nibble = even index); 0xF marks an entry the BFS
+# never reached and reads as 0, so the heuristic stays admissible.
+#
+#   XCross[pi]      pair pi + the two cross edges its side faces move
+#   pairpair[pi, j] pair pi + an already-solved pair j that shares a face
+#
+# The files are built on the first F2L search, written under .cfop_pdb/ and
+# memory-mapped.
+
+_PDB_DIR = Path(__file__).parent / ".cfop_pdb"
+_PDB_VERSION = 1
+_RADIX = 24
+_NIB_UNKNOWN = 0xF
+
+
+def _coord_move_tables() -> tuple[list[list[int]], list[list[int]]]:
+    """Per-move maps coord -> coord for a single corner / edge piece.
+
+    Composing with move b sends the piece at slot src=b.cp[i] to slot i and
+    adds b.ct[i] to its twist (likewise for edges)."""
+    corner_maps, edge_maps = [], []
+    for bcp, bct, bep, bef in _MOVES_PY:
+        cm = [0] * 24
+        for i in range(8):
+            for t in range(3):
+                cm[bcp[i] * 3 + t] = i * 3 + (t + bct[i]) % 3
+        em = [0] * 24
+        for i in range(12):
+            for f in range(2):
+                em[bep[i] * 2 + f] = i * 2 + (f + bef[i]) % 2
+        corner_maps.append(cm)
+        edge_maps.append(em)
+    return corner_maps, edge_maps
+
+
+_CORNER_COORD_MOVE, _EDGE_COORD_MOVE = _coord_move_tables()
+
+
+def _piece_coords(s: tuple, pieces: tuple) -> int:
+    """Table index of the tracked pieces ((is_corner, piece_id), ...) in s."""
+    cp, ct, ep, ef = s
+    idx = 0
+    scale = 1
+    for is_corner, pid in pieces:
+        if is_corner:
+            slot = cp.index(pid)
+            idx += (slot * 3 + ct[slot]) * scale
+        else:
+            slot = ep.index(pid)
+            idx += (slot * 2 + ef[slot]) * scale
+        scale *= _RADIX
+    return idx
+
+
+def _build_piece_pdb(pieces: tuple, moves: list[int]) -> bytes:
+    """BFS over piece coordinates from solved; returns the nibble-packed table."""
+    n = _RADIX ** len(pieces)
+    dist = bytearray(b"\xff") * n
+    start = _piece_coords(_IDENTITY, pieces)
+    dist[start] = 0
+    maps = [[(_CORNER_COORD_MOVE if is_corner else _EDGE_COORD_MOVE)[mi]
+             for is_corner, _ in pieces] for mi in moves]
+    frontier = [start]
+    depth = 0
+    while frontier:
+        depth += 1
+        nxt = []
+        for idx in frontier:
+            coords = []
+            rest = idx
+            for _ in pieces:
+                rest, c = divmod(rest, _RADIX)
+                coords.append(c)
+            # coords[k] is the k-th tracked piece (least significant first)
+            for piece_maps in maps:
+                j = 0
+                scale = 1
+                for k, c in enumerate(coords):
+                    j += piece_maps[k][c] * scale
+                    scale *= _RADIX
+                if dist[j] == 0xFF:
+                    dist[j] = depth
+                    nxt.append(j)
+        frontier = nxt
+    packed = bytearray((n + 1) // 2)
+    for i in range(0, n, 2):
+        lo = min(dist[i], _NIB_UNKNOWN - 1) if dist[i] != 0xFF else _NIB_UNKNOWN
+        hi = _NIB_UNKNOWN
+        if i + 1 < n and dist[i + 1] != 0xFF:
+            hi = min(dist[i + 1], _NIB_UNKNOWN - 1)
+        packed[i >> 1] = lo | (hi << 4)
+    return bytes(packed)
+
+
+class NibblePDB:
+    """Read-only memory-mapped nibble table (see section comment)."""
+
+    def __init__(self, path: Path, pieces: tuple):
+        self.path = path
+        self.pieces = pieces
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def lookup(self, idx: int) -> int:
+        v = (self._mm[idx >> 1] >> ((idx & 1) << 2)) & 0xF
+        return 0 if v == _NIB_UNKNOWN else v
+
+    def h(self, s: tuple) -> int:
+        return self.lookup(_piece_coords(s, self.pieces))
+
+
+def _pair_pieces(pi: int) -> tuple:
     c, e = _F2L_PAIRS[pi]
-    pdb = _PDB[pi]
+    return ((True, c), (False, e))
+
+
+def _f2l_pdb_specs() -> dict:
+    """name -> (pieces, move set, pair index, required solved pair or None)."""
+    specs = {}
+    for pi in range(4):
+        moved = set().union(*(_FACE_EDGES[f] for f in _SLOT_FACES[pi]))
+        cross = tuple((False, e) for e in _CROSS_EDGES if e in moved)
+        specs[f"xcross_{pi}"] = (_pair_pieces(pi) + cross, _SLOT_MOVES[pi], pi, None)
+        for j in range(4):
+            if j == pi:
+                continue
+            c, e = _F2L_PAIRS[j]
+            touched = any(c in _FACE_CORNERS[f] or e in _FACE_EDGES[f]
+                          for f in _SLOT_FACES[pi] if f != 0)
+            if touched:
+                specs[f"pair_{pi}_{j}"] = (_pair_pieces(pi) + _pair_pieces(j),
+                                           _SLOT_MOVES[pi], pi, j)
+    return specs
+
+
+def _load_f2l_pdbs() -> dict:
+    """Open (building on first use) every multi-piece table.
+
+    Returns {pi: [(required_pair_or_None, NibblePDB), ...]}."""
+    _PDB_DIR.mkdir(exist_ok=True)
+    out: dict = {pi: [] for pi in range(4)}
+    for name, (pieces, moves, pi, need) in _f2l_pdb_specs().items():
+        path = _PDB_DIR / f"{name}.v{_PDB_VERSION}.nib"
+        if not path.exists():
+            t0 = time.time()
+            data = _build_piece_pdb(pieces, moves)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+            print(f"  [PDB] built {name} ({len(data)} bytes, "
+                  f"{time.time() - t0:.1f}s)", flush=True)
+        out[pi].append((need, NibblePDB(path, pieces)))
+    return out
+
+
+_F2L_PDBS: dict | None = None   # _f2l_pdbs(); not opened at import
+
+
+def _f2l_pdbs() -> dict:
+    """The multi-piece tables, opened (and built if missing) on first use, so
+    importing cfop stays cheap for modules that never search F2L."""
+    global _F2L_PDBS
+    if _F2L_PDBS is None:
+        _F2L_PDBS = _load_f2l_pdbs()
+    return _F2L_PDBS
+
+
+def _ida_pair(state: tuple, sv: frozenset, pi: int, max_bound: int = 24,
+              stats: SolveStats | None = None,
+              use_joint: bool = True) -> list[int] | None:
+    """IDA* insertion of pair pi (restricted moves) guided by the max over the
+    XCross table and the pair+pair tables of the already-solved pairs.
+
+    With use_joint=False only the two-piece pair PDB is used (for comparison);
+    both heuristics are admissible, so the returned path is the same."""
     moves = _SLOT_MOVES[pi]
     goal = _f2l_goal(sv, pi)
+    nodes = 0
+
+    if use_joint:
+        tables = [t for need, t in _f2l_pdbs()[pi] if need is None or need in sv]
+
+        def h(s):
+            best = 0
+            for t in tables:
+                v = t.h(s)
+                if v > best:
+                    best = v
+            return best
+    else:
+        c, e = _F2L_PAIRS[pi]
+        pdb = _PDB[pi]
 
-    def h(s):
-        cp, ct, ep, ef = s
-        cs = cp.index(c)
-        es = ep.index(e)
-        return pdb.get((cs, ct[cs], es, ef[es]), 0)
+        def h(s):
+            cp, ct, ep, ef = s
+            cs = cp.index(c)
+            es = ep.index(e)
+            return pdb.get((cs, ct[cs], es, ef[es]), 0)
 
     def dfs(s, g, bound, last, path):
+        nonlocal nodes
+        nodes += 1
         f = g + h(s)
         if f > bound:
             return f
@@ -477,27 +827,37 @@ def _ida_pair(state: tuple, sv: frozenset, pi: int, max_bound: int = 24) -> list
             path.pop()
         return best if best is not None else float("inf")
 
+    def done(result, iterations):
+        if stats is not None:
+            stats.ida_nodes[pi].append(nodes)
+            stats.ida_iterations[pi].append(iterations)
+        return result
+
     bound = h(state)
+    iterations = 0
     while bound <= max_bound:
+        iterations += 1
         path: list[int] = []
         t = dfs(state, 0, bound, -1, path)
         if t is True:
-            return path
+            return done(path, iterations)
         if t == float("inf"):
-            return None
+            return done(None, iterations)
         bound = t
-    return None
+    return done(None, iterations)
 
 
 def _solve_f2l(state: tuple,
                rng: "_random_module.Random | None" = None,
-               randomize: bool = False) -> list[int]:
+               randomize: bool = False,
+               stats: SolveStats | None = None) -> list[int]:
     """Solve the 4 pairs in dynamic order: insert whichever pair is currently
     accessible (shortest first) via PDB-guided IDA*; fall back to a short
     deadlock-break maneuver only when no pair is directly accessible.
 
     When randomize=True and rng is provided, instead of always picking the
     globally shortest solvable pair, a random accessible pair is chosen.
+    stats, if given, receives the IDA* / deadlock-break counters.
     """
     all_moves: list[int] = []
     solved: set[int] = set()
@@ -509,7 +869,7 @@ def _solve_f2l(state: tuple,
         for pi in range(4):
             if pi in solved or not _solvable_now(state, pi):
                 continue
-            mv = _ida_pair(state, sv, pi)
+            mv = _ida_pair(state, sv, pi, stats=stats)
             if mv is not None:
                 candidates.append((len(mv), pi, mv))
 
@@ -537,26 +897,162 @@ def _solve_f2l(state: tuple,
                     and all(_f2l_pair_solved(s, j) for j in sv)
                     and any(_solvable_now(s, pi) for pi in range(4) if pi not in sv))
 
-        mv = _bfs(state, unstick, _F2L_MOVES, max_depth=6)
+        mv = _bfs(state, unstick, _F2L_MOVES, max_depth=6, stats=stats)
         if mv is None:
             raise RuntimeError("F2L stuck (no deadlock-break maneuver)")
         state = _apply_moves(state, mv)
         all_moves.extend(mv)
+    if stats is not None:
+        stats.deadlock_breaks.append(deadlock_breaks)
     return all_moves
 
 
-def _solve_oll(state: tuple) -> list[int]:
-    path = _OLL_TABLE.get(_ll_key(state))
-    if path is None:
-        raise RuntimeError("OLL: LL state not in table (generators incomplete?)")
-    return _invert_seq(path)
+def _ll_lookup(table: dict, state: tuple, pre_auf: bool, label: str) -> list[int]:
+    """Table solution for an LL state; with pre_auf, the shortest of
+    U^k + solution(U^k . state) over k = 0..3 (turns merged)."""
+    best = None
+    for k in range(4 if pre_auf else 1):
+        path = table.get(_ll_key(state))
+        if path is not None:
+            moves = _join_moves([], [0] * k + _invert_seq(path))
+            if best is None or len(moves) < len(best):
+                best = moves
+        state = _compose(state, _MOVES_PY[0])
+    if best is None:
+        raise RuntimeError(f"{label}: LL state not in table (generators incomplete?)")
+    return best
 
 
-def _solve_pll(state: tuple) -> list[int]:
-    path = _LL_FULL.get(_ll_key(state))
-    if path is None:
-        raise RuntimeError("PLL: LL state not in table (generators incomplete?)")
-    return _invert_seq(path)
+def _solve_oll(state: tuple, pre_auf: bool = True) -> list[int]:
+    return _ll_lookup(_OLL_TABLE, state, pre_auf, "OLL")
+
+
+def _solve_pll(state: tuple, pre_auf: bool = True) -> list[int]:
+    return _ll_lookup(_LL_FULL, state, pre_auf, "PLL")
+
+
+# ---------------------------------------------------------------------------
+# Whole-cube rotations (color-neutral cross)
+# ---------------------------------------------------------------------------
+# A whole-cube rotation moves the centres, so it is not a cube state, but it
+# still acts on (cp, ct, ep, ef) through _compose, and conjugating by it
+# relabels the faces: r^-1 . M_f . r == M_sigma(f). Solving the conjugated
+# state r^-1 . s . r with the usual D-cross CFOP and mapping every move face
+# back through sigma^-1 therefore solves s with the cross on another face.
+#
+# The slot permutation of r follows from the faces each slot touches; the
+# twist / flip offsets follow from M_f . r == r . M_sigma(f), which fixes the
+# offset difference between the two slots of every move cycle.
+
+_OPPOSITE = (1, 0, 3, 2, 5, 4)
+CROSS_FACES = "".join(_FACE_ORDER)   # every face: fully color-neutral
+CROSS_PICKS = ("cross", "cross+f2l")
+
+
+def _inverse(s: tuple) -> tuple:
+    cp, ct, ep, ef = s
+    icp = [cp.index(i) for i in range(8)]
+    iep = [ep.index(i) for i in range(12)]
+    return (icp, [-ct[icp[i]] % 3 for i in range(8)],
+            iep, [-ef[iep[i]] % 2 for i in range(12)])
+
+
+def _rotation_perm(face_slots: dict, n: int, sigma: tuple) -> list[int]:
+    """perm[j] = the slot whose faces sigma maps onto slot j's faces."""
+    faces = [frozenset(f for f, sl in face_slots.items() if i in sl) for i in range(n)]
+    where = {fs: i for i, fs in enumerate(faces)}
+    perm = [0] * n
+    for i, fs in enumerate(faces):
+        perm[where[frozenset(sigma[f] for f in fs)]] = i
+    return perm
+
+
+def _rotation_offsets(perm: list[int], sigma: tuple, part: int,
+                      mod: int) -> list[int] | None:
+    """Orientation offsets making perm a rotation for sigma, or None."""
+    cons = []   # x[i] - x[j] == d  (mod)
+    for f in range(6):
+        m, mr = _MOVES_PY[3 * f], _MOVES_PY[3 * sigma[f]]
+        for i in range(len(perm)):
+            if m[part][perm[i]] != perm[mr[part][i]]:
+                return None
+            cons.append((i, mr[part][i], (mr[part + 1][i] - m[part + 1][perm[i]]) % mod))
+    x: list = [0] + [None] * (len(perm) - 1)
+    changed = True
+    while changed:
+        changed = False
+        for i, j, d in cons:
+            if x[i] is not None and x[j] is None:
+                x[j], changed = (x[i] - d) % mod, True
+            elif x[j] is not None and x[i] is None:
+                x[i], changed = (x[j] + d) % mod, True
+    if any(v is None for v in x) or any((x[i] - x[j] - d) % mod for i, j, d in cons):
+        return None
+    return x
+
+
+def _build_rotations() -> dict:
+    """face letter -> (r, r^-1, back) with r taking that face's cross to D;
+    back[m] maps a move in the rotated frame to the real move."""
+    out: dict = {}
+    for sigma in itertools.permutations(range(6)):
+        face = _FACE_ORDER[sigma.index(1)]
+        if face in out or any(sigma[_OPPOSITE[f]] != _OPPOSITE[sigma[f]]
+                              for f in range(6)):
+            continue
+        cp = _rotation_perm(_FACE_CORNERS, 8, sigma)
+        ep = _rotation_perm(_FACE_EDGES, 12, sigma)
+        ct = _rotation_offsets(cp, sigma, 0, 3)
+        ef = _rotation_offsets(ep, sigma, 2, 2)
+        if ct is None or ef is None:
+            continue   # a mirror, not a rotation
+        r = (cp, ct, ep, ef)
+        r_inv = _inverse(r)
+        assert all(_compose(_compose(r_inv, _MOVES_PY[m]), r)
+                   == _MOVES_PY[3 * sigma[m // 3] + m % 3] for m in range(18))
+        back = [3 * sigma.index(m // 3) + m % 3 for m in range(18)]
+        out[face] = (r, r_inv, back)
+    assert len(out) == 6
+    return out
+
+
+_ROTATIONS = _build_rotations()
+
+
+def _rotate(state: tuple, face: str) -> tuple:
+    """state seen from the frame where face is D."""
+    r, r_inv, _ = _ROTATIONS[face]
+    return _compose(_compose(r_inv, state), r)
+
+
+def _check_cross_faces(cross_faces: str, cross_pick: str) -> None:
+    if not cross_faces or set(cross_faces) - set(CROSS_FACES):
+        raise ValueError(f"cross_faces must be a non-empty subset of {CROSS_FACES!r}, "
+                         f"got {cross_faces!r}")
+    if cross_pick not in CROSS_PICKS:
+        raise ValueError(f"Unknown cross_pick: {cross_pick!r} (expected one of {CROSS_PICKS})")
+
+
+def _pick_cross(state: tuple, cross_faces: str, cross_pick: str, f2l_fn,
+                timer) -> tuple[str, tuple, dict]:
+    """Choose the cross face. Returns (face, state in that face's frame,
+    {stage: frame moves} for the stages already solved while choosing).
+
+    'cross' compares the table-lookup cross lengths (a dict hit per face);
+    'cross+f2l' also solves F2L on each face and compares the sums. Ties keep
+    the order of cross_faces. The whole choice is one "cross" timer sample
+    (and one "f2l" sample for 'cross+f2l'), however many faces it compares.
+    """
+    with timer("cross"):
+        cands = []
+        for face in cross_faces:
+            fs = _rotate(state, face)
+            cands.append((face, fs, {"cross": _solve_cross(fs)}))
+    if cross_pick == "cross+f2l":
+        with timer("f2l"):
+            for _, fs, done in cands:
+                done["f2l"] = f2l_fn(_apply_moves(fs, done["cross"]))
+    return min(cands, key=lambda c: sum(len(m) for m in c[2].values()))
 
 
 # ---------------------------------------------------------------------------
@@ -565,7 +1061,10 @@ def _solve_pll(state: tuple) -> list[int]:
 
 def solve(state: tuple, verbose: bool = False,
           randomize: bool = False,
-          rng: "_random_module.Random | None" = None) -> list[int]:
+          rng: "_random_module.Random | None" = None,
+          stats: SolveStats | None = None,
+          cross_faces: str = "D",
+          cross_pick: str = "cross") -> list[int]:
     """Solve a cube state via CFOP. Returns a list of move indices 0..17.
 
     Parameters
@@ -578,58 +1077,335 @@ def solve(state: tuple, verbose: bool = False,
                     and before PLL, exploiting the LL table's full coverage
     rng       : a seeded random.Random instance for reproducibility; if None
                 and randomize=True, a fresh unseeded instance is used.
+    stats     : optional SolveStats that accumulates per-stage wall time and
+                search node counts (share one across many solves)
+    cross_faces: faces the cross may be built on, e.g. "D" (default, fixed
+                white-on-bottom style), "UD" (dual-color) or CROSS_FACES
+                (color neutral). The other stages run in the chosen frame.
+    cross_pick: 'cross' picks the face with the shortest cross; 'cross+f2l'
+                the shortest Cross+F2L (solves F2L once per face)
     """
+    _check_cross_faces(cross_faces, cross_pick)
     if randomize and rng is None:
         rng = _random_module.Random()
+    face, fs, stages = _solve_front(state, cross_faces, cross_pick,
+                                    randomize, rng, stats)
+    solution, aufs = _solve_back(fs, stages, randomize, rng, stats)
+    if verbose:
+        if len(cross_faces) > 1:
+            print(f"  cross face: {face}")
+        total = 0
+        for name, moves in stages.items():
+            total += len(moves)
+            auf_str = f" (AUF={aufs[name]})" if aufs.get(name) else ""
+            label = {"cross": "Cross", "f2l": "F2L"}.get(name, name.upper())
+            print(f"  {label:5}: {len(moves):3} moves (total {total}){auf_str}")
+    back = _ROTATIONS[face][2]
+    return [back[m] for m in solution]
+
+
+def _solve_front(state: tuple, cross_faces: str, cross_pick: str,
+                 randomize: bool, rng, stats: SolveStats | None,
+                 picked: tuple | None = None) -> tuple[str, tuple, dict]:
+    """Cross + F2L. Returns (cross face, state in that face's frame,
+    {'cross', 'f2l'} frame moves). picked = an earlier _pick_cross result."""
+    timer = stats.stage if stats is not None else _no_timer
+
+    def f2l(s):
+        return _solve_f2l(s, rng=rng, randomize=randomize, stats=stats)
+
+    face, fs, stages = picked or _pick_cross(state, cross_faces, cross_pick,
+                                             f2l, timer)
+    if "f2l" not in stages:
+        with timer("f2l"):
+            stages["f2l"] = f2l(_apply_moves(fs, stages["cross"]))
+    return face, fs, stages
+
+
+def _solve_back(fs: tuple, stages: dict, randomize: bool, rng,
+                stats: SolveStats | None) -> tuple[list[int], dict]:
+    """OLL + PLL after _solve_front, added to stages (AUF included).
+    Returns (whole frame solution, {stage: random AUF turns})."""
+    timer = stats.stage if stats is not None else _no_timer
+    solution = stages["cross"] + stages["f2l"]
+    state = _apply_moves(fs, solution)
+    aufs = {}
+    for name, fn in (("oll", _solve_oll), ("pll", _solve_pll)):
+        # optionally prepend a random AUF (U^k, k in 0..3) before the lookup
+        k = rng.randrange(4) if randomize and rng is not None else 0
+        auf_moves = [0] * k   # move index 0 = U (1 quarter-turn)
+        state = _apply_moves(state, auf_moves)
+        with timer(name):
+            # the lookup's own best pre-AUF would just undo the random one
+            moves = fn(state, pre_auf=not randomize)
+        state = _apply_moves(state, moves)
+        stages[name] = auf_moves + moves
+        aufs[name] = k
+        solution = solution + stages[name]
+    if not cube_solved(state):
+        raise RuntimeError("CFOP failed: cube not solved after all stages")
+    if stats is not None:
+        stats.n_solves += 1
+    return solution, aufs
+
+
+def solve_stages(state: tuple, stats: SolveStats | None = None,
+                 cross_faces: str = "D", cross_pick: str = "cross") -> dict:
+    """Solve and return per-stage move lists (for stage-labeled BC data).
+    cross_faces / cross_pick as in solve()."""
+    _check_cross_faces(cross_faces, cross_pick)
+    face, fs, stages = _solve_front(state, cross_faces, cross_pick,
+                                    False, None, stats)
+    _solve_back(fs, stages, False, None, stats)
+    back = _ROTATIONS[face][2]
+    return {name: [back[m] for m in moves] for name, moves in stages.items()}
+
+
+def solve_diverse(state: tuple, k: int, stats: SolveStats | None = None,
+                  cross_faces: str = "D",
+                  n_f2l: int | None = None) -> list[list[int]]:
+    """Up to k distinct CFOP solutions of state from one shared search; the
+    first is solve(state)'s.
+
+    The cross is looked up once. F2L orderings are enumerated depth-first
+    over the accessible-pair choices (shortest first, as solve() picks), with
+    _ida_pair results memoised on (state, solved pairs, pair), so every extra
+    ordering only searches the pairs after its branch point. The first n_f2l
+    (default ceil(k / 4)) F2L variants are finished with the best-AUF lookups
+    and with every explicit (OLL AUF, PLL AUF) pair, round-robin across the
+    variants; more orderings are enumerated only while that leaves fewer than
+    k distinct solutions. Fewer than k come back only if every ordering is
+    exhausted.
+    """
+    if k < 1:
+        raise ValueError(f"k must be >= 1, got {k}")
+    _check_cross_faces(cross_faces, "cross")
+    timer = stats.stage if stats is not None else _no_timer
+    face, fs, stages = _pick_cross(state, cross_faces, "cross", None, timer)
+    back = _ROTATIONS[face][2]
+    memo: dict = {}
+
+    def pair(s, sv, pi):
+        key = (_state_key(s), sv, pi)
+        if key not in memo:
+            memo[key] = _ida_pair(s, sv, pi, stats=stats)
+        return memo[key]
+
+    def orders(s, solved, breaks):
+        """Yield F2L move lists from s (cf. _solve_f2l, which takes the first)."""
+        if len(solved) == 4:
+            yield []
+            return
+        cands = []
+        for pi in range(4):
+            if pi in solved or not _solvable_now(s, pi):
+                continue
+            mv = pair(s, solved, pi)
+            if mv is not None:
+                cands.append((len(mv), pi, mv))
+        if not cands:
+            if breaks >= 8:
+                return
+
+            def unstick(t, sv=solved):
+                return (cross_solved(t)
+                        and all(_f2l_pair_solved(t, j) for j in sv)
+                        and any(_solvable_now(t, pi) for pi in range(4) if pi not in sv))
+
+            mv = _bfs(s, unstick, _F2L_MOVES, max_depth=6, stats=stats)
+            if mv is None:
+                return
+            cands, breaks = [(len(mv), None, mv)], breaks + 1
+        for _, pi, mv in sorted(cands, key=lambda c: c[0]):
+            nxt = solved | {pi} if pi is not None else solved
+            for rest in orders(_apply_moves(s, mv), nxt, breaks):
+                yield mv + rest
+
+    f2l_orders = orders(_apply_moves(fs, stages["cross"]), frozenset(), 0)
+    with timer("f2l"):
+        f2ls = list(itertools.islice(f2l_orders, n_f2l or -(-k // 4)))
+    if not f2ls:
+        raise RuntimeError("F2L stuck (no deadlock-break maneuver)")
+
+    def finish(f2l, aufs):
+        solution = stages["cross"] + f2l
+        s = _apply_moves(fs, solution)
+        for fn, a in zip((_solve_oll, _solve_pll), aufs):
+            moves = (_join_moves([], [0] * a + fn(_apply_moves(s, [0] * a), pre_auf=False))
+                     if a is not None else fn(s))
+            s = _apply_moves(s, moves)
+            solution = solution + moves
+        if not cube_solved(s):
+            raise RuntimeError("CFOP failed: cube not solved after all stages")
+        return tuple(solution)
+
+    out: list[list[int]] = []
+    seen: set = set()
+
+    def take(solutions):
+        for sol in solutions:
+            if sol not in seen:
+                seen.add(sol)
+                out.append([back[m] for m in sol])
+                if len(out) >= k:
+                    return
+
+    # many explicit AUFs merge back into the best-AUF sequence, so when the
+    # first F2L variants run dry, further orderings are pulled lazily
+    variants = [(None, None)] + list(itertools.product(range(4), repeat=2))
+    for aufs in variants:
+        if len(out) < k:
+            take(finish(f2l, aufs) for f2l in f2ls)
+    while len(out) < k:
+        with timer("f2l"):
+            f2l = next(f2l_orders, None)
+        if f2l is None:
+            break
+        take(finish(f2l, aufs) for aufs in variants)
+    if stats is not None:
+        stats.n_solves += 1
+    return out
 
-    solution: list[int] = []
 
-    def stage(name, fn):
-        nonlocal state
-        moves = fn(state)
-        state = _apply_moves(state, moves)
-        solution.extend(moves)
-        if verbose:
-            print(f"  {name:5}: {len(moves):3} moves (total {len(solution)})")
-
-    def stage_auf(name, fn):
-        """Optionally prepend a random AUF (U^k, k in 0..3) before the lookup."""
-        nonlocal state
-        if randomize and rng is not None:
-            k = rng.randrange(4)  # 0 = no AUF, 1/2/3 = U/U2/U'
-            auf_moves = [0] * k   # move index 0 = U (1 quarter-turn)
-        else:
-            k = 0
-            auf_moves = []
-        if auf_moves:
-            state = _apply_moves(state, auf_moves)
-            solution.extend(auf_moves)
-        moves = fn(state)
-        state = _apply_moves(state, moves)
-        solution.extend(moves)
-        if verbose:
-            auf_str = f" (AUF={k})" if k else ""
-            print(f"  {name:5}: {len(auf_moves) + len(moves):3} moves "
-                  f"(total {len(solution)}){auf_str}")
+# ---------------------------------------------------------------------------
+# Batch API
+# ---------------------------------------------------------------------------
 
-    stage("Cross", _solve_cross)
-    stage("F2L", lambda s: _solve_f2l(s, rng=rng, randomize=randomize))
-    stage_auf("OLL", _solve_oll)
-    stage_auf("PLL", _solve_pll)
+def _front_task(task: tuple) -> tuple:
+    """Pool worker: _solve_front for one state. The worker's rng comes back
+    so the caller continues exactly where a serial solve() would."""
+    state, picked, cross_faces, cross_pick, randomize, rng, want_stats = task
+    stats = SolveStats() if want_stats else None
+    try:
+        front = _solve_front(state, cross_faces, cross_pick, randomize, rng,
+                             stats, picked=picked)
+    except RuntimeError:
+        front = None
+    return front, rng, stats
 
-    if not cube_solved(state):
-        raise RuntimeError("CFOP failed: cube not solved after all stages")
-    return solution
 
+def _diverse_task(task: tuple) -> tuple:
+    """Pool worker: solve_diverse for one state ([] where it raises)."""
+    state, k, cross_faces, want_stats = task
+    stats = SolveStats() if want_stats else None
+    try:
+        sols = solve_diverse(state, k, stats=stats, cross_faces=cross_faces)
+    except RuntimeError:
+        sols = []
+    return sols, stats
 
-def solve_stages(state: tuple) -> dict:
-    """Solve and return per-stage move lists (for stage-labeled BC data)."""
-    out: dict = {}
-    m = _solve_cross(state); state = _apply_moves(state, m); out["cross"] = m
-    m = _solve_f2l(state);   state = _apply_moves(state, m); out["f2l"] = m
-    m = _solve_oll(state);   state = _apply_moves(state, m); out["oll"] = m
-    m = _solve_pll(state);   state = _apply_moves(state, m); out["pll"] = m
-    assert cube_solved(state)
+
+_POOLS: dict[int, object] = {}   # workers -> live spawn pool (worker_pool)
+
+
+def _init_worker() -> None:
+    # a spawn worker loads _TABLES when it imports this module; opening the
+    # F2L tables here makes both happen at pool start, once per worker
+    assert _TABLES["version"] == _CACHE_VERSION
+    _f2l_pdbs()
+
+
+def worker_pool(workers: int):
+    """A spawn pool of `workers` processes with the tables loaded, created on
+    first use and reused by every later solve_many call (closed at exit)."""
+    pool = _POOLS.get(workers)
+    if pool is None:
+        pool = mp.get_context("spawn").Pool(workers, initializer=_init_worker)
+        _POOLS[workers] = pool
+    return pool
+
+
+def close_pools() -> None:
+    while _POOLS:
+        _, pool = _POOLS.popitem()
+        pool.terminate()
+        pool.join()
+
+
+atexit.register(close_pools)
+
+
+def solve_many(states: list[tuple], workers: int = 1,
+               randomize: bool = False,
+               rngs: "list[_random_module.Random] | None" = None,
+               stats: SolveStats | None = None,
+               cross_faces: str = "D",
+               cross_pick: str = "cross") -> list[list[int] | None]:
+    """Solve a batch of states; solutions come back in input order, None
+    where solve() would have raised RuntimeError.
+
+    The table-lookup stages run in this process, a loop over the batch
+    before (Cross) and after (OLL/PLL); only the F2L searches (plus the face
+    choice for cross_pick='cross+f2l') go to worker_pool(workers), whose
+    processes load the tables once and are kept across calls. Results match
+    solve() call by call: rngs[i] plays the role of solve()'s rng for
+    states[i] (fresh ones when randomize=True and rngs is None), and stats,
+    if given, accumulates the per-stage counters of every solve.
+    """
+    _check_cross_faces(cross_faces, cross_pick)
+    if rngs is None:
+        rngs = [_random_module.Random() if randomize else None for _ in states]
+    elif len(rngs) != len(states):
+        raise ValueError("rngs must have one entry per state")
+    timer = stats.stage if stats is not None else _no_timer
+
+    # pass 1: cross lookups (the face choice needs F2L for 'cross+f2l')
+    tasks = []
+    for state, rng in zip(states, rngs):
+        picked = None
+        if cross_pick == "cross":
+            picked = _pick_cross(state, cross_faces, cross_pick, None, timer)
+        tasks.append((state, picked, cross_faces, cross_pick, randomize, rng,
+                      stats is not None))
+
+    # F2L searches, in parallel when asked
+    if workers <= 1 or len(tasks) <= 1:
+        fronts = [_front_task(t) for t in tasks]
+    else:
+        fronts = worker_pool(workers).map(
+            _front_task, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+
+    # pass 2: OLL / PLL lookups
+    out: list[list[int] | None] = []
+    for i, (front, rng, worker_stats) in enumerate(fronts):
+        rngs[i] = rng
+        if stats is not None and worker_stats is not None:
+            stats.merge(worker_stats)
+        if front is None:
+            out.append(None)
+            continue
+        face, fs, stages = front
+        try:
+            solution, _ = _solve_back(fs, stages, randomize, rng, stats)
+        except RuntimeError:
+            out.append(None)
+            continue
+        back = _ROTATIONS[face][2]
+        out.append([back[m] for m in solution])
+    return out
+
+
+def solve_diverse_many(states: list[tuple], k: int, workers: int = 1,
+                       stats: SolveStats | None = None,
+                       cross_faces: str = "D") -> list[list[list[int]]]:
+    """solve_diverse over a batch, in input order; [] where it would have
+    raised RuntimeError. With workers > 1 each state's search runs whole on
+    worker_pool(workers); stats, if given, accumulates every solve's counters.
+    """
+    if k < 1:
+        raise ValueError(f"k must be >= 1, got {k}")
+    _check_cross_faces(cross_faces, "cross")
+    tasks = [(state, k, cross_faces, stats is not None) for state in states]
+    if workers <= 1 or len(tasks) <= 1:
+        results = [_diverse_task(t) for t in tasks]
+    else:
+        results = worker_pool(workers).map(
+            _diverse_task, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+    out = []
+    for sols, worker_stats in results:
+        if stats is not None and worker_stats is not None:
+            stats.merge(worker_stats)
+        out.append(sols)
     return out
 
 
@@ -640,14 +1416,21 @@ if __name__ == "__main__":
     print(f"\nsolving {n_test} random 25-move scrambles...")
     t0 = time.time()
     lengths = []
+    run_stats = SolveStats()
     for i in range(n_test):
         s = _IDENTITY
         for _ in range(25):
             s = _compose(s, _MOVES_PY[random.randrange(18)])
-        sol = solve(s)
+        sol = solve(s, stats=run_stats)
         assert cube_solved(_apply_moves(s, sol)), f"scramble {i} not solved!"
         lengths.append(len(sol))
         print(f"  scramble {i:2}: {len(sol):3} moves  "
               f"({(i + 1) / (time.time() - t0):.1f}/s)", flush=True)
     print(f"\nall {n_test} solved. "
           f"avg {sum(lengths) / len(lengths):.1f}, max {max(lengths)} moves")
+    summary = run_stats.summary()
+    print("stage share: " + ", ".join(
+        f"{k} {v:.0%}" for k, v in summary["stage_share"].items()))
+    print(f"IDA* nodes/call p50 {summary['ida_nodes']['p50']}, "
+          f"max {summary['ida_nodes']['max']}; "
+          f"deadlock breaks {sum(run_stats.deadlock_breaks)}")
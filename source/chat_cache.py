@@ -0,0 +1,170 @@
+"""Record/replay cache for LLM chat calls, keyed by request content.
+
+Layout under a cache path P (e.g. runs/llm/chat_cache)
+------------------------------------------------------
+    P.jsonl   append-only log, one response per line:
+              {"key", "model", "message", "time"}
+    P.idx     append-only index, one "<key> <byte offset into P.jsonl>" per line
+
+The key is the sha256 of the canonical JSON of the whole /api/chat payload
+(model, messages, tools, think, options), so a turn hits only when the request
+is byte-for-byte what was sent before. Opening reads just the index; a hit
+seeks to its record. An index shorter than the log (interrupted write) is
+completed by scanning the log; an offset that does not land on its key's
+record (edited or corrupt index) makes the index be rebuilt from the log.
+
+Modes
+-----
+    record       serve hits from the cache, send misses and append them
+    replay       serve hits; a miss raises CacheMiss (no server needed)
+    passthrough  always send, never read or write
+
+    cache = ChatCache("runs/llm/chat_cache", mode="record")
+    message = cache.call(payload, send=lambda: ollama_chat(...))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+MODES = ("record", "replay", "passthrough")
+
+
+class CacheMiss(RuntimeError):
+    """A replay-mode request that was never recorded."""
+
+
+def _canonical(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def request_key(payload: dict) -> str:
+    return hashlib.sha256(_canonical(payload).encode()).hexdigest()
+
+
+class ChatCache:
+    """Content-addressed chat responses (see module doc). Thread-safe."""
+
+    def __init__(self, path: str | Path, mode: str = "record"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode: {mode!r} (expected one of {MODES})")
+        self.mode = mode
+        base = Path(path)
+        self.log_path = base.with_name(base.name + ".jsonl")
+        self.idx_path = base.with_name(base.name + ".idx")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index: dict[str, int] = {}
+        if mode != "passthrough":
+            self._load_index()
+
+    def _load_index(self) -> None:
+        if not self.log_path.exists():
+            return
+        size = self.log_path.stat().st_size
+        if self.idx_path.exists():
+            for line in self.idx_path.read_text().splitlines():
+                parts = line.split()
+                if len(parts) == 2 and parts[1].isdigit() and int(parts[1]) < size:
+                    self._index[parts[0]] = int(parts[1])
+        covered = max(self._index.values(), default=-1)
+        # complete the index if the log has records it does not
+        extra = self._scan(covered)
+        if extra:
+            self.idx_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.idx_path, "a") as f:
+                f.writelines(f"{k} {off}\n" for k, off in extra)
+
+    def _scan(self, after: int = -1) -> list[tuple[str, int]]:
+        """Index the log records past the one at offset `after` (all if -1)."""
+        found = []
+        with open(self.log_path, "rb") as f:
+            if after >= 0:
+                f.seek(after)
+                f.readline()
+            while True:
+                off = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted run
+                self._index[rec["key"]] = off
+                found.append((rec["key"], off))
+        return found
+
+    def _rebuild(self) -> None:
+        """Replace the index with a full scan of the log."""
+        self._index = {}
+        lines = [f"{k} {off}\n" for k, off in self._scan()]
+        self.idx_path.write_text("".join(lines))
+
+    def _read(self, key: str) -> dict | None:
+        off = self._index.get(key)
+        if off is None:
+            return None
+        with open(self.log_path, "rb") as f:
+            f.seek(off)
+            line = f.readline()
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        return rec["message"] if rec.get("key") == key else None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, payload: dict) -> dict | None:
+        key = request_key(payload)
+        message = self._read(key)
+        if message is None and key in self._index:
+            self._rebuild()   # the offset points elsewhere: trust the log
+            message = self._read(key)
+        return message
+
+    def put(self, payload: dict, message: dict) -> None:
+        key = request_key(payload)
+        rec = {"key": key, "model": payload.get("model"), "message": message,
+               "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a+b") as f:
+            off = f.seek(0, 2)
+            if off:
+                f.seek(off - 1)
+                if f.read(1) != b"\n":   # close a torn line first
+                    f.write(b"\n")
+                    off += 1
+            f.write((_canonical(rec) + "\n").encode())
+        with open(self.idx_path, "a") as f:
+            f.write(f"{key} {off}\n")
+        self._index[key] = off
+
+    def call(self, payload: dict, send: Callable[[], dict]) -> dict:
+        """The response for payload: from the cache, or send() per the mode."""
+        if self.mode == "passthrough":
+            return send()
+        with self._lock:
+            hit = self.get(payload)
+            if hit is not None:
+                self.hits += 1
+                return hit
+            self.misses += 1
+        if self.mode == "replay":
+            raise CacheMiss(f"no recorded response for request {request_key(payload)[:12]}")
+        message = send()
+        with self._lock:
+            self.put(payload, message)
+        return message
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "entries": len(self._index),
+                "hits": self.hits, "misses": self.misses}
@@ -8,11 +8,16 @@ LLM-friendly tool surface:
     session.reset()              -> observation
     session.apply("R U R' U'")   -> commit moves, observation
     session.simulate("R U R'")   -> effect on a SCRATCH copy (no commit)
+    session.simulate_many([...]) -> compact effect table for many candidates
     session.observe()            -> ASCII net + solved-piece counts
+                                    (or a compact encoding, see ENCODINGS)
     session.inverse("R U2 F'")   -> "F U2 R'"
     session.distance()           -> learned cost-to-go (M3, lazy-loaded)
+    session.lookahead(2, top=5)  -> best 2-move sequences by learned cost-to-go
 
 State is held as ground truth in the kernel; the LLM never has to track it.
+The value model behind distance()/rank_moves() comes from VALUE_MODELS, a
+process-wide registry, so many sessions share one loaded checkpoint.
 
 Move notation
 -------------
@@ -26,6 +31,8 @@ from __future__ import annotations
 import json
 import random
 import sys
+import threading
+import time
 from pathlib import Path
 
 import mlx.core as mx
@@ -35,8 +42,11 @@ for _d in (str(_SRC), str(_SRC / "cube")):
     if _d not in sys.path:
         sys.path.insert(0, _d)
 
+from data import _allowed, _to_py                       # noqa: E402
 from state import State, MOVES                          # noqa: E402
-from vis_util import state_to_net, ITOA, U, L, F, R, B, D  # noqa: E402
+from vis_util import (ITOA, U, L, F, R, B, D,            # noqa: E402
+                      CORNER_FACES, CORNER_FACES_POSITIONS,
+                      EDGE_FACES, EDGE_FACES_POSITIONS)
 
 # ---------------------------------------------------------------------------
 # Move notation <-> precomputed State
@@ -100,24 +110,63 @@ def invert_moves(moves: str) -> str:
     return ' '.join(_INV_TOKEN[t] for t in reversed(toks))
 
 
-def _apply_indices(state: State, idxs: list[int]) -> State:
-    s = state
+# ---------------------------------------------------------------------------
+# Integer state kernel
+# ---------------------------------------------------------------------------
+# The session runs on data.py's (cp, ct, ep, ef) lists, not on MLX States:
+# a move only rewrites the 4 corner and 4 edge slots it touches, so applying
+# one (and updating the solved-piece counts) is a handful of list writes
+# instead of several MLX dispatches on 20-element arrays.
+
+_MOVES_INT = [_to_py(m) for m in _MOVE_STATES]
+_TOUCHED = [([i for i in range(8) if m[0][i] != i or m[1][i]],
+             [i for i in range(12) if m[2][i] != i or m[3][i]])
+            for m in _MOVES_INT]
+
+
+def _as_int(state) -> tuple:
+    """State or (cp, ct, ep, ef) tuple -> (cp, ct, ep, ef) tuple."""
+    return _to_py(state) if isinstance(state, State) else state
+
+
+def _as_state(t: tuple) -> State:
+    cp, ct, ep, ef = t
+    return State(cp, ct, ep, [1 - 2 * f for f in ef])
+
+
+def _step(t: tuple, m: int) -> tuple[tuple, int, int]:
+    """Apply move m to t. Returns (new state, change in solved corners,
+    change in solved edges), looking only at the slots m touches."""
+    cp, ct, ep, ef = t
+    mcp, mct, mep, mef = _MOVES_INT[m]
+    ncp, nct, nep, nef = cp[:], ct[:], ep[:], ef[:]
+    tc, te = _TOUCHED[m]
+    dc = de = 0
+    for i in tc:
+        j = mcp[i]
+        ncp[i] = cp[j]
+        nct[i] = (ct[j] + mct[i]) % 3
+        dc += (ncp[i] == i and nct[i] == 0) - (cp[i] == i and ct[i] == 0)
+    for i in te:
+        j = mep[i]
+        nep[i] = ep[j]
+        nef[i] = (ef[j] + mef[i]) % 2
+        de += (nep[i] == i and nef[i] == 0) - (ep[i] == i and ef[i] == 0)
+    return (ncp, nct, nep, nef), dc, de
+
+
+def _apply_indices(state, idxs: list[int]) -> tuple:
+    t = _as_int(state)
     for i in idxs:
-        s = s @ _MOVE_STATES[i]
-    return s
+        t = _step(t, i)[0]
+    return t
 
 
 # ---------------------------------------------------------------------------
 # Solved-piece metrics
 # ---------------------------------------------------------------------------
 
-def _solved_counts(state: State) -> dict:
-    cp = [int(x) for x in state.corner_positions.tolist()]
-    ct = [int(x) for x in state.twist_co.tolist()]
-    ep = [int(x) for x in state.edge_positions.tolist()]
-    ef = [int(x) for x in state.twist_eo.tolist()]
-    corners_ok = sum(1 for i in range(8) if cp[i] == i and ct[i] == 0)
-    edges_ok = sum(1 for i in range(12) if ep[i] == i and ef[i] == 0)
+def _counts(corners_ok: int, edges_ok: int) -> dict:
     return {
         "corners_solved": corners_ok,   # 0..8 (placed AND oriented)
         "edges_solved": edges_ok,        # 0..12
@@ -126,6 +175,29 @@ def _solved_counts(state: State) -> dict:
     }
 
 
+def _solved_counts(state) -> dict:
+    cp, ct, ep, ef = _as_int(state)
+    return _counts(sum(1 for i in range(8) if cp[i] == i and ct[i] == 0),
+                   sum(1 for i in range(12) if ep[i] == i and ef[i] == 0))
+
+
+def _net(state) -> list:
+    """vis_util.state_to_net on the integer state, as nested lists."""
+    cp, ct, ep, ef = _as_int(state)
+    net = [[[fc for _ in range(3)] for _ in range(3)] for fc in range(6)]
+    for slot in range(8):
+        colors = CORNER_FACES[cp[slot]]
+        for k in range(3):
+            fc, (r, c) = CORNER_FACES_POSITIONS[slot][(k + ct[slot]) % 3]
+            net[fc][r][c] = colors[k]
+    for slot in range(12):
+        colors = EDGE_FACES[ep[slot]]
+        for k in range(2):
+            fc, (r, c) = EDGE_FACES_POSITIONS[slot][(k + ef[slot]) % 2]
+            net[fc][r][c] = colors[k]
+    return net
+
+
 # Standard Western color scheme: each face index -> a color letter.
 # U=White, D=Yellow, F=Green, B=Blue, R=Red, L=Orange.
 _COLOR = {F: 'G', R: 'R', L: 'O', B: 'B', U: 'W', D: 'Y'}
@@ -133,15 +205,16 @@ _FACE_LABEL = {U: 'U(top)', D: 'D(bottom)', F: 'F(front)',
                B: 'B(back)', L: 'L(left)', R: 'R(right)'}
 
 
-def render_net(state: State, color: bool = False) -> str:
+def render_net(state, color: bool = False, net: list | None = None) -> str:
     """ASCII unfolded-net rendering of a state (the LLM's eyes).
 
     color=False -> cells show the home-face letter (U/D/L/R/F/B).
     color=True  -> cells show the standard color letter (W/Y/G/B/R/O), which is
                    how cubes are usually described and easier for an LLM to read.
     Non-printing twin of vis_util.print_net (which prints as a side effect).
+    state may be a State or an integer (cp, ct, ep, ef) tuple.
     """
-    n = state_to_net(state).tolist()
+    n = net if net is not None else _net(state)
     cell = (lambda v: _COLOR[v]) if color else (lambda v: ITOA[v])
 
     def row(face, r):
@@ -159,10 +232,10 @@ def render_net(state: State, color: bool = False) -> str:
     return '\n'.join(lines)
 
 
-def face_progress(state: State) -> dict:
+def face_progress(state, net: list | None = None) -> dict:
     """For each face, how many of its 9 stickers already match its center color
     (centers are fixed, so this is the face's 'how solid is this color' score)."""
-    n = state_to_net(state).tolist()
+    n = net if net is not None else _net(state)
     out = {}
     for fc in (U, D, F, B, L, R):
         match = sum(1 for r in range(3) for c in range(3) if n[fc][r][c] == fc)
@@ -170,15 +243,83 @@ def face_progress(state: State) -> dict:
     return out
 
 
-def readable_observation(state: State) -> str:
+def readable_observation(state) -> str:
     """A cube-literate observation: colored net + per-face completeness."""
-    net = render_net(state, color=True)
-    fp = face_progress(state)
+    n = _net(state)
+    net = render_net(state, color=True, net=n)
+    fp = face_progress(state, net=n)
     prog = '  '.join(f"{k.split('(')[0]}:{v}/9" for k, v in fp.items())
     return (net + "\n"
             "faces matching their center color: " + prog)
 
 
+# ---------------------------------------------------------------------------
+# Compact observation encodings
+# ---------------------------------------------------------------------------
+#
+#   net       readable_observation: colored net + per-face counts (~100 tokens)
+#   facelets  54 face letters, faces in U R F D L B order, each row by row
+#             as drawn in the net (the usual facelet-string convention)
+#   pieces    the corner / edge slots that are not solved, each as
+#             SLOT=STICKERS: the home-face letters of the stickers now in the
+#             slot, read in the slot's own face order (solved: RUF=RUF)
+#   diff      the same SLOT=STICKERS entries, but only for slots whose content
+#             changed since the previous observation
+
+ENCODINGS = ("net", "facelets", "pieces", "diff")
+
+_CORNER_NAMES = [''.join(ITOA[f] for f in faces) for faces in CORNER_FACES]
+_EDGE_NAMES = [''.join(ITOA[f] for f in faces) for faces in EDGE_FACES]
+
+
+def facelet_string(state) -> str:
+    """The 54-character facelet string of a state (see ENCODINGS)."""
+    n = _net(state)
+    return ''.join(ITOA[n[fc][r][c]] for fc in (U, R, F, D, L, B)
+                   for r in range(3) for c in range(3))
+
+
+def _slots(state) -> list[str]:
+    """SLOT=STICKERS for all 20 slots, corners first."""
+    cp, ct, ep, ef = _as_int(state)
+    out = []
+    for i in range(8):
+        faces = CORNER_FACES[cp[i]]
+        out.append(_CORNER_NAMES[i] + '='
+                   + ''.join(ITOA[faces[(j - ct[i]) % 3]] for j in range(3)))
+    for i in range(12):
+        faces = EDGE_FACES[ep[i]]
+        out.append(_EDGE_NAMES[i] + '='
+                   + ''.join(ITOA[faces[(j - ef[i]) % 2]] for j in range(2)))
+    return out
+
+
+def piece_list(state) -> str:
+    """The unsolved slots (see ENCODINGS), or 'all pieces solved'."""
+    wrong = [e for e in _slots(state) if e[:e.index('=')] != e[e.index('=') + 1:]]
+    return 'unsolved: ' + ' '.join(wrong) if wrong else 'all pieces solved'
+
+
+def piece_diff(before, after) -> str:
+    """The slots whose content differs between two states (see ENCODINGS)."""
+    changed = [b for a, b in zip(_slots(before), _slots(after)) if a != b]
+    return 'changed: ' + ' '.join(changed) if changed else 'no change'
+
+
+def encode_observation(state, encoding: str = "net", previous=None) -> str:
+    """Render state in one of ENCODINGS; diff is relative to `previous` and
+    falls back to piece_list when there is none."""
+    if encoding == "net":
+        return readable_observation(state)
+    if encoding == "facelets":
+        return facelet_string(state)
+    if encoding == "pieces" or (encoding == "diff" and previous is None):
+        return piece_list(state)
+    if encoding == "diff":
+        return piece_diff(previous, state)
+    raise ValueError(f"Unknown encoding: {encoding!r} (expected one of {ENCODINGS})")
+
+
 # ---------------------------------------------------------------------------
 # Macro memory (M2): a persistent library of discovered move sequences
 # ---------------------------------------------------------------------------
@@ -222,32 +363,152 @@ class MacroMemory:
         return {"name": name, **self.macros[name]}
 
 
+# ---------------------------------------------------------------------------
+# Value-model registry (M3): one load per checkpoint per process
+# ---------------------------------------------------------------------------
+
+DEFAULT_VALUE_CKPT = str(_SRC.parent / "runs" / "hindsight_not" / "latest.npz")
+_LOOKAHEAD_CHUNK = 4096   # leaves per value forward in CubeSession.lookahead
+
+
+# Model loads and forwards run under this lock, so a background thread (e.g.
+# llm_agent's speculative rank_moves) never overlaps the caller's MLX work.
+_MODEL_LOCK = threading.RLock()
+
+
+class ModelRegistry:
+    """Loaded value models keyed by checkpoint path + content hash.
+
+    Every CubeSession asks the shared VALUE_MODELS instance, so a sweep that
+    builds a fresh session per seed still reads each checkpoint from disk once.
+    Retraining into the same path changes the hash and forces a reload; the
+    hash itself is only recomputed when the file's mtime or size changes.
+    """
+
+    def __init__(self):
+        self._models: dict[tuple[str, str], object] = {}
+        self._hashes: dict[tuple, str] = {}   # (path, mtime, size) -> hash
+        self._stats: dict[tuple[str, str], dict] = {}
+
+    def _key(self, ckpt_path: str) -> tuple[str, str]:
+        from eval_store import checkpoint_hash
+        p = Path(ckpt_path).resolve()
+        st = p.stat()
+        memo = (str(p), st.st_mtime_ns, st.st_size)
+        if memo not in self._hashes:
+            self._hashes[memo] = checkpoint_hash(str(p))
+        return str(p), self._hashes[memo]
+
+    def get(self, ckpt_path: str = DEFAULT_VALUE_CKPT):
+        """The model for ckpt_path, loading it on first use."""
+        with _MODEL_LOCK:
+            return self._get(ckpt_path)
+
+    def _get(self, ckpt_path: str):
+        key = self._key(ckpt_path)
+        if key not in self._models:
+            from infer import load_model_auto  # lazy import (loads MLX model)
+            from mlx.utils import tree_flatten
+            t0 = time.perf_counter()
+            model = load_model_auto(key[0])
+            mx.eval(model.parameters())
+            self._models[key] = model
+            self._stats[key] = {
+                "path": key[0], "hash": key[1][:12],
+                "load_secs": round(time.perf_counter() - t0, 3),
+                "param_mb": round(sum(v.nbytes for _, v in
+                                      tree_flatten(model.parameters())) / 2**20, 2),
+                "hits": 0,
+            }
+        self._stats[key]["hits"] += 1
+        return self._models[key]
+
+    def preload(self, *ckpt_paths: str) -> list[dict]:
+        """Load checkpoints up front (e.g. at startup) and return report()."""
+        for p in ckpt_paths or (DEFAULT_VALUE_CKPT,):
+            self.get(p)
+        return self.report()
+
+    def report(self) -> list[dict]:
+        """Per loaded checkpoint: path, short hash, load time, parameter MB,
+        and how many times sessions asked for it."""
+        return [dict(v) for v in self._stats.values()]
+
+    def clear(self) -> None:
+        self._models.clear()
+        self._stats.clear()
+
+
+VALUE_MODELS = ModelRegistry()
+
+
 # ---------------------------------------------------------------------------
 # Cube session (ground-truth state held here)
 # ---------------------------------------------------------------------------
 
 class CubeSession:
-    """A single interactive cube the LLM agent manipulates via tools."""
+    """A single interactive cube the LLM agent manipulates via tools.
+
+    The ground truth is an integer (cp, ct, ep, ef) state (self.cube) with the
+    solved corner / edge counts kept up to date move by move; the MLX view is
+    built on demand (self.state) and the net only when an observation with
+    render=True is asked for. `encoding` (one of ENCODINGS) picks how that
+    observation, and simulate's net_after, are rendered; with "diff" they
+    show what changed since the last rendered observation (for simulate:
+    relative to the current cube).
+    """
 
-    def __init__(self, seed: int | None = None, memory: "MacroMemory | None" = None):
-        self.state = State()                 # solved
+    def __init__(self, seed: int | None = None, memory: "MacroMemory | None" = None,
+                 value_ckpt: str = DEFAULT_VALUE_CKPT, encoding: str = "net"):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding: {encoding!r} (expected one of {ENCODINGS})")
         self.rng = random.Random(seed)
         self.scramble_moves: list[int] = []   # the scramble that was applied
         self.history: list[int] = []          # committed solving moves
+        self.value_ckpt = value_ckpt          # resolved via VALUE_MODELS (M3)
         self._value_model = None              # lazy (M3)
         self.memory = memory                  # shared MacroMemory (M2), optional
+        self.encoding = encoding
+        self._seen = None                     # cube at the last rendered observation
+        self._set_cube(_to_py(State()))       # solved
+
+    # -- state ---------------------------------------------------------------
+    def _set_cube(self, t: tuple) -> None:
+        self.cube = t
+        c = _solved_counts(t)
+        self._corners_ok = c["corners_solved"]
+        self._edges_ok = c["edges_solved"]
+
+    def _push(self, idxs: list[int]) -> None:
+        for i in idxs:
+            self.cube, dc, de = _step(self.cube, i)
+            self._corners_ok += dc
+            self._edges_ok += de
+
+    @property
+    def state(self) -> State:
+        """MLX view of the current cube (built on each access)."""
+        return _as_state(self.cube)
+
+    @state.setter
+    def state(self, value) -> None:
+        self._set_cube(_as_int(value))
+
+    def solved_counts(self) -> dict:
+        """corners/edges/pieces solved + is_solved, without rendering anything."""
+        return _counts(self._corners_ok, self._edges_ok)
 
     # -- setup ---------------------------------------------------------------
-    def reset(self) -> dict:
+    def reset(self, render: bool = True) -> dict:
         """Return the cube to solved and clear history."""
-        self.state = State()
+        self._set_cube(_to_py(State()))
         self.scramble_moves = []
         self.history = []
-        return self.observe()
+        return self.observe(render)
 
-    def scramble(self, depth: int = 5) -> dict:
+    def scramble(self, depth: int = 5, render: bool = True) -> dict:
         """Reset, then apply `depth` random moves (avoiding trivial cancels)."""
-        self.state = State()
+        self._set_cube(_to_py(State()))
         self.history = []
         idxs: list[int] = []
         prev_face = -1
@@ -259,19 +520,19 @@ class CubeSession:
             idxs.append(i)
             prev_face = i // 3
         self.scramble_moves = idxs
-        self.state = _apply_indices(self.state, idxs)
-        obs = self.observe()
+        self._push(idxs)
+        obs = self.observe(render)
         obs["scramble"] = ' '.join(NOTATION[i] for i in idxs)
         obs["scramble_depth"] = depth
         return obs
 
     # -- actions -------------------------------------------------------------
-    def apply(self, moves: str) -> dict:
+    def apply(self, moves: str, render: bool = True) -> dict:
         """Commit `moves` to the cube and return the new observation."""
         idxs = parse_moves(moves)
-        self.state = _apply_indices(self.state, idxs)
+        self._push(idxs)
         self.history.extend(idxs)
-        obs = self.observe()
+        obs = self.observe(render)
         obs["applied"] = ' '.join(NOTATION[i] for i in idxs)
         return obs
 
@@ -282,12 +543,12 @@ class CubeSession:
         agent can experiment with a candidate macro safely.
         """
         idxs = parse_moves(moves)
-        scratch = _apply_indices(self.state, idxs)
-        before = _solved_counts(self.state)
+        scratch = _apply_indices(self.cube, idxs)
+        before = self.solved_counts()
         after = _solved_counts(scratch)
         return {
             "moves": ' '.join(NOTATION[i] for i in idxs),
-            "net_after": readable_observation(scratch),
+            "net_after": encode_observation(scratch, self.encoding, self.cube),
             "pieces_solved_before": before["pieces_solved"],
             "pieces_solved_after": after["pieces_solved"],
             "delta_pieces_solved": after["pieces_solved"] - before["pieces_solved"],
@@ -295,17 +556,45 @@ class CubeSession:
             "committed": False,
         }
 
+    def simulate_many(self, candidates: list[str], values: bool = False) -> dict:
+        """simulate() for many candidate sequences in one call, without nets.
+
+        Each candidate runs through the integer kernel from the current state;
+        with values=True all end states are scored in one batched forward.
+        A candidate that does not parse gets an error row instead.
+        """
+        before = self._corners_ok + self._edges_ok
+        rows, ends = [], []
+        for raw in candidates:
+            try:
+                idxs = parse_moves(raw)
+            except MoveParseError as exc:
+                rows.append({"moves": raw, "error": str(exc)})
+                continue
+            t, co, eo = self.cube, self._corners_ok, self._edges_ok
+            for i in idxs:
+                t, dc, de = _step(t, i)
+                co, eo = co + dc, eo + de
+            rows.append({"moves": ' '.join(NOTATION[i] for i in idxs),
+                         "delta_pieces_solved": co + eo - before,
+                         "would_solve": co == 8 and eo == 12})
+            ends.append((rows[-1], t))
+        if values and ends:
+            for (row, _), v in zip(ends, self._value_batch([t for _, t in ends])):
+                row["estimated_moves_to_solve"] = round(v, 2)
+        return {"results": rows, "pieces_solved_before": before, "committed": False}
+
     # -- observation ---------------------------------------------------------
-    def observe(self) -> dict:
-        c = _solved_counts(self.state)
-        return {
-            "net": readable_observation(self.state),
-            "corners_solved": c["corners_solved"],
-            "edges_solved": c["edges_solved"],
-            "pieces_solved": c["pieces_solved"],
-            "is_solved": c["is_solved"],
-            "moves_made": len(self.history),
-        }
+    def observe(self, render: bool = True) -> dict:
+        """Solved-piece counts, plus the cube in the session's encoding
+        (the readable net by default) when render=True."""
+        obs = {}
+        if render:
+            obs["net"] = encode_observation(self.cube, self.encoding, self._seen)
+            self._seen = self.cube
+        obs.update(self.solved_counts())
+        obs["moves_made"] = len(self.history)
+        return obs
 
     def inverse(self, moves: str) -> dict:
         return {"moves": moves, "inverse": invert_moves(moves)}
@@ -354,7 +643,7 @@ class CubeSession:
     # -- learned intuition (M3) ---------------------------------------------
     def distance(self) -> dict:
         """Learned cost-to-go estimate for the current state (lower = closer)."""
-        val = self._value(self.state)
+        val = self._value(self.cube)
         return {"estimated_moves_to_solve": round(val, 2)}
 
     def rank_moves(self) -> dict:
@@ -366,16 +655,84 @@ class CubeSession:
         repeat.  When stuck in a plateau (top move does not reduce the estimate),
         that is where a learned macro is needed.
         """
+        return self.rank_moves_many([self])[0]
+
+    @classmethod
+    def rank_moves_many(cls, sessions: list["CubeSession"]) -> list[dict]:
+        """rank_moves for many sessions (one value checkpoint) in a single
+        batched forward over every session's state and its 18 children."""
+        if len({s.value_ckpt for s in sessions}) > 1:
+            raise ValueError("rank_moves_many needs sessions sharing one value_ckpt")
+        children = [s._children() for s in sessions]
+        states = [t for s, cs in zip(sessions, children)
+                  for t in [s.cube] + [c[0] for c in cs]]
+        values = sessions[0]._value_batch(states) if sessions else []
+        out = []
+        for k, (s, cs) in enumerate(zip(sessions, children)):
+            v = values[19 * k:19 * k + 19]
+            out.append({"ranked_moves": s._rank_children(cs, v[1:]),
+                        "current_estimate": round(v[0], 2)})
+        return out
+
+    def lookahead(self, depth: int = 2, top: int = 5) -> dict:
+        """k-ply intuition: every canonical move sequence of `depth` moves (no
+        face twice in a row, opposite faces in one order only) scored by the
+        learned cost-to-go of where it ends, in batched forwards. Returns the
+        `top` best; a sequence that solves the cube part-way stops there and
+        is listed first.
+
+        Depth 2 scores 243 leaves, depth 3 3,240.
+        """
+        if not 1 <= depth <= 3:
+            return {"error": f"depth must be 1..3, got {depth}"}
+        frontier = [((), self.cube, self._corners_ok, self._edges_ok)]
+        solving: list[tuple] = []
+        for _ in range(depth):
+            nxt = []
+            for seq, t, co, eo in frontier:
+                prev = seq[-1] if seq else -1
+                for m in range(18):
+                    if not _allowed(m, prev):
+                        continue
+                    nt, dc, de = _step(t, m)
+                    if co + dc == 8 and eo + de == 12:
+                        solving.append(seq + (m,))
+                    else:
+                        nxt.append((seq + (m,), nt, co + dc, eo + de))
+            frontier = nxt
+        values: list[float] = []
+        states = [self.cube] + [t for _, t, _, _ in frontier]
+        for i in range(0, len(states), _LOOKAHEAD_CHUNK):
+            values.extend(self._value_batch(states[i:i + _LOOKAHEAD_CHUNK]))
+        current, values = values[0], values[1:]
+        rows = [{"moves": ' '.join(NOTATION[m] for m in seq),
+                 "estimated_moves_to_solve": 0.0, "pieces_solved": 20,
+                 "would_solve": True} for seq in sorted(solving, key=len)]
+        order = sorted(range(len(frontier)), key=lambda k: values[k])
+        for k in order[:max(0, top - len(rows))]:
+            seq, _, co, eo = frontier[k]
+            rows.append({"moves": ' '.join(NOTATION[m] for m in seq),
+                         "estimated_moves_to_solve": round(values[k], 2),
+                         "pieces_solved": co + eo, "would_solve": False})
+        return {"sequences": rows[:top], "depth": depth,
+                "leaves_scored": len(frontier),
+                "current_estimate": round(current, 2)}
+
+    def _children(self) -> list[tuple]:
+        """(state, solved-corner delta, solved-edge delta) after each move."""
+        return [_step(self.cube, i) for i in range(18)]
+
+    def _rank_children(self, children: list[tuple], values: list[float]) -> list[dict]:
+        """rank_moves' ordering of the 18 _children() given their cost-to-go
+        (split out so batched callers can score many sessions in one forward)."""
         # Ban undoing the last committed move (prevents X X' oscillation).
         from data import _INV_IDX  # reuse the inverse-index table
         last = self.history[-1] if self.history else -1
         undo_idx = _INV_IDX[last] if last >= 0 else -1
 
-        children = [self.state @ _MOVE_STATES[i] for i in range(18)]
-        values = self._value_batch(children)
         ranked = []
-        for i in range(18):
-            c = _solved_counts(children[i])
+        for i, (_, dc, de) in enumerate(children):
+            c = _counts(self._corners_ok + dc, self._edges_ok + de)
             ranked.append({
                 "move": NOTATION[i],
                 "estimated_moves_to_solve": round(values[i], 2),
@@ -389,8 +746,7 @@ class CubeSession:
         ranked.sort(key=lambda r: (not r["would_solve"],
                                    r["undoes_last_move"],
                                    r["estimated_moves_to_solve"]))
-        return {"ranked_moves": ranked,
-                "current_estimate": round(self._value(self.state), 2)}
+        return ranked
 
     def rank_moves_pieces(self) -> dict:
         """Ablation 'bad-heuristic' twin of rank_moves: same forward search over
@@ -402,7 +758,8 @@ class CubeSession:
         undo_idx = _INV_IDX[last] if last >= 0 else -1
         ranked = []
         for i in range(18):
-            c = _solved_counts(self.state @ _MOVE_STATES[i])
+            _, dc, de = _step(self.cube, i)
+            c = _counts(self._corners_ok + dc, self._edges_ok + de)
             ranked.append({
                 "move": NOTATION[i],
                 "pieces_solved": c["pieces_solved"],
@@ -413,48 +770,32 @@ class CubeSession:
                                    r["undoes_last_move"],
                                    -r["pieces_solved"]))
         return {"ranked_moves": ranked,
-                "current_pieces_solved": _solved_counts(self.state)["pieces_solved"]}
+                "current_pieces_solved": self._corners_ok + self._edges_ok}
 
-    def _value(self, state: State) -> float:
+    def _model(self):
         if self._value_model is None:
-            from infer import load_model_auto  # lazy import (loads MLX model)
-            self._value_model = load_model_auto(
-                str(_SRC.parent / "runs" / "hindsight_not" / "latest.npz")
-            )
-        m = self._value_model
-        cp = mx.array([[int(x) for x in state.corner_positions.tolist()]], dtype=mx.int32)
-        ct = mx.array([[int(x) for x in state.twist_co.tolist()]], dtype=mx.int32)
-        ep = mx.array([[int(x) for x in state.edge_positions.tolist()]], dtype=mx.int32)
-        ef = mx.array([[int(x) for x in state.twist_eo.tolist()]], dtype=mx.int32)
-        gcp = mx.array([list(range(8))], dtype=mx.int32)
-        gct = mx.zeros((1, 8), dtype=mx.int32)
-        gep = mx.array([list(range(12))], dtype=mx.int32)
-        gef = mx.zeros((1, 12), dtype=mx.int32)
-        _, value = m(goal=(gcp, gct, gep, gef), curr=(cp, ct, ep, ef),
-                     t=None, return_value=True)
-        mx.eval(value)
-        return float(value.tolist()[0])
-
-    def _value_batch(self, states: list[State]) -> list[float]:
-        """Cost-to-go for many states in one batched forward."""
-        if self._value_model is None:
-            from infer import load_model_auto
-            self._value_model = load_model_auto(
-                str(_SRC.parent / "runs" / "hindsight_not" / "latest.npz")
-            )
-        m = self._value_model
+            self._value_model = VALUE_MODELS.get(self.value_ckpt)
+        return self._value_model
+
+    def _value(self, state) -> float:
+        return self._value_batch([state])[0]
+
+    def _value_batch(self, states: list) -> list[float]:
+        """Cost-to-go for many states (integer tuples or States) in one
+        batched forward."""
+        m = self._model()
+        states = [_as_int(st) for st in states]
         n = len(states)
-        cp = mx.array([[int(x) for x in s.corner_positions.tolist()] for s in states], dtype=mx.int32)
-        ct = mx.array([[int(x) for x in s.twist_co.tolist()] for s in states], dtype=mx.int32)
-        ep = mx.array([[int(x) for x in s.edge_positions.tolist()] for s in states], dtype=mx.int32)
-        ef = mx.array([[int(x) for x in s.twist_eo.tolist()] for s in states], dtype=mx.int32)
-        gcp = mx.broadcast_to(mx.arange(8, dtype=mx.int32).reshape(1, 8), (n, 8))
-        gct = mx.zeros((n, 8), dtype=mx.int32)
-        gep = mx.broadcast_to(mx.arange(12, dtype=mx.int32).reshape(1, 12), (n, 12))
-        gef = mx.zeros((n, 12), dtype=mx.int32)
-        _, value = m(goal=(gcp, gct, gep, gef), curr=(cp, ct, ep, ef),
-                     t=None, return_value=True)
-        mx.eval(value)
+        with _MODEL_LOCK:
+            cp, ct, ep, ef = (mx.array([st[k] for st in states], dtype=mx.int32)
+                              for k in range(4))
+            gcp = mx.broadcast_to(mx.arange(8, dtype=mx.int32).reshape(1, 8), (n, 8))
+            gct = mx.zeros((n, 8), dtype=mx.int32)
+            gep = mx.broadcast_to(mx.arange(12, dtype=mx.int32).reshape(1, 12), (n, 12))
+            gef = mx.zeros((n, 12), dtype=mx.int32)
+            _, value = m(goal=(gcp, gct, gep, gef), curr=(cp, ct, ep, ef),
+                         t=None, return_value=True)
+            mx.eval(value)
         return [float(v) for v in value.tolist()]
 
 
@@ -72,6 +72,104 @@ for _i in range(18):
     _INV_IDX.append(_fi + (_inv_t - 1))
 
 
+def _join_moves(a: list[int], b: list[int]) -> list[int]:
+    """Concatenate two move sequences, merging same-face turns at the join
+    (U + U2 -> U', R + R' -> nothing)."""
+    out = list(a)
+    for m in b:
+        if out and out[-1] // 3 == m // 3:
+            turns = (out.pop() % 3 + 1 + m % 3 + 1) % 4
+            if turns:
+                out.append((m // 3) * 3 + turns - 1)
+        else:
+            out.append(m)
+    return out
+
+
+def _allowed(m: int, last: int) -> bool:
+    """Canonical-sequence filter for move m after move `last` (-1 = none):
+    no face twice in a row, commuting opposite faces in one order only."""
+    if last < 0:
+        return True
+    f, lf = m // 3, last // 3
+    return f != lf and not (f // 2 == lf // 2 and f < lf)
+
+
+# ---------------------------------------------------------------------------
+# Uniform random states (alternative to random-walk scrambles)
+# ---------------------------------------------------------------------------
+
+SCRAMBLE_GENERATORS = ("walk", "uniform")
+
+
+def _parity(perm: mx.array) -> mx.array:
+    """Row-wise permutation parity (0 even / 1 odd) of an int [N, k] array."""
+    k = perm.shape[1]
+    upper = mx.triu(mx.ones((k, k), dtype=mx.bool_), k=1)
+    inversions = (perm[:, :, None] > perm[:, None, :]) & upper
+    return mx.sum(inversions.astype(mx.int32), axis=(1, 2)) % 2
+
+
+def uniform_state_arrays(
+    n: int,
+    seed: int | None = None,
+) -> tuple[mx.array, mx.array, mx.array, mx.array]:
+    """Draw n states uniformly from the cube group, vectorized over the batch.
+
+    Corner and edge permutations are uniform random permutations; wherever
+    their parities disagree the last two edges are swapped, which maps the
+    odd edge permutations bijectively onto the even ones (and vice versa),
+    so the result stays uniform over the parity-matched pairs. The first 7
+    twists / 11 flips are uniform and the last one is fixed by the sum
+    constraints (twist sum = 0 mod 3, flip sum = 0 mod 2).
+
+    Unlike a random walk this costs O(1) per state regardless of depth and is
+    an exact sample of the ~4.3e19-element group.
+
+    Returns (cp, ct, ep, ef) int32 arrays of shapes [n,8], [n,8], [n,12], [n,12].
+    """
+    key = mx.random.key(seed if seed is not None else random.randrange(2**32))
+    k_cp, k_ep, k_ct, k_ef = mx.random.split(key, 4)
+
+    cp = mx.argsort(mx.random.uniform(shape=(n, 8), key=k_cp), axis=1)
+    ep = mx.argsort(mx.random.uniform(shape=(n, 12), key=k_ep), axis=1)
+    mismatch = _parity(cp) != _parity(ep)
+    ep_swapped = mx.concatenate([ep[:, :10], ep[:, 11:12], ep[:, 10:11]], axis=1)
+    ep = mx.where(mismatch[:, None], ep_swapped, ep)
+
+    ct7 = mx.random.randint(0, 3, (n, 7), key=k_ct)
+    ct = mx.concatenate(
+        [ct7, ((3 - mx.sum(ct7, axis=1) % 3) % 3)[:, None]], axis=1)
+    ef11 = mx.random.randint(0, 2, (n, 11), key=k_ef)
+    ef = mx.concatenate([ef11, (mx.sum(ef11, axis=1) % 2)[:, None]], axis=1)
+
+    out = tuple(a.astype(mx.int32) for a in (cp, ct, ep, ef))
+    mx.eval(*out)
+    return out
+
+
+def generate_uniform_states(n: int, seed: int | None = None) -> list[tuple]:
+    """n uniformly random states as pure-Python (cp, ct, ep, ef) tuples."""
+    if n <= 0:
+        return []
+    cp, ct, ep, ef = (a.tolist() for a in uniform_state_arrays(n, seed))
+    return [(cp[i], ct[i], ep[i], ef[i]) for i in range(n)]
+
+
+def generate_walk_states(n: int, depth: int,
+                         rng: random.Random | None = None) -> list[tuple]:
+    """n random-walk scrambles of exactly `depth` moves from the identity
+    (rng None = the module-level random generator)."""
+    randrange = (rng or random).randrange
+    states = []
+    for _ in range(n):
+        state = _IDENTITY
+        for _ in range(depth):
+            state = _compose(state, _MOVES_PY[randrange(18)])
+        states.append(state)
+    return states
+
+
 # ---------------------------------------------------------------------------
 
 def generate_batch(
@@ -119,10 +217,34 @@ def generate_batch(
     return {k: mx.array(v, dtype=mx.int32) for k, v in rows.items()}
 
 
+# Solvers that can label behavioral-cloning trajectories.
+TEACHERS = ("cfop", "kociemba")
+
+
+def teacher_solver(teacher: str):
+    """Return solve(state) -> move indices for the named teacher.
+
+    'cfop'     : cfop.solve (~60 moves, stage-structured)
+    'kociemba' : kociemba.solve (two-phase, ~21 moves)
+    """
+    _src_dir = str(Path(__file__).parent)
+    if _src_dir not in sys.path:
+        sys.path.insert(0, _src_dir)
+    if teacher == "cfop":
+        import cfop
+        return cfop.solve
+    if teacher == "kociemba":
+        import kociemba
+        return kociemba.solve
+    raise ValueError(f"Unknown teacher: {teacher!r} (expected one of {TEACHERS})")
+
+
 def cfop_batch(
     batch_size: int,
     scramble_depth: int = 25,
     t_max: int = 100,
+    scramble_gen: str = "walk",
+    workers: int = 1,
 ) -> dict[str, mx.array]:
     """Generate a behavioral-cloning batch from the CFOP solver.
 
@@ -134,6 +256,9 @@ def cfop_batch(
       - goal          : _IDENTITY (solved cube) for every sample
 
     Samples are collected across multiple scrambles until batch_size is reached.
+    scramble_gen='uniform' draws each scramble uniformly from the cube group
+    (scramble_depth is then ignored) instead of a random walk. workers > 1
+    spreads the F2L searches over processes (cfop.solve_many).
 
     Keys returned
     -------------
@@ -160,37 +285,40 @@ def cfop_batch(
 
     collected = 0
     while collected < batch_size:
-        # Scramble from identity
-        state = _IDENTITY
-        for _ in range(scramble_depth):
-            state = _compose(state, _MOVES_PY[random.randrange(18)])
-
-        # Ask CFOP solver for the full solution move list
-        try:
-            solution = _cfop.solve(state)
-        except RuntimeError:
-            # Skip unsolvable states (shouldn't happen, but be defensive)
-            continue
-
-        if not solution:
-            # Already solved — no training signal
-            continue
-
-        # Walk along the solution trajectory
-        current = state
-        n_remaining = len(solution)
-        for step_idx, move_idx in enumerate(solution):
+        # Scramble from identity (enough for the rest of the batch at ~60
+        # moves per solution), then solve them all in one solve_many call
+        n_scrambles = max(4, (batch_size - collected) // 50 + 1)
+        if scramble_gen == "uniform":
+            states = generate_uniform_states(n_scrambles)
+        else:
+            states = generate_walk_states(n_scrambles, scramble_depth)
+
+        # Ask CFOP solver for the full solution move lists; None marks an
+        # unsolvable state (shouldn't happen, but be defensive)
+        solutions = _cfop.solve_many(states, workers=workers)
+
+        for state, solution in zip(states, solutions):
             if collected >= batch_size:
                 break
-            t_val = min(max(n_remaining - step_idx, 1), t_max)
-            rows['gcp'].append(gcp);          rows['gct'].append(gct)
-            rows['gep'].append(gep);          rows['gef'].append(gef)
-            rows['ccp'].append(current[0]);   rows['cct'].append(current[1])
-            rows['cep'].append(current[2]);   rows['cef'].append(current[3])
-            rows['t'].append(t_val)
-            rows['target'].append(move_idx)
-            collected += 1
-            current = _compose(current, _MOVES_PY[move_idx])
+            if not solution:
+                # Unsolvable or already solved — no training signal
+                continue
+
+            # Walk along the solution trajectory
+            current = state
+            n_remaining = len(solution)
+            for step_idx, move_idx in enumerate(solution):
+                if collected >= batch_size:
+                    break
+                t_val = min(max(n_remaining - step_idx, 1), t_max)
+                rows['gcp'].append(gcp);          rows['gct'].append(gct)
+                rows['gep'].append(gep);          rows['gef'].append(gef)
+                rows['ccp'].append(current[0]);   rows['cct'].append(current[1])
+                rows['cep'].append(current[2]);   rows['cef'].append(current[3])
+                rows['t'].append(t_val)
+                rows['target'].append(move_idx)
+                collected += 1
+                current = _compose(current, _MOVES_PY[move_idx])
 
     return {k: mx.array(v, dtype=mx.int32) for k, v in rows.items()}
 
@@ -203,6 +331,13 @@ def build_cfop_pool(
     verbose: bool = True,
     min_depth: int | None = None,
     randomize: bool = False,
+    scramble_gen: str = "walk",
+    stats_path: str | None = None,
+    teacher: str = "cfop",
+    cross_faces: str = "D",
+    cross_pick: str = "cross",
+    workers: int = 1,
+    diverse_k: int = 1,
 ) -> dict[str, mx.array]:
     """Build a large pool of behavioral-cloning samples from the CFOP solver.
 
@@ -222,6 +357,21 @@ def build_cfop_pool(
                     [min_depth, scramble_depth]; None = fixed scramble_depth
     randomize     : if True, pass randomize=True to cfop.solve() so that
                     pair order and AUF choices vary per scramble
+    scramble_gen  : 'walk' (random-walk scrambles, default) or 'uniform'
+                    (uniformly random states; scramble_depth/min_depth unused)
+    stats_path    : if given, collect cfop.SolveStats over every solve and write
+                    the per-stage timing / node-count histograms there as JSON
+                    (CFOP teacher only)
+    teacher       : 'cfop' (default) or 'kociemba' (two-phase solver, ~21-move
+                    solutions; randomize / stats_path are CFOP-only)
+    cross_faces   : faces the CFOP cross may be built on ("D" default,
+                    cfop.CROSS_FACES = color neutral; see cfop.solve)
+    cross_pick    : 'cross' or 'cross+f2l' (see cfop.solve)
+    workers       : processes for the CFOP searches (cfop.solve_many, or
+                    cfop.solve_diverse_many when diverse_k > 1)
+    diverse_k     : if > 1, every scramble contributes up to diverse_k distinct
+                    CFOP trajectories from one cfop.solve_diverse call (pair
+                    order / AUF branches; deterministic, unlike randomize)
 
     Returns
     -------
@@ -233,6 +383,14 @@ def build_cfop_pool(
         sys.path.insert(0, _src_dir)
     import cfop as _cfop
 
+    if teacher != "cfop" and (randomize or stats_path is not None or diverse_k > 1
+                              or cross_faces != "D" or cross_pick != "cross"):
+        raise ValueError("randomize / stats_path / diverse_k / cross_faces / "
+                         "cross_pick are only supported for teacher='cfop'")
+    if diverse_k > 1 and (randomize or cross_pick != "cross"):
+        raise ValueError("diverse_k > 1 replaces randomize and needs cross_pick='cross'")
+    teacher_solve = teacher_solver(teacher)
+
     goal_py = _IDENTITY
     gcp, gct, gep, gef = goal_py
 
@@ -249,44 +407,71 @@ def build_cfop_pool(
     # Single seeded RNG for reproducibility; used both for scramble depth
     # selection and (if randomize=True) passed to cfop.solve per scramble.
     _rng = random.Random(42)
+    uniform_buf: list[tuple] = []
+    solve_stats = _cfop.SolveStats() if stats_path is not None else None
 
     while collected < n_samples:
-        # Determine scramble depth for this cube
-        depth = (_rng.randint(min_depth, scramble_depth)
-                 if min_depth is not None
-                 else scramble_depth)
-
-        # Scramble from identity
-        state = _IDENTITY
-        for _ in range(depth):
-            state = _compose(state, _MOVES_PY[_rng.randrange(18)])
-
-        # Per-scramble solver RNG (only used when randomize=True)
-        solve_rng = random.Random(_rng.randrange(2**32)) if randomize else None
-
-        try:
-            solution = _cfop.solve(state, randomize=randomize, rng=solve_rng)
-        except RuntimeError:
-            continue
-
-        if not solution:
-            continue
-
-        n_scrambles += 1
-        current = state
-        n_remaining = len(solution)
-        for step_idx, move_idx in enumerate(solution):
+        # Draw a round of scrambles sized from the samples still missing
+        # (~60 CFOP moves per trajectory, at most 1000 scrambles per round so
+        # progress still prints) and solve them in one solve_many call; the
+        # RNG is consumed in the same order as one-at-a-time solving.
+        batch, solve_rngs = [], []
+        for _ in range(min(1000, max(16, (n_samples - collected) // (50 * diverse_k) + 1))):
+            if scramble_gen == "uniform":
+                # Draw uniform states in vectorized chunks, seeded from _rng
+                if not uniform_buf:
+                    uniform_buf = generate_uniform_states(256, seed=_rng.randrange(2**32))
+                state = uniform_buf.pop()
+            else:
+                # Determine scramble depth for this cube
+                depth = (_rng.randint(min_depth, scramble_depth)
+                         if min_depth is not None
+                         else scramble_depth)
+                state = generate_walk_states(1, depth, _rng)[0]
+            batch.append(state)
+            # Per-scramble solver RNG (only used when randomize=True)
+            solve_rngs.append(random.Random(_rng.randrange(2**32)) if randomize else None)
+
+        if teacher == "cfop" and diverse_k > 1:
+            trajectories = _cfop.solve_diverse_many(batch, diverse_k, workers=workers,
+                                                    stats=solve_stats,
+                                                    cross_faces=cross_faces)
+        elif teacher == "cfop":
+            trajectories = [[sol] if sol is not None else [] for sol in
+                            _cfop.solve_many(batch, workers=workers, randomize=randomize,
+                                             rngs=solve_rngs, stats=solve_stats,
+                                             cross_faces=cross_faces,
+                                             cross_pick=cross_pick)]
+        else:
+            trajectories = []
+            for state in batch:
+                try:
+                    trajectories.append([teacher_solve(state)])
+                except RuntimeError:
+                    trajectories.append([])
+
+        for state, solution in ((st, sol) for st, sols in zip(batch, trajectories)
+                                for sol in sols):
             if collected >= n_samples:
                 break
-            t_val = min(max(n_remaining - step_idx, 1), t_max)
-            rows['gcp'].append(gcp);          rows['gct'].append(gct)
-            rows['gep'].append(gep);          rows['gef'].append(gef)
-            rows['ccp'].append(current[0]);   rows['cct'].append(current[1])
-            rows['cep'].append(current[2]);   rows['cef'].append(current[3])
-            rows['t'].append(t_val)
-            rows['target'].append(move_idx)
-            collected += 1
-            current = _compose(current, _MOVES_PY[move_idx])
+            if not solution:
+                continue
+
+            n_scrambles += 1
+            current = state
+            n_remaining = len(solution)
+            for step_idx, move_idx in enumerate(solution):
+                if collected >= n_samples:
+                    break
+                t_val = min(max(n_remaining - step_idx, 1), t_max)
+                rows['gcp'].append(gcp);          rows['gct'].append(gct)
+                rows['gep'].append(gep);          rows['gef'].append(gef)
+                rows['ccp'].append(current[0]);   rows['cct'].append(current[1])
+                rows['cep'].append(current[2]);   rows['cef'].append(current[3])
+                rows['t'].append(t_val)
+                rows['target'].append(move_idx)
+                collected += 1
+                current = _compose(current, _MOVES_PY[move_idx])
 
         if verbose and collected - last_report >= 10000:
             elapsed = time.time() - t0
@@ -299,6 +484,14 @@ def build_cfop_pool(
 
     pool = {k: mx.array(v, dtype=mx.int32) for k, v in rows.items()}
 
+    if solve_stats is not None:
+        solve_stats.write_json(stats_path)
+        if verbose:
+            share = solve_stats.summary()["stage_share"]
+            print("pool: solve time share " + ", ".join(
+                f"{k} {v:.0%}" for k, v in share.items())
+                + f"; stats written to {stats_path}", flush=True)
+
     if cache_path is not None:
         mx.savez(cache_path, **pool)
         if verbose:
@@ -464,6 +657,13 @@ def load_cfop_pool(
     verbose: bool = True,
     min_depth: int | None = None,
     randomize: bool = False,
+    scramble_gen: str = "walk",
+    stats_path: str | None = None,
+    teacher: str = "cfop",
+    cross_faces: str = "D",
+    cross_pick: str = "cross",
+    workers: int = 1,
+    diverse_k: int = 1,
 ) -> dict[str, mx.array]:
     """Load a CFOP sample pool from cache, or build (and save) it if needed.
 
@@ -480,6 +680,13 @@ def load_cfop_pool(
     min_depth  : if set, scramble depth varies randomly in [min_depth, scramble_depth]
     randomize  : if True, solver introduces pair-order and AUF diversity;
                  a distinct cache file is used (never collides with plain pool)
+    scramble_gen : 'walk' or 'uniform'; uniform pools get their own cache file
+    stats_path : solver-stats JSON path, only written when the pool is rebuilt
+    teacher    : 'cfop' or 'kociemba'; non-CFOP teachers get a cache suffix
+    cross_faces, cross_pick : CFOP cross-face choice; anything but the plain
+                 D cross gets a cache suffix (e.g. _xUDLRFB, _xUDLRFB_f2l)
+    diverse_k  : trajectories per scramble (cfop.solve_diverse); k > 1 pools
+                 are deterministic and cached with a _k<k> suffix
     (other params forwarded to build_cfop_pool when a rebuild is needed)
     """
     # Derive a cache path that encodes diversity settings so diverse and plain
@@ -488,6 +695,9 @@ def load_cfop_pool(
     effective_cache: str | None
     if randomize:
         effective_cache = None  # do not cache randomized pools
+    elif scramble_gen == "uniform":
+        p_obj = Path(cache_path)
+        effective_cache = str(p_obj.with_name(p_obj.stem + "_uniform" + p_obj.suffix))
     elif min_depth is not None:
         # Embed min_depth into the filename stem to avoid collisions
         p_obj = Path(cache_path)
@@ -495,6 +705,16 @@ def load_cfop_pool(
         effective_cache = str(p_obj.with_name(stem + p_obj.suffix))
     else:
         effective_cache = cache_path
+    if effective_cache is not None and teacher != "cfop":
+        p_obj = Path(effective_cache)
+        effective_cache = str(p_obj.with_name(p_obj.stem + f"_{teacher}" + p_obj.suffix))
+    if effective_cache is not None and (cross_faces != "D" or cross_pick != "cross"):
+        p_obj = Path(effective_cache)
+        tag = f"_x{cross_faces}" + ("_f2l" if cross_pick == "cross+f2l" else "")
+        effective_cache = str(p_obj.with_name(p_obj.stem + tag + p_obj.suffix))
+    if effective_cache is not None and diverse_k > 1:
+        p_obj = Path(effective_cache)
+        effective_cache = str(p_obj.with_name(p_obj.stem + f"_k{diverse_k}" + p_obj.suffix))
 
     if effective_cache is not None:
         p = Path(effective_cache)
@@ -524,4 +744,11 @@ def load_cfop_pool(
         verbose=verbose,
         min_depth=min_depth,
         randomize=randomize,
+        scramble_gen=scramble_gen,
+        stats_path=stats_path,
+        teacher=teacher,
+        cross_faces=cross_faces,
+        cross_pick=cross_pick,
+        workers=workers,
+        diverse_k=diverse_k,
     )
@@ -0,0 +1,135 @@
+"""On-disk store for scramble suites and evaluation results.
+
+Layout under the store root
+---------------------------
+    scrambles/<generator>_d<depth>_s<seed>_n<n>.npz
+        one scramble suite as compact int8 arrays cp[n,8] ct[n,8] ep[n,12] ef[n,12]
+    results.jsonl
+        append-only log, one evaluated cell per line:
+        {"key", "ckpt", "ckpt_hash", "config", "result", "time"}
+
+A result is keyed by the *content* hash of the checkpoint (weights plus the
+sibling config .json) together with the canonical JSON of the evaluation
+config, so renaming or copying a checkpoint still hits the cache while
+retraining into the same path does not. The whole log is indexed in memory on
+open; later lines win when a key repeats.
+
+    store = EvalStore("runs/eval_store")
+    suite = store.scramble_suite("walk", 12, 0, 500, make=lambda: ...)
+    hit = store.get_result("runs/bc/latest.npz", config)
+    store.put_result("runs/bc/latest.npz", config, result)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+import mlx.core as mx
+
+# Pseudo checkpoint hash for cells that are not model evaluations.
+CFOP_HASH = "cfop"
+
+
+def _canonical(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
+
+
+def checkpoint_hash(ckpt_path: str) -> str:
+    """sha256 over the checkpoint bytes and its sibling config .json (if any)."""
+    h = hashlib.sha256()
+    with open(ckpt_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    cfg = Path(ckpt_path).with_suffix(".json")
+    if cfg.exists():
+        h.update(b"\0config\0")
+        h.update(cfg.read_bytes())
+    return h.hexdigest()
+
+
+class EvalStore:
+    """Persistent scramble suites + evaluation-result cache (see module doc)."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / "scrambles").mkdir(exist_ok=True)
+        self.results_path = self.root / "results.jsonl"
+        self._index: dict[str, dict] = {}
+        self._hashes: dict[tuple, str] = {}   # (path, mtime, size) -> hash
+        if self.results_path.exists():
+            with open(self.results_path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rec = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from an interrupted run
+                    self._index[rec["key"]] = rec
+
+    # -- scramble suites -----------------------------------------------------
+    def suite_path(self, generator: str, depth: int, seed: int, n: int) -> Path:
+        return self.root / "scrambles" / f"{generator}_d{depth}_s{seed}_n{n}.npz"
+
+    def scramble_suite(self, generator: str, depth: int, seed: int, n: int,
+                       make: Callable[[], list[tuple]]) -> list[tuple]:
+        """Load the suite keyed by (generator, depth, seed, n), or build it with
+        make() and persist it."""
+        path = self.suite_path(generator, depth, seed, n)
+        if path.exists():
+            arrs = mx.load(str(path))
+            cols = [arrs[k].astype(mx.int32).tolist() for k in ("cp", "ct", "ep", "ef")]
+            return [(cols[0][i], cols[1][i], cols[2][i], cols[3][i]) for i in range(n)]
+        suite = make()
+        arrays = {k: mx.array([s[j] for s in suite], dtype=mx.int8)
+                  for j, k in enumerate(("cp", "ct", "ep", "ef"))}
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        mx.savez(str(tmp), **arrays)
+        tmp.replace(path)
+        return suite
+
+    # -- results ---------------------------------------------------------------
+    def ckpt_hash(self, ckpt_path: str | None) -> str:
+        if ckpt_path is None:
+            return CFOP_HASH
+        st = Path(ckpt_path).stat()
+        memo = (str(Path(ckpt_path).resolve()), st.st_mtime_ns, st.st_size)
+        if memo not in self._hashes:
+            self._hashes[memo] = checkpoint_hash(ckpt_path)
+        return self._hashes[memo]
+
+    def result_key(self, ckpt_path: str | None, config: dict) -> str:
+        payload = self.ckpt_hash(ckpt_path) + "\0" + _canonical(config)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get_result(self, ckpt_path: str | None, config: dict) -> dict | None:
+        rec = self._index.get(self.result_key(ckpt_path, config))
+        return rec["result"] if rec is not None else None
+
+    def put_result(self, ckpt_path: str | None, config: dict, result: dict) -> None:
+        rec = {
+            "key": self.result_key(ckpt_path, config),
+            "ckpt": ckpt_path,
+            "ckpt_hash": self.ckpt_hash(ckpt_path),
+            "config": config,
+            "result": result,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(self.results_path, "a") as f:
+            f.write(_canonical(rec) + "\n")
+        self._index[rec["key"]] = rec
+
+    def records(self, ckpt: str | None = None) -> list[dict]:
+        """All stored records (latest per key), optionally for one checkpoint path."""
+        recs = list(self._index.values())
+        if ckpt is not None:
+            recs = [r for r in recs if r["ckpt"] == ckpt]
+        return sorted(recs, key=lambda r: (str(r["ckpt"]),
+                                           r["config"].get("scramble_depth", 0),
+                                           r["config"].get("search", "")))
@@ -17,11 +17,22 @@ Usage
     uv run python source/infer.py \\
         --ckpt runs/diffusion/latest.npz \\
         --n 100 --scramble-depth 8 --t-mode none
+    uv run python source/infer.py \\
+        --ckpt runs/bc/latest.npz --ckpt runs/diffusion/latest.npz \\
+        --sweep-depths 6,8,12,15,25 --sweep-search greedy,beam:8,value-astar:8 \\
+        --baseline --n 200 --workers 8 --jsonl runs/sweep.jsonl
+    uv run python source/infer.py --ckpt runs/bc/latest.npz \\
+        --sweep-depths 6,8,12 --store runs/eval_store     # re-runs skip stored cells
+    uv run python source/infer.py --store runs/eval_store --report
+    uv run python source/infer.py --baseline --teacher kociemba --n 50
+    uv run python source/infer.py --ckpt runs/bc/latest.npz \\
+        --scramble-depth 8 --optimal --optimal-budget 2000000
 """
 
 import argparse
 import json
 import math
+import os
 import random
 import statistics
 import sys
@@ -33,8 +44,12 @@ from mlx.utils import tree_flatten, tree_unflatten
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent / "cube"))
 
-from data import _IDENTITY, _MOVES_PY, _compose   # noqa: E402
-from cfop import solve as cfop_solve, cube_solved, _INV_IDX, _state_key  # noqa: E402
+from data import (                                 # noqa: E402
+    SCRAMBLE_GENERATORS, TEACHERS, _IDENTITY, _MOVES_PY, _compose,
+    generate_uniform_states, generate_walk_states, teacher_solver,
+)
+from cfop import cube_solved, solve_many, _INV_IDX, _state_key  # noqa: E402
+from eval_store import EvalStore                  # noqa: E402
 from model.solver import CubeSolver                # noqa: E402
 
 
@@ -630,16 +645,42 @@ def rollout_value_beam(
 # Scramble generation (fixed-seed for reproducibility)
 # ---------------------------------------------------------------------------
 
-def _generate_scrambles(n: int, scramble_depth: int, seed: int = 0) -> list[tuple]:
-    """Generate n scrambled cubes from the identity using a fixed random seed."""
-    rng = random.Random(seed)
-    scrambles = []
-    for _ in range(n):
-        state = _IDENTITY
-        for _ in range(scramble_depth):
-            state = _compose(state, _MOVES_PY[rng.randrange(18)])
-        scrambles.append(state)
-    return scrambles
+def _generate_scrambles(n: int, scramble_depth: int, seed: int = 0,
+                        generator: str = "walk") -> list[tuple]:
+    """Generate n scrambled cubes using a fixed random seed.
+
+    generator='walk'    : random walks of scramble_depth moves from the identity
+    generator='uniform' : uniformly random cube-group elements (depth ignored)
+    """
+    if generator == "uniform":
+        return generate_uniform_states(n, seed=seed)
+    if generator != "walk":
+        raise ValueError(f"Unknown scramble generator: {generator!r}")
+    return generate_walk_states(n, scramble_depth, random.Random(seed))
+
+
+def _load_scrambles(n: int, scramble_depth: int, seed: int, generator: str,
+                    store: EvalStore | None) -> list[tuple]:
+    """_generate_scrambles, served from / persisted to `store` when given."""
+    if store is None:
+        return _generate_scrambles(n, scramble_depth, seed=seed, generator=generator)
+    return store.scramble_suite(
+        generator, scramble_depth, seed, n,
+        make=lambda: _generate_scrambles(n, scramble_depth, seed=seed,
+                                         generator=generator))
+
+
+def _eval_config(n: int, scramble_depth: int, max_steps: int, seed: int,
+                 search: str, beam_width: int, t_mode: str, t_const: int | None,
+                 scramble_gen: str, model_cfg: dict | None = None,
+                 **extra) -> dict:
+    """The evaluation settings a stored result is keyed by (besides the ckpt)."""
+    return {
+        "n": n, "scramble_depth": scramble_depth, "max_steps": max_steps,
+        "seed": seed, "search": search, "beam_width": beam_width,
+        "t_mode": t_mode, "t_const": t_const, "scramble_gen": scramble_gen,
+        "model_cfg": dict(sorted((model_cfg or {}).items())), **extra,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -656,6 +697,15 @@ def evaluate(
     t_mode: str = "countdown",
     t_const: int | None = None,
     search: str = "auto",
+    scramble_gen: str = "walk",
+    adaptive: bool = False,
+    adaptive_batch: int = 50,
+    ci_width: float = 0.1,
+    ci_z: float = 1.96,
+    reference: tuple[float, float] | None = None,
+    store: EvalStore | None = None,
+    optimal_budget: int | None = None,
+    optimal_workers: int = 1,
     **model_cfg,
 ) -> dict:
     """Evaluate a checkpoint on n scrambles.
@@ -672,13 +722,32 @@ def evaluate(
     t_const       : fixed t value for t_mode='const' (default = scramble_depth)
     search        : 'auto' | 'greedy' | 'beam' | 'value-beam'
                     'auto' = beam if beam_width>0 else greedy (legacy behaviour)
+    scramble_gen  : 'walk' | 'uniform' (see _generate_scrambles)
+    adaptive      : evaluate in batches of adaptive_batch scrambles and stop
+                    early once the Wilson interval on the success rate is at
+                    most ci_width wide, or lies entirely outside `reference`
+                    (a (lo, hi) interval of a competing checkpoint). n is then
+                    the cap. With scramble_gen='walk' the scrambles are the
+                    same prefix of the fixed seed sequence, so an early stop
+                    equals a smaller-n run; 'uniform' draws the whole suite at
+                    once, so a smaller n gives different states.
+    ci_z          : z-score of the interval (1.96 = 95%)
+    store         : optional EvalStore; the scramble suite is read from / saved
+                    to it, and a stored result for the same checkpoint content
+                    and config is returned without re-evaluating
+    optimal_budget: if set, also solve every solved scramble optimally
+                    (optimal.py, IDA* node budget per scramble) and report the
+                    solution-length gap under result['optimal']
+    optimal_workers: processes for those optimal solves (optimal.optimal_length)
     **model_cfg   : forwarded to load_model_auto (d_model, n_layers, etc.)
 
     Returns
     -------
     dict with keys: success_rate, n_solved, n, avg_steps_solved,
                     median_steps_solved, scramble_depth, max_steps, beam_width,
-                    search
+                    search, ci_low, ci_high
+                    (+ n_max, stopped_early when adaptive=True)
+                    (+ optimal when optimal_budget is set)
     """
     if max_steps is None or max_steps <= 0:
         max_steps = max(60, scramble_depth * 6)
@@ -686,18 +755,211 @@ def evaluate(
     if t_const is None:
         t_const = scramble_depth
 
+    config = None
+    if store is not None:
+        eff_search, eff_width = _resolve_search(search, beam_width)
+        extra = (dict(adaptive_batch=adaptive_batch, ci_width=ci_width, ci_z=ci_z,
+                      reference=list(reference) if reference else None)
+                 if adaptive else {})
+        if optimal_budget is not None:
+            extra["optimal_budget"] = optimal_budget
+        config = _eval_config(n, scramble_depth, max_steps, seed, eff_search,
+                              eff_width, t_mode, t_const, scramble_gen, model_cfg,
+                              **extra)
+        cached = store.get_result(ckpt_path, config)
+        if cached is not None:
+            return cached
+
     model = load_model_auto(ckpt_path, **model_cfg)
-    scrambles = _generate_scrambles(n, scramble_depth, seed=seed)
+    scrambles = _load_scrambles(n, scramble_depth, seed, scramble_gen, store)
+    result = _evaluate_loaded(model, scrambles, scramble_depth, max_steps,
+                              beam_width, t_mode, t_const, search, adaptive,
+                              adaptive_batch, ci_width, ci_z, reference,
+                              optimal_budget, optimal_workers)
+    if store is not None:
+        store.put_result(ckpt_path, config, result)
+    return result
+
+
+def _evaluate_loaded(model, scrambles, scramble_depth, max_steps, beam_width,
+                     t_mode, t_const, search, adaptive, adaptive_batch,
+                     ci_width, ci_z, reference, optimal_budget=None,
+                     optimal_workers=1) -> dict:
+    """evaluate() body once the model and scramble suite are in hand."""
+    n = len(scrambles)
+    if not adaptive:
+        solved_mask, steps, effective_search, beam_width = _run_search(
+            model, scrambles, scramble_depth, max_steps, search, beam_width,
+            t_mode=t_mode, t_const=t_const,
+        )
+        result = _summarize(solved_mask, steps, scramble_depth=scramble_depth,
+                            max_steps=max_steps, beam_width=beam_width,
+                            search=effective_search)
+        result["ci_low"], result["ci_high"] = wilson_interval(
+            result["n_solved"], result["n"], z=ci_z)
+        if optimal_budget is not None:
+            result["optimal"] = _optimality(scrambles, solved_mask, steps,
+                                            optimal_budget, optimal_workers)
+        return result
+
+    stream = _adaptive_stream(model, scrambles, scramble_depth, max_steps,
+                              search, beam_width, t_mode, t_const, adaptive_batch)
+    for solved_mask, steps, effective_search, width in stream:
+        lo, hi = wilson_interval(sum(solved_mask), len(solved_mask), z=ci_z)
+        if _ci_done((lo, hi), ci_width, reference):
+            break
+    result = _summarize(solved_mask, steps, scramble_depth=scramble_depth,
+                        max_steps=max_steps, beam_width=width,
+                        search=effective_search)
+    result.update(ci_low=lo, ci_high=hi, n_max=n,
+                  stopped_early=len(solved_mask) < n)
+    if optimal_budget is not None:
+        result["optimal"] = _optimality(scrambles[:len(solved_mask)], solved_mask,
+                                        steps, optimal_budget, optimal_workers)
+    return result
+
+
+def _optimality(scrambles, solved_mask, steps, node_budget, workers=1) -> dict:
+    """optimal.optimality_gap with the default Korf tables (imported lazily:
+    the tables are large and built separately)."""
+    from optimal import optimality_gap
+    return optimality_gap(scrambles, solved_mask, steps, node_budget=node_budget,
+                          workers=workers)
+
+
+# ---------------------------------------------------------------------------
+# Confidence intervals / sequential (early-stopping) evaluation
+# ---------------------------------------------------------------------------
+
+def wilson_interval(k: int, n: int, z: float = 1.96) -> tuple[float, float]:
+    """Wilson score interval for a binomial success rate k/n.
+
+    Unlike the normal approximation it stays inside [0, 1] and behaves at
+    k = 0 or k = n, which matters for easy (depth-6) and hopeless cells.
+    """
+    if n <= 0:
+        return 0.0, 1.0
+    p = k / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def _ci_done(ci: tuple[float, float], ci_width: float,
+             reference: tuple[float, float] | None) -> bool:
+    """Stop rule: interval narrow enough, or disjoint from the reference."""
+    lo, hi = ci
+    if hi - lo <= ci_width:
+        return True
+    return reference is not None and (hi < reference[0] or lo > reference[1])
+
+
+def _adaptive_stream(model, scrambles, scramble_depth, max_steps, search,
+                     beam_width, t_mode, t_const, batch):
+    """Yield cumulative (solved_mask, steps, search, beam_width) after each
+    batch of scrambles. Rollouts are independent per scramble, so batching
+    does not change any individual result. An empty suite yields one empty
+    state, so callers always see at least one."""
+    solved_mask: list[bool] = []
+    steps: list[int] = []
+    if not scrambles:
+        yield solved_mask, steps, *_resolve_search(search, beam_width)
+        return
+    for start in range(0, len(scrambles), max(1, batch)):
+        m, st, effective_search, width = _run_search(
+            model, scrambles[start:start + batch], scramble_depth, max_steps,
+            search, beam_width, t_mode=t_mode, t_const=t_const,
+        )
+        solved_mask.extend(m)
+        steps.extend(st)
+        yield solved_mask, steps, effective_search, width
+
+
+def compare_adaptive(
+    ckpt_a: str,
+    ckpt_b: str,
+    n: int = 1000,
+    scramble_depth: int = 25,
+    max_steps: int | None = None,
+    seed: int = 0,
+    beam_width: int = 0,
+    t_mode: str = "countdown",
+    t_const: int | None = None,
+    search: str = "auto",
+    scramble_gen: str = "walk",
+    adaptive_batch: int = 50,
+    ci_width: float = 0.1,
+    ci_z: float = 1.96,
+    **model_cfg,
+) -> tuple[dict, dict]:
+    """Sequentially evaluate two checkpoints on the same scrambles.
+
+    Both advance one batch at a time; evaluation stops as soon as their Wilson
+    intervals are disjoint (the comparison is decided) or both are narrower
+    than ci_width (the difference is below the resolution asked for), with n
+    as the cap. Returns (result_a, result_b) in the evaluate() format, with an
+    extra 'separated' flag.
+    """
+    if max_steps is None or max_steps <= 0:
+        max_steps = max(60, scramble_depth * 6)
+    if t_const is None:
+        t_const = scramble_depth
+
+    scrambles = _generate_scrambles(n, scramble_depth, seed=seed,
+                                    generator=scramble_gen)
+    streams = [
+        _adaptive_stream(load_model_auto(ckpt, **model_cfg), scrambles,
+                         scramble_depth, max_steps, search, beam_width,
+                         t_mode, t_const, adaptive_batch)
+        for ckpt in (ckpt_a, ckpt_b)
+    ]
+    separated = False
+    for state_a, state_b in zip(*streams):
+        ci_a = wilson_interval(sum(state_a[0]), len(state_a[0]), z=ci_z)
+        ci_b = wilson_interval(sum(state_b[0]), len(state_b[0]), z=ci_z)
+        separated = ci_a[1] < ci_b[0] or ci_b[1] < ci_a[0]
+        if separated or (_ci_done(ci_a, ci_width, None)
+                         and _ci_done(ci_b, ci_width, None)):
+            break
 
-    # Resolve effective search mode
+    results = []
+    for (mask, steps, effective_search, width), ci in ((state_a, ci_a), (state_b, ci_b)):
+        r = _summarize(mask, steps, scramble_depth=scramble_depth,
+                       max_steps=max_steps, beam_width=width,
+                       search=effective_search)
+        r.update(ci_low=ci[0], ci_high=ci[1], n_max=n,
+                 stopped_early=len(mask) < n, separated=separated)
+        results.append(r)
+    return results[0], results[1]
+
+
+def _resolve_search(search: str, beam_width: int) -> tuple[str, int]:
+    """Map 'auto' to a concrete mode and default the value-search beam width."""
     if search == "auto":
-        effective_search = "beam" if beam_width > 0 else "greedy"
-    else:
-        effective_search = search
+        search = "beam" if beam_width > 0 else "greedy"
+    if search in ("value-beam", "value-astar") and beam_width <= 0:
+        beam_width = 8  # sensible default if user forgot --beam
+    return search, beam_width
+
+
+def _run_search(
+    model: CubeSolver,
+    scrambles: list[tuple],
+    scramble_depth: int,
+    max_steps: int,
+    search: str,
+    beam_width: int,
+    t_mode: str = "countdown",
+    t_const: int | None = None,
+) -> tuple[list[bool], list[int], str, int]:
+    """Dispatch to the rollout for `search`.
+
+    Returns (solved_mask, steps, effective_search, effective_beam_width).
+    """
+    effective_search, beam_width = _resolve_search(search, beam_width)
 
     if effective_search in ("value-beam", "value-astar"):
-        if beam_width <= 0:
-            beam_width = 8  # sensible default if user forgot --beam
         solved_mask, steps = rollout_value_beam(
             model, scrambles, scramble_depth, max_steps, beam_width,
             t_mode=t_mode, t_const=t_const,
@@ -713,9 +975,14 @@ def evaluate(
             model, scrambles, scramble_depth, max_steps,
             t_mode=t_mode, t_const=t_const,
         )
+    return solved_mask, steps, effective_search, beam_width
+
 
+def _summarize(solved_mask: list[bool], steps: list[int], **extra) -> dict:
+    """Aggregate per-scramble rollout results into the evaluate() result dict."""
+    n = len(solved_mask)
     n_solved = sum(solved_mask)
-    success_rate = n_solved / n
+    success_rate = n_solved / n if n else float("nan")
 
     solved_steps = [steps[i] for i in range(n) if solved_mask[i]]
     avg_steps = statistics.mean(solved_steps) if solved_steps else float("nan")
@@ -727,10 +994,7 @@ def evaluate(
         "n": n,
         "avg_steps_solved": avg_steps,
         "median_steps_solved": median_steps,
-        "scramble_depth": scramble_depth,
-        "max_steps": max_steps,
-        "beam_width": beam_width,
-        "search": effective_search,
+        **extra,
     }
 
 
@@ -738,35 +1002,79 @@ def evaluate(
 # CFOP baseline
 # ---------------------------------------------------------------------------
 
-def cfop_baseline(n: int, scramble_depth: int, seed: int = 0) -> dict:
+def cfop_baseline(n: int, scramble_depth: int, seed: int = 0,
+                  scramble_gen: str = "walk",
+                  store: EvalStore | None = None,
+                  teacher: str = "cfop", workers: int = 1) -> dict:
     """Run the CFOP solver on the same n scrambles and report solution lengths.
 
+    teacher='kociemba' runs the two-phase solver instead (same result keys).
+    workers > 1 spreads the CFOP F2L searches over processes (cfop.solve_many).
+
     Returns dict with keys: success_rate, n_solved, n, avg_len, median_len,
-                            scramble_depth
+                            scramble_depth (avg/median_steps_solved mirror
+                            the lengths so rows line up with evaluate())
     """
-    scrambles = _generate_scrambles(n, scramble_depth, seed=seed)
-    lengths = []
-    n_solved = 0
-    for state in scrambles:
-        try:
-            sol = cfop_solve(state)
-            if cube_solved(_compose_seq(state, sol)):
-                lengths.append(len(sol))
-                n_solved += 1
-        except RuntimeError:
-            pass
-
-    avg_len = statistics.mean(lengths) if lengths else float("nan")
-    median_len = statistics.median(lengths) if lengths else float("nan")
-
-    return {
-        "success_rate": n_solved / n,
-        "n_solved": n_solved,
-        "n": n,
-        "avg_len": avg_len,
-        "median_len": median_len,
-        "scramble_depth": scramble_depth,
-    }
+    config = None
+    if store is not None:
+        config = _cfop_config(n, scramble_depth, seed, scramble_gen, teacher)
+        cached = store.get_result(None, config)
+        if cached is not None:
+            return cached
+    scrambles = _load_scrambles(n, scramble_depth, seed, scramble_gen, store)
+    solved_mask, lengths = _cfop_solve_chunk(scrambles, teacher, workers)
+    result = _cfop_result(solved_mask, lengths, scramble_depth)
+    if store is not None:
+        store.put_result(None, config, result)
+    return result
+
+
+def _teacher_versions(teacher: str) -> dict:
+    """Table / PDB versions of the teacher, so a solver change misses the store."""
+    if teacher == "kociemba":
+        import kociemba
+        return {"kociemba_tables": kociemba._TABLE_VERSION}
+    import cfop
+    return {"cfop_tables": cfop._CACHE_VERSION, "cfop_pdb": cfop._PDB_VERSION}
+
+
+def _cfop_config(n: int, scramble_depth: int, seed: int, scramble_gen: str,
+                 teacher: str = "cfop") -> dict:
+    extra = {"teacher": teacher} if teacher != "cfop" else {}
+    extra["solver"] = _teacher_versions(teacher)
+    return _eval_config(n, scramble_depth, 0, seed, CFOP_SEARCH, 0, "none",
+                        None, scramble_gen, **extra)
+
+
+def _cfop_result(solved_mask: list[bool], lengths: list[int],
+                 scramble_depth: int) -> dict:
+    result = _summarize(solved_mask, lengths, scramble_depth=scramble_depth,
+                        search=CFOP_SEARCH, beam_width=0)
+    result["avg_len"] = result["avg_steps_solved"]
+    result["median_len"] = result["median_steps_solved"]
+    return result
+
+
+def _cfop_solve_chunk(scrambles: list[tuple], teacher: str = "cfop",
+                      workers: int = 1) -> tuple[list[bool], list[int]]:
+    """Solve each scramble with the teacher. Returns (solved_mask,
+    solution_lengths); the length of an unsolved scramble is 0."""
+    if teacher == "cfop":
+        solutions = solve_many(scrambles, workers=workers)
+    else:
+        solve = teacher_solver(teacher)
+        solutions = []
+        for state in scrambles:
+            try:
+                solutions.append(solve(state))
+            except RuntimeError:
+                solutions.append(None)
+    solved_mask, lengths = [], []
+    for state, sol in zip(scrambles, solutions):
+        ok = sol is not None and cube_solved(_compose_seq(state, sol))
+        solved_mask.append(ok)
+        lengths.append(len(sol) if ok else 0)
+    return solved_mask, lengths
 
 
 def _compose_seq(state: tuple, moves: list[int]) -> tuple:
@@ -776,6 +1084,251 @@ def _compose_seq(state: tuple, moves: list[int]) -> tuple:
     return state
 
 
+# ---------------------------------------------------------------------------
+# Parallel sweep (checkpoints x depths x search configs on a process pool)
+# ---------------------------------------------------------------------------
+
+CFOP_SEARCH = "cfop"   # pseudo search mode: the CFOP baseline cell
+
+
+def parse_search_spec(spec: str) -> tuple[str, int]:
+    """'greedy' -> ('greedy', 0); 'beam:8' -> ('beam', 8); 'value-astar:16' ...
+
+    A bare value search gets the same default width as evaluate() (8).
+    """
+    name, _, width = spec.strip().partition(":")
+    if name not in ("greedy", "beam", "value-beam", "value-astar", CFOP_SEARCH):
+        raise ValueError(f"Unknown search mode in spec {spec!r}")
+    beam_width = int(width) if width else 0
+    if name == "beam" and beam_width <= 0:
+        raise ValueError(f"beam search needs a width, e.g. 'beam:8' (got {spec!r})")
+    if name in (CFOP_SEARCH, "greedy"):
+        return name, 0
+    return _resolve_search(name, beam_width)
+
+
+# Per-process model cache: each pool worker loads a checkpoint once and then
+# reuses it for every chunk it is handed.
+_WORKER_MODELS: dict[tuple, CubeSolver] = {}
+_WORKER_SUITES: dict[tuple, list[tuple]] = {}
+
+
+def _sweep_chunk(task: dict) -> tuple[tuple, int, list[bool], list[int]]:
+    """Pool worker: evaluate one chunk of one sweep cell."""
+    suite_key = (task["scramble_gen"], task["scramble_depth"], task["seed"], task["n"])
+    suite = _WORKER_SUITES.get(suite_key)
+    if suite is None:
+        store = EvalStore(task["store_dir"]) if task["store_dir"] else None
+        suite = _load_scrambles(task["n"], task["scramble_depth"], task["seed"],
+                                task["scramble_gen"], store)
+        _WORKER_SUITES[suite_key] = suite
+    scrambles = suite[task["start"]:task["stop"]]
+
+    if task["search"] == CFOP_SEARCH:
+        solved_mask, steps = _cfop_solve_chunk(scrambles, task["teacher"])
+    else:
+        cache_key = (task["ckpt"], tuple(sorted(task["model_cfg"].items())))
+        model = _WORKER_MODELS.get(cache_key)
+        if model is None:
+            model = load_model_auto(task["ckpt"], **task["model_cfg"])
+            _WORKER_MODELS[cache_key] = model
+        t_const = task["t_const"] if task["t_const"] is not None else task["scramble_depth"]
+        solved_mask, steps, _, _ = _run_search(
+            model, scrambles, task["scramble_depth"], task["max_steps"],
+            task["search"], task["beam_width"],
+            t_mode=task["t_mode"], t_const=t_const,
+        )
+    return task["cell"], task["start"], solved_mask, steps
+
+
+def _sweep_label(cell: dict) -> str:
+    if cell["search"] == CFOP_SEARCH:
+        name = "CFOP" if cell.get("teacher", "cfop") == "cfop" else cell["teacher"].title()
+        return f"{name} baseline d={cell['scramble_depth']}"
+    width = f",beam={cell['beam_width']}" if cell["beam_width"] else ""
+    return f"{cell['ckpt']} d={cell['scramble_depth']} ({cell['search']}{width})"
+
+
+def sweep(
+    ckpts: list[str],
+    depths: list[int],
+    searches: list[str],
+    n: int = 200,
+    seed: int = 0,
+    max_steps: int | None = None,
+    t_mode: str = "countdown",
+    t_const: int | None = None,
+    scramble_gen: str = "walk",
+    baseline: bool = False,
+    workers: int | None = None,
+    chunk_size: int = 25,
+    jsonl_path: str | None = None,
+    model_cfg: dict | None = None,
+    verbose: bool = True,
+    store_dir: str | None = None,
+    teacher: str = "cfop",
+) -> list[dict]:
+    """Evaluate the full grid ckpts x depths x searches on a process pool.
+
+    Every cell is split into chunks of `chunk_size` scrambles, and chunks of
+    all cells are interleaved on the pool, so the sweep takes roughly as long
+    as its slowest cell rather than the sum of all cells. Each worker keeps
+    the checkpoints it has loaded (_WORKER_MODELS). With baseline=True one
+    CFOP cell per depth is added to the grid.
+
+    Completed cells are printed as they finish and, if jsonl_path is given,
+    appended to that file one JSON object per line. workers <= 1 runs the
+    chunks in-process (no pool).
+
+    teacher selects the solver of the baseline cell ('cfop' or 'kociemba').
+
+    With store_dir, scramble suites come from the EvalStore there, cells whose
+    result is already stored (same checkpoint content + config) are not
+    re-evaluated, and every newly finished cell is stored.
+
+    Returns the result rows in grid order; each row is the evaluate() dict
+    plus ckpt / label / seed / scramble_gen / secs / cached.
+    """
+    import multiprocessing as mp
+    import time
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    model_cfg = model_cfg or {}
+    specs = [parse_search_spec(s) for s in searches]
+
+    cells: list[dict] = []
+    for depth in depths:
+        eff_max = max_steps if max_steps else max(60, depth * 6)
+        for ckpt in ckpts:
+            for search, width in specs:
+                if search == CFOP_SEARCH:
+                    continue
+                cells.append({"ckpt": ckpt, "scramble_depth": depth,
+                              "search": search, "beam_width": width,
+                              "max_steps": eff_max})
+        if baseline or any(sp[0] == CFOP_SEARCH for sp in specs):
+            cells.append({"ckpt": None, "scramble_depth": depth,
+                          "search": CFOP_SEARCH, "beam_width": 0,
+                          "max_steps": eff_max, "teacher": teacher})
+
+    store = EvalStore(store_dir) if store_dir else None
+    for cell in cells:
+        if cell["search"] == CFOP_SEARCH:
+            cell["config"] = _cfop_config(n, cell["scramble_depth"], seed,
+                                          scramble_gen, teacher)
+        else:
+            t_c = t_const if t_const is not None else cell["scramble_depth"]
+            cell["config"] = _eval_config(
+                n, cell["scramble_depth"], cell["max_steps"], seed, cell["search"],
+                cell["beam_width"], t_mode, t_c, scramble_gen, model_cfg)
+
+    rows: dict[int, dict] = {}
+    t0 = time.time()
+
+    def _finish(ci: int, result: dict, cached: bool) -> None:
+        cell = cells[ci]
+        row = dict(result)
+        row.update(ckpt=cell["ckpt"], label=_sweep_label(cell), seed=seed,
+                   scramble_gen=scramble_gen, secs=round(time.time() - t0, 1),
+                   cached=cached)
+        rows[ci] = row
+        if verbose:
+            print(f"  [{len(rows)}/{len(cells)}] {row['label']}: solved "
+                  f"{row['n_solved']}/{row['n']} ({row['success_rate']:.1%}) "
+                  + ("(stored)" if cached else f"at {row['secs']}s"), flush=True)
+        if jsonl_path:
+            Path(jsonl_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(jsonl_path, "a") as f:
+                f.write(json.dumps(row) + "\n")
+
+    todo: list[int] = []
+    for ci, cell in enumerate(cells):
+        cached = store.get_result(cell["ckpt"], cell["config"]) if store else None
+        if cached is not None:
+            _finish(ci, cached, cached=True)
+        else:
+            todo.append(ci)
+    if store is not None:
+        # materialize suites up front so workers only ever read them
+        for depth in sorted({cells[ci]["scramble_depth"] for ci in todo}):
+            _load_scrambles(n, depth, seed, scramble_gen, store)
+
+    tasks: list[dict] = []
+    for start in range(0, n, chunk_size):
+        for ci in todo:
+            cell = {k: v for k, v in cells[ci].items() if k != "config"}
+            tasks.append({
+                **cell, "cell": ci, "n": n, "seed": seed,
+                "start": start, "stop": min(n, start + chunk_size),
+                "scramble_gen": scramble_gen, "t_mode": t_mode,
+                "t_const": t_const, "model_cfg": model_cfg,
+                "store_dir": store_dir,
+            })
+
+    n_chunks = {ci: 0 for ci in todo}
+    for task in tasks:
+        n_chunks[task["cell"]] += 1
+    parts: dict[int, dict[int, tuple[list[bool], list[int]]]] = {ci: {} for ci in todo}
+
+    def _collect(ci: int, start: int, solved_mask: list[bool], steps: list[int]) -> None:
+        parts[ci][start] = (solved_mask, steps)
+        if len(parts[ci]) < n_chunks[ci]:
+            return
+        mask_all: list[bool] = []
+        steps_all: list[int] = []
+        for key in sorted(parts[ci]):
+            mask_all.extend(parts[ci][key][0])
+            steps_all.extend(parts[ci][key][1])
+        cell = cells[ci]
+        if cell["search"] == CFOP_SEARCH:
+            result = _cfop_result(mask_all, steps_all, cell["scramble_depth"])
+        else:
+            result = _summarize(mask_all, steps_all,
+                                scramble_depth=cell["scramble_depth"],
+                                max_steps=cell["max_steps"],
+                                beam_width=cell["beam_width"], search=cell["search"])
+            result["ci_low"], result["ci_high"] = wilson_interval(
+                result["n_solved"], result["n"])
+        if store is not None:
+            store.put_result(cell["ckpt"], cell["config"], result)
+        _finish(ci, result, cached=False)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for task in tasks:
+            _collect(*_sweep_chunk(task))
+    else:
+        # spawn: MLX state must not be inherited through fork
+        ctx = mp.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = [pool.submit(_sweep_chunk, task) for task in tasks]
+            for fut in as_completed(futures):
+                _collect(*fut.result())
+
+    return [rows[ci] for ci in range(len(cells))]
+
+
+def report_rows(store: EvalStore, ckpts: list[str] | None = None) -> list[dict]:
+    """Table rows for every stored result (optionally only for `ckpts`)."""
+    records = store.records()
+    if ckpts:
+        records = [r for r in records if r["ckpt"] in ckpts]
+    rows = []
+    for rec in records:
+        cfg, res = rec["config"], rec["result"]
+        cell = {"ckpt": rec["ckpt"], "scramble_depth": cfg["scramble_depth"],
+                "search": cfg["search"], "beam_width": cfg["beam_width"],
+                "teacher": cfg.get("teacher", "cfop")}
+        label = _sweep_label(cell) + f" n={cfg['n']}"
+        if cfg.get("scramble_gen", "walk") != "walk":
+            label += f" [{cfg['scramble_gen']}]"
+        rows.append({"label": label, "success_rate": res["success_rate"],
+                     "avg_steps": res["avg_steps_solved"],
+                     "median_steps": res["median_steps_solved"]})
+    return rows
+
+
 # ---------------------------------------------------------------------------
 # Pretty-print table
 # ---------------------------------------------------------------------------
@@ -837,6 +1390,16 @@ def main() -> None:
         help="Max rollout steps (0 = auto: max(60, scramble_depth * 6)).",
     )
     parser.add_argument("--seed", type=int, default=0, help="RNG seed.")
+    parser.add_argument(
+        "--scramble-gen",
+        choices=list(SCRAMBLE_GENERATORS),
+        default="walk",
+        help=(
+            "'walk': random walks of --scramble-depth moves [default]. "
+            "'uniform': uniformly random states from the whole cube group "
+            "(--scramble-depth only sets the t countdown / max-steps)."
+        ),
+    )
     parser.add_argument(
         "--baseline",
         action="store_true",
@@ -878,6 +1441,87 @@ def main() -> None:
         default=None,
         help="Fixed t value used when --t-mode const (default = scramble_depth).",
     )
+    # Sequential early-stopping evaluation
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help=(
+            "Evaluate in batches and stop once the Wilson CI on success rate is "
+            "narrower than --ci-width (--n becomes the cap). With exactly two "
+            "--ckpt, both run on the same scrambles and stop as soon as their "
+            "intervals separate."
+        ),
+    )
+    parser.add_argument("--ci-width", type=float, default=0.1,
+                        help="Target CI width for --adaptive (default: 0.1).")
+    parser.add_argument("--adaptive-batch", type=int, default=50,
+                        help="Scrambles per --adaptive batch (default: 50).")
+    parser.add_argument("--reference", default=None, metavar="LO,HI",
+                        help="--adaptive: also stop once the CI lies entirely "
+                             "outside this interval (e.g. another checkpoint's "
+                             "ci_low,ci_high from an earlier run).")
+    # Parallel sweep mode
+    parser.add_argument(
+        "--sweep-depths",
+        default=None,
+        metavar="LIST",
+        help=(
+            "Sweep mode: comma-separated scramble depths (e.g. 6,8,12,15,25). "
+            "Evaluates every --ckpt x depth x --sweep-search cell on a process pool."
+        ),
+    )
+    parser.add_argument(
+        "--sweep-search",
+        default=None,
+        metavar="LIST",
+        help=(
+            "Sweep mode: comma-separated search specs, e.g. "
+            "'greedy,beam:8,value-astar:8' ('cfop' adds the CFOP baseline). "
+            "Default: the --search/--beam setting."
+        ),
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help=(
+            "Sweep mode: worker processes (default: CPU count; 1 = in-process). "
+            "Also used for the --baseline CFOP solves and the --optimal solves."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=25,
+        help="Sweep mode: scrambles per pool task (default: 25).",
+    )
+    parser.add_argument(
+        "--jsonl", default=None, metavar="PATH",
+        help="Sweep mode: append one JSON line per finished cell to PATH.",
+    )
+    parser.add_argument(
+        "--optimal", action="store_true",
+        help=(
+            "Report the solution-length gap to optimal for solved scrambles "
+            "(needs the Korf tables: python source/optimal.py build)."
+        ),
+    )
+    parser.add_argument(
+        "--optimal-budget", type=int, default=2_000_000,
+        help="IDA* node budget per scramble for --optimal (default 2e6).",
+    )
+    parser.add_argument(
+        "--teacher", choices=list(TEACHERS), default="cfop",
+        help="Solver used for --baseline / the 'cfop' sweep cell (default cfop).",
+    )
+    # Persistent scramble / result store
+    parser.add_argument(
+        "--store", default=None, metavar="DIR",
+        help=(
+            "Persist scramble suites and results under DIR; cells already "
+            "evaluated for the same checkpoint content + config are skipped."
+        ),
+    )
+    parser.add_argument(
+        "--report", action="store_true",
+        help="Print every result in --store (filtered by --ckpt if given) and exit.",
+    )
     # Model architecture args (for non-default checkpoints)
     parser.add_argument("--d-model", type=int, default=128)
     parser.add_argument("--n-layers", type=int, default=4)
@@ -887,6 +1531,36 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    store = EvalStore(args.store) if args.store else None
+    if args.report:
+        if store is None:
+            parser.error("--report needs --store DIR")
+        _print_table(report_rows(store, args.ckpts))
+        return
+
+    sweeping = bool(args.sweep_depths or args.sweep_search)
+    if args.adaptive and sweeping:
+        parser.error("--adaptive (with --ci-width / --adaptive-batch) does not "
+                     "apply to --sweep-depths / --sweep-search")
+    reference = None
+    if args.reference is not None:
+        if not args.adaptive or (args.ckpts and len(args.ckpts) == 2):
+            parser.error("--reference needs --adaptive with one checkpoint at a "
+                         "time (two --ckpt are already compared with each other)")
+        try:
+            lo, hi = (float(x) for x in args.reference.split(","))
+        except ValueError:
+            parser.error(f"--reference expects LO,HI, got {args.reference!r}")
+        reference = (lo, hi)
+
+    if args.optimal:
+        # fail now, not after every rollout has run
+        from optimal import load_pdbs
+        try:
+            load_pdbs()
+        except FileNotFoundError as exc:
+            parser.error(f"--optimal: {exc}")
+
     max_steps = args.max_steps if args.max_steps > 0 else None
     effective_max = max_steps if max_steps is not None else max(60, args.scramble_depth * 6)
     t_const = args.t_const if args.t_const is not None else args.scramble_depth
@@ -909,13 +1583,69 @@ def main() -> None:
     print(
         f"Evaluating: n={args.n}, scramble_depth={args.scramble_depth}, "
         f"max_steps={effective_max}, seed={args.seed}, t_mode={args.t_mode}"
+        + (f", scramble_gen={args.scramble_gen}" if args.scramble_gen != "walk" else "")
         + (f", t_const={t_const}" if args.t_mode == "const" else "")
         + (f", beam_width={args.beam}" if beam_mode else "")
         + f", search={effective_search_display}"
     )
 
+    if sweeping:
+        depths = ([int(d) for d in args.sweep_depths.split(",")]
+                  if args.sweep_depths else [args.scramble_depth])
+        if args.sweep_search:
+            searches = args.sweep_search.split(",")
+        else:
+            searches = [effective_search_display
+                        + (f":{args.beam}" if args.beam > 0 else "")]
+        print(f"Sweep: {len(args.ckpts or [])} ckpt(s) x depths {depths} x "
+              f"searches {searches}" + (" + CFOP baseline" if args.baseline else ""),
+              flush=True)
+        rows = sweep(
+            args.ckpts or [], depths, searches,
+            n=args.n, seed=args.seed, max_steps=max_steps,
+            t_mode=args.t_mode, t_const=args.t_const,
+            scramble_gen=args.scramble_gen, baseline=args.baseline,
+            workers=args.workers, chunk_size=args.chunk_size,
+            jsonl_path=args.jsonl, model_cfg=model_cfg,
+            store_dir=args.store, teacher=args.teacher,
+        )
+        _print_table([{"label": r["label"], "success_rate": r["success_rate"],
+                       "avg_steps": r["avg_steps_solved"],
+                       "median_steps": r["median_steps_solved"]} for r in rows])
+        return
+
     rows = []
 
+    if args.adaptive and args.ckpts and len(args.ckpts) == 2:
+        print(f"  adaptive comparison {args.ckpts[0]} vs {args.ckpts[1]} ...",
+              flush=True)
+        pair = compare_adaptive(
+            args.ckpts[0], args.ckpts[1],
+            n=args.n, scramble_depth=args.scramble_depth, max_steps=max_steps,
+            seed=args.seed, beam_width=args.beam, t_mode=args.t_mode,
+            t_const=t_const, search=search_arg, scramble_gen=args.scramble_gen,
+            adaptive_batch=args.adaptive_batch, ci_width=args.ci_width,
+            **model_cfg,
+        )
+        for ckpt_path, result in zip(args.ckpts, pair):
+            rows.append(
+                {
+                    "label": f"{ckpt_path} ({result['search']})",
+                    "success_rate": result["success_rate"],
+                    "avg_steps": result["avg_steps_solved"],
+                    "median_steps": result["median_steps_solved"],
+                }
+            )
+            print(
+                f"    {ckpt_path}: solved {result['n_solved']}/{result['n']} "
+                f"({result['success_rate']:.1%}, "
+                f"CI [{result['ci_low']:.3f}, {result['ci_high']:.3f}])",
+                flush=True,
+            )
+        print(f"    {'separated' if pair[0]['separated'] else 'not separated'} "
+              f"after {pair[0]['n']} scrambles", flush=True)
+        args.ckpts = []
+
     if args.ckpts:
         for ckpt_path in args.ckpts:
             search_label = effective_search_display
@@ -934,6 +1664,14 @@ def main() -> None:
                 t_mode=args.t_mode,
                 t_const=t_const,
                 search=search_arg,
+                scramble_gen=args.scramble_gen,
+                adaptive=args.adaptive,
+                adaptive_batch=args.adaptive_batch,
+                ci_width=args.ci_width,
+                reference=reference,
+                store=store,
+                optimal_budget=args.optimal_budget if args.optimal else None,
+                optimal_workers=args.workers or 1,
                 **model_cfg,
             )
             rows.append(
@@ -946,17 +1684,31 @@ def main() -> None:
             )
             print(
                 f"    solved {result['n_solved']}/{result['n']} "
-                f"({result['success_rate']:.1%})"
-                f"  [search={result['search']}]",
+                f"({result['success_rate']:.1%}, "
+                f"CI [{result['ci_low']:.3f}, {result['ci_high']:.3f}])"
+                f"  [search={result['search']}]"
+                + ("  [stopped early]" if result.get("stopped_early") else ""),
                 flush=True,
             )
+            opt = result.get("optimal")
+            if opt and opt["n_known"]:
+                print(f"    optimal gap: avg +{opt['avg_gap']:.2f} moves "
+                      f"(median +{opt['median_gap']}, max +{opt['max_gap']}), "
+                      f"{opt['frac_optimal']:.0%} optimal; optimum avg "
+                      f"{opt['avg_optimal']:.1f} over {opt['n_known']} scrambles"
+                      + (f" ({opt['n_unknown']} over budget)" if opt["n_unknown"] else ""),
+                      flush=True)
 
     if args.baseline:
-        print("  running CFOP baseline ...", flush=True)
-        base = cfop_baseline(args.n, args.scramble_depth, seed=args.seed)
+        name = "CFOP" if args.teacher == "cfop" else args.teacher.title()
+        print(f"  running {name} baseline ...", flush=True)
+        base = cfop_baseline(args.n, args.scramble_depth, seed=args.seed,
+                             scramble_gen=args.scramble_gen, store=store,
+                             teacher=args.teacher,
+                             workers=args.workers or 1)
         rows.append(
             {
-                "label": "CFOP baseline",
+                "label": f"{name} baseline",
                 "success_rate": base["success_rate"],
                 "avg_steps": base["avg_len"],
                 "median_steps": base["median_len"],
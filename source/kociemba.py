@@ -0,0 +1,376 @@
+"""Two-phase (Kociemba) solver: short solutions as an alternative BC teacher.
+
+Same state-tuple API as cfop.solve: solve(state) -> list of move indices 0..17.
+
+Phase 1 takes the cube into a subgroup G1; phase 2 solves inside G1 using only
+G1's generators. In this repo's orientation convention L and R neither twist
+corners nor flip edges, U/D/F/B twist corners and only U/D flip edges, so the
+natural subgroup is the one fixing all twists/flips and the M-slice edge set:
+
+    G1 = <L, R, U2, D2, F2, B2>,   M-slice edge slots E4 E6 E8 E10
+
+(the textbook <U, D, R2, L2, F2, B2> is the same construction on another axis,
+matched to the textbook orientation convention).
+
+Coordinates
+-----------
+  phase 1 : twist  3^7  = 2187   corner twists of slots 0..6
+            flip   2^11 = 2048   edge flips of slots 0..10
+            slice  C(12,4) = 495 which slots hold the 4 M-slice edges
+  phase 2 : cperm  8!  = 40320   corner permutation
+            eperm  8!  = 40320   permutation of the 8 non-slice edges
+            sperm  4!  = 24      permutation of the 4 slice edges
+
+Pruning tables (twist x slice, flip x slice, cperm x sperm, eperm x sperm) are
+built once by a dense MLX BFS, nibble-packed into .kociemba/ and memory-mapped;
+move tables are stored alongside as raw uint16 arrays.
+
+    uv run python source/kociemba.py          # builds tables, solves a few scrambles
+"""
+
+import itertools
+import mmap
+import sys
+import time
+from array import array
+from pathlib import Path
+
+import mlx.core as mx
+
+sys.path.insert(0, str(Path(__file__).parent))
+from data import _IDENTITY, _MOVES_PY, _allowed, _compose, _join_moves  # noqa: E402
+
+_TABLE_DIR = Path(__file__).parent / ".kociemba"
+_TABLE_VERSION = 1
+_NIB_UNKNOWN = 0xF
+
+_SLICE_EDGES = (4, 6, 8, 10)
+_OTHER_EDGES = (0, 1, 2, 3, 5, 7, 9, 11)
+# G1 generators: L, L2, L', R, R2, R', U2, D2, F2, B2
+_G1_MOVES = [6, 7, 8, 9, 10, 11, 1, 4, 13, 16]
+
+
+# ---------------------------------------------------------------------------
+# Coordinates
+# ---------------------------------------------------------------------------
+
+def _twist(ct: list[int]) -> int:
+    v = 0
+    for i in range(6, -1, -1):
+        v = v * 3 + ct[i]
+    return v
+
+
+def _flip(ef: list[int]) -> int:
+    v = 0
+    for i in range(10, -1, -1):
+        v = v * 2 + ef[i]
+    return v
+
+
+_SLICE_MASKS = [sum(1 << i for i in c) for c in itertools.combinations(range(12), 4)]
+_SLICE_INDEX = {m: i for i, m in enumerate(_SLICE_MASKS)}
+_PERM8 = list(itertools.permutations(range(8)))
+_PERM8_INDEX = {p: i for i, p in enumerate(_PERM8)}
+_PERM4 = list(itertools.permutations(range(4)))
+_PERM4_INDEX = {p: i for i, p in enumerate(_PERM4)}
+_OTHER_RANK = {e: k for k, e in enumerate(_OTHER_EDGES)}
+_SLICE_RANK = {e: k for k, e in enumerate(_SLICE_EDGES)}
+
+
+def _slice(ep: list[int]) -> int:
+    return _SLICE_INDEX[sum(1 << i for i in range(12) if ep[i] in _SLICE_RANK)]
+
+
+def phase1_coords(s: tuple) -> tuple[int, int, int]:
+    _, ct, ep, ef = s
+    return _twist(ct), _flip(ef), _slice(ep)
+
+
+def phase2_coords(s: tuple) -> tuple[int, int, int]:
+    """Only meaningful for states in G1."""
+    cp, _, ep, _ = s
+    return (_PERM8_INDEX[tuple(cp)],
+            _PERM8_INDEX[tuple(_OTHER_RANK[ep[i]] for i in _OTHER_EDGES)],
+            _PERM4_INDEX[tuple(_SLICE_RANK[ep[i]] for i in _SLICE_EDGES)])
+
+
+_SOLVED1 = phase1_coords(_IDENTITY)
+
+
+# ---------------------------------------------------------------------------
+# Move tables
+# ---------------------------------------------------------------------------
+
+def _build_move_tables() -> dict[str, list[list[int]]]:
+    """coord -> coord per move (18 moves for phase 1, the 10 G1 moves for 2).
+
+    Composing with move b sends slot b.cp[i] to slot i, adding b.ct[i]."""
+    twist, flip, slc = [], [], []
+    for bcp, bct, bep, bef in _MOVES_PY:
+        row = []
+        for v in range(2187):
+            ct = [0] * 8
+            for i in range(7):
+                v, ct[i] = divmod(v, 3)
+            ct[7] = (-sum(ct[:7])) % 3
+            row.append(_twist([(ct[bcp[i]] + bct[i]) % 3 for i in range(8)]))
+        twist.append(row)
+        row = []
+        for v in range(2048):
+            ef = [0] * 12
+            for i in range(11):
+                v, ef[i] = divmod(v, 2)
+            ef[11] = sum(ef[:11]) % 2
+            row.append(_flip([(ef[bep[i]] + bef[i]) % 2 for i in range(12)]))
+        flip.append(row)
+        slc.append([_SLICE_INDEX[sum(1 << i for i in range(12) if (m >> bep[i]) & 1)]
+                    for m in _SLICE_MASKS])
+    cperm, eperm, sperm = [], [], []
+    for mi in _G1_MOVES:
+        bcp, _, bep, _ = _MOVES_PY[mi]
+        cperm.append([_PERM8_INDEX[tuple(p[bcp[i]] for i in range(8))] for p in _PERM8])
+        # G1 moves keep the slice / non-slice slot sets, so the restricted
+        # permutations compose on their own.
+        osrc = [_OTHER_EDGES.index(bep[i]) for i in _OTHER_EDGES]
+        eperm.append([_PERM8_INDEX[tuple(p[osrc[k]] for k in range(8))] for p in _PERM8])
+        ssrc = [_SLICE_EDGES.index(bep[i]) for i in _SLICE_EDGES]
+        sperm.append([_PERM4_INDEX[tuple(p[ssrc[k]] for k in range(4))] for p in _PERM4])
+    return {"twist": twist, "flip": flip, "slice": slc,
+            "cperm": cperm, "eperm": eperm, "sperm": sperm}
+
+
+def _load_move_tables() -> dict[str, list[list[int]]]:
+    path = _TABLE_DIR / f"moves.v{_TABLE_VERSION}.u16"
+    names = ("twist", "flip", "slice", "cperm", "eperm", "sperm")
+    sizes = {"twist": (18, 2187), "flip": (18, 2048), "slice": (18, 495),
+             "cperm": (10, 40320), "eperm": (10, 40320), "sperm": (10, 24)}
+    if not path.exists():
+        t0 = time.time()
+        tables = _build_move_tables()
+        buf = array("H")
+        for name in names:
+            for row in tables[name]:
+                buf.extend(row)
+        _write_atomic(path, buf.tobytes())
+        print(f"  [Kociemba] built move tables ({time.time() - t0:.1f}s)", flush=True)
+        return tables
+    buf = array("H")
+    buf.frombytes(path.read_bytes())
+    tables, off = {}, 0
+    for name in names:
+        n_rows, n_cols = sizes[name]
+        tables[name] = [buf[off + r * n_cols: off + (r + 1) * n_cols].tolist()
+                        for r in range(n_rows)]
+        off += n_rows * n_cols
+    return tables
+
+
+# ---------------------------------------------------------------------------
+# Pruning tables (dense MLX BFS -> nibble-packed, memory-mapped)
+# ---------------------------------------------------------------------------
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def _bfs_pruning(a_moves: list[list[int]], b_moves: list[list[int]],
+                 start: int) -> bytes:
+    """Distance-to-solved over the product coordinate a * len(b) + b.
+
+    Dense level-synchronous BFS: an entry is at depth d+1 when it is still
+    unknown and one move leads to a depth-d entry (the move sets are closed
+    under inverses, so forward neighbours suffice). Returns packed nibbles,
+    low nibble = even index, 0xF = unreachable."""
+    n_b = len(b_moves[0])
+    neighbours = [(mx.array(am, dtype=mx.int32)[:, None] * n_b
+                   + mx.array(bm, dtype=mx.int32)[None, :]).reshape(-1)
+                  for am, bm in zip(a_moves, b_moves)]
+    n = neighbours[0].shape[0]
+    dist = mx.full((n,), 255, dtype=mx.uint8)
+    dist[start] = 0
+    depth = 0
+    while True:
+        frontier = dist == depth
+        reached = mx.zeros((n,), dtype=mx.bool_)
+        for nb in neighbours:
+            reached = reached | frontier[nb]
+        new = reached & (dist == 255)
+        if not mx.any(new).item():
+            break
+        depth += 1
+        dist = mx.where(new, depth, dist)
+        mx.eval(dist)
+    nib = mx.where(dist == 255, _NIB_UNKNOWN, mx.minimum(dist, _NIB_UNKNOWN - 1))
+    if n % 2:
+        nib = mx.concatenate([nib, mx.array([_NIB_UNKNOWN], dtype=mx.uint8)])
+    packed = (nib[0::2] | (nib[1::2] << 4)).astype(mx.uint8)
+    return bytes(packed.tolist())
+
+
+class _NibbleTable:
+    """Memory-mapped nibble table; 0xF (never reached) reads as 0."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __getitem__(self, idx: int) -> int:
+        v = (self._mm[idx >> 1] >> ((idx & 1) << 2)) & 0xF
+        return 0 if v == _NIB_UNKNOWN else v
+
+
+def _load_pruning(name: str, a_moves, b_moves, start: int) -> _NibbleTable:
+    path = _TABLE_DIR / f"{name}.v{_TABLE_VERSION}.nib"
+    if not path.exists():
+        t0 = time.time()
+        _write_atomic(path, _bfs_pruning(a_moves, b_moves, start))
+        print(f"  [Kociemba] built {name} pruning table "
+              f"({time.time() - t0:.1f}s)", flush=True)
+    return _NibbleTable(path)
+
+
+_TABLES: dict = {}
+
+
+def _tables() -> dict:
+    """Move + pruning tables, loaded (or built) on first use."""
+    if not _TABLES:
+        mv = _load_move_tables()
+        tw0, fl0, sl0 = _SOLVED1
+        _TABLES.update(mv)
+        _TABLES["p_twist"] = _load_pruning("twist_slice", mv["twist"], mv["slice"],
+                                           tw0 * 495 + sl0)
+        _TABLES["p_flip"] = _load_pruning("flip_slice", mv["flip"], mv["slice"],
+                                          fl0 * 495 + sl0)
+        _TABLES["p_cperm"] = _load_pruning("cperm_sperm", mv["cperm"], mv["sperm"], 0)
+        _TABLES["p_eperm"] = _load_pruning("eperm_sperm", mv["eperm"], mv["sperm"], 0)
+    return _TABLES
+
+
+# ---------------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------------
+
+class _Timeout(Exception):
+    pass
+
+
+def solve(state: tuple, max_length: int = 22, timeout: float = 2.0,
+          max_phase1: int = 14) -> list[int]:
+    """Two-phase solve. Returns a list of move indices 0..17.
+
+    Phase-1 depths are tried in increasing order and every phase-1 solution is
+    completed by an optimal phase-2 search shorter than the best total so far.
+    Returns as soon as a solution of <= max_length moves is found; after
+    `timeout` seconds returns the best solution found (keeps searching until
+    the first one if none yet). Raises RuntimeError if max_phase1 is exhausted
+    without any solution.
+    """
+    t = _tables()
+    tw_mv, fl_mv, sl_mv = t["twist"], t["flip"], t["slice"]
+    cp_mv, ep_mv, sp_mv = t["cperm"], t["eperm"], t["sperm"]
+    p_tw, p_fl, p_cp, p_ep = t["p_twist"], t["p_flip"], t["p_cperm"], t["p_eperm"]
+    deadline = time.perf_counter() + timeout
+    best: list[int] | None = None
+    path1: list[int] = []
+
+    def phase2(cp, ep, sp, depth, last, path):
+        if depth == 0:
+            return cp == 0 and ep == 0 and sp == 0
+        for k, m in enumerate(_G1_MOVES):
+            if not _allowed(m, last):
+                continue
+            ncp, nep, nsp = cp_mv[k][cp], ep_mv[k][ep], sp_mv[k][sp]
+            if max(p_cp[ncp * 24 + nsp], p_ep[nep * 24 + nsp]) >= depth:
+                continue
+            path.append(m)
+            if phase2(ncp, nep, nsp, depth - 1, m, path):
+                return True
+            path.pop()
+        return False
+
+    def finish_phase1():
+        nonlocal best
+        s = state
+        for m in path1:
+            s = _compose(s, _MOVES_PY[m])
+        cp, ep, sp = phase2_coords(s)
+        # G1 has diameter 18 in these moves, so the first completion always exists
+        limit = 18 if best is None else min(18, len(best) - len(path1) - 1)
+        h = max(p_cp[cp * 24 + sp], p_ep[ep * 24 + sp])
+        for d2 in range(h, limit + 1):
+            path2: list[int] = []
+            # phase 2 may start on phase 1's last face; _join_moves merges the turns
+            if phase2(cp, ep, sp, d2, -1, path2):
+                joined = _join_moves(path1, path2)
+                if best is None or len(joined) < len(best):
+                    best = joined
+                break
+
+    def phase1(tw, fl, sl, depth, last):
+        if depth == 0:
+            # must end with a non-G1 move, else a shorter phase 1 covered it
+            if (tw, fl, sl) == _SOLVED1 and (last < 0 or last not in _G1_MOVES):
+                finish_phase1()
+                if best is not None and len(best) <= max_length:
+                    return True
+                if time.perf_counter() > deadline and best is not None:
+                    raise _Timeout
+            return False
+        for m in range(18):
+            if not _allowed(m, last):
+                continue
+            ntw, nfl, nsl = tw_mv[m][tw], fl_mv[m][fl], sl_mv[m][sl]
+            if max(p_tw[ntw * 495 + nsl], p_fl[nfl * 495 + nsl]) >= depth:
+                continue
+            path1.append(m)
+            if phase1(ntw, nfl, nsl, depth - 1, m):
+                return True
+            path1.pop()
+        return False
+
+    tw, fl, sl = phase1_coords(state)
+    try:
+        for d1 in range(max(p_tw[tw * 495 + sl], p_fl[fl * 495 + sl]), max_phase1 + 1):
+            if best is not None and d1 >= len(best):
+                break
+            if phase1(tw, fl, sl, d1, -1):
+                break
+    except _Timeout:
+        pass
+    if best is None:
+        raise RuntimeError("Kociemba: no solution within max_phase1")
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Quick self-test
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import random
+
+    from cfop import cube_solved  # noqa: E402
+
+    _tables()
+    rng = random.Random(0)
+    lengths = []
+    t0 = time.time()
+    for i in range(10):
+        s = _IDENTITY
+        for _ in range(25):
+            s = _compose(s, _MOVES_PY[rng.randrange(18)])
+        t1 = time.time()
+        sol = solve(s)
+        end = s
+        for m in sol:
+            end = _compose(end, _MOVES_PY[m])
+        assert cube_solved(end), f"scramble {i} not solved!"
+        lengths.append(len(sol))
+        print(f"  scramble {i}: {len(sol):2} moves ({(time.time() - t1) * 1000:.0f} ms)")
+    print(f"avg {sum(lengths) / len(lengths):.1f} moves, "
+          f"{(time.time() - t0) / len(lengths):.2f}s per solve")
@@ -9,6 +9,9 @@ Usage
 -----
     uv run python source/llm_agent.py --depth 1 --episodes 1 --max-turns 12
     uv run python source/llm_agent.py --host 192.168.10.62:11434 --model qwen3.5:4b
+    uv run python source/llm_agent.py --episodes 50 --concurrency 8   # asyncio runner
+    uv run python source/llm_agent.py --chat-cache runs/llm/chat_cache --cache-mode replay
+    uv run python source/llm_agent.py --mode intuition --encoding pieces
 
 This M0 version exposes observe / apply / simulate / inverse.  Memory and the
 learned-distance "intuition" tool are added in later milestones.
@@ -17,6 +20,8 @@ learned-distance "intuition" tool are added in later milestones.
 from __future__ import annotations
 
 import argparse
+import copy
+import http.client
 import json
 import sys
 import time
@@ -27,7 +32,9 @@ _SRC = Path(__file__).resolve().parent
 if str(_SRC) not in sys.path:
     sys.path.insert(0, str(_SRC))
 
-from cube_tools import CubeSession, MacroMemory, NOTATION, MoveParseError  # noqa: E402
+from chat_cache import MODES as CACHE_MODES, ChatCache  # noqa: E402
+from cube_tools import (CubeSession, ENCODINGS, MacroMemory,  # noqa: E402
+                        NOTATION, MoveParseError)
 
 
 # ---------------------------------------------------------------------------
@@ -105,6 +112,55 @@ TOOLS = [
     },
 ]
 
+# k-ply lookahead. Appended to the intuition tools in 'lookahead' mode.
+LOOKAHEAD_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "lookahead",
+            "description": "Learned INTUITION with SEARCH. Tries every sequence of "
+                           "`depth` moves (2 or 3) and returns the `top` sequences whose "
+                           "end state has the lowest estimated_moves_to_solve. "
+                           "would_solve=true means that sequence solves the cube. Apply "
+                           "the first sequence to follow the search.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "depth": {"type": "integer", "description": "2 or 3 (default 2)"},
+                    "top": {"type": "integer", "description": "sequences to return (default 5)"},
+                },
+                "required": [],
+            },
+        },
+    },
+]
+
+# Batched simulate. Offered on top of any mode only with --simulate-many, so
+# the published ablations keep their original tool schemas and prompts.
+SIMULATE_MANY_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "simulate_many",
+            "description": "Like simulate, but for MANY candidate sequences in one call "
+                           "(nothing is committed, no nets). Returns one row per "
+                           "candidate with delta_pieces_solved and would_solve. Use it "
+                           "to compare several ideas at once instead of one simulate each.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "candidates": {"type": "array", "items": {"type": "string"},
+                                   "description": "move strings, e.g. [\"R U R'\", \"F2 D\"]"},
+                    "values": {"type": "boolean",
+                               "description": "also return estimated_moves_to_solve "
+                                              "for each result (intuition)"},
+                },
+                "required": ["candidates"],
+            },
+        },
+    },
+]
+
 # Macro-memory tools (M2). Appended to the intuition tools in 'memory' mode.
 MACRO_TOOLS = [
     {
@@ -217,34 +273,95 @@ MEMORY_PROMPT = INTUITION_PROMPT + (
     "reuse it. Building a good macro library makes you faster over time."
 )
 
+LOOKAHEAD_PROMPT = INTUITION_PROMPT + (
+    "\n\nYou ALSO have lookahead(depth, top): it searches every 2- or 3-move "
+    "sequence at once and returns the best ones by the same intuition. When "
+    "rank_moves plateaus (no single move lowers the estimate), call lookahead "
+    "with depth 2, then 3, and apply the top sequence."
+)
+
 # Backwards-compatible default
 SYSTEM_PROMPT = INTUITION_PROMPT
 
 
-def tools_for_mode(mode: str) -> list[dict]:
-    """intuition/pieces = rank_moves; blind = none; memory = intuition + macros."""
+# Appended to the system prompt when simulate_many is offered.
+SIMULATE_MANY_NOTE = (
+    "\nYou ALSO have simulate_many(candidates): it previews a list of move "
+    "sequences in one call (nothing is committed, no nets) and returns "
+    "delta_pieces_solved for each. Use it instead of several simulate calls."
+)
+
+
+def _without_values(tool: dict) -> dict:
+    """simulate_many without its value-estimate option (modes with no intuition)."""
+    fn = json.loads(json.dumps(tool["function"]))
+    del fn["parameters"]["properties"]["values"]
+    return {"type": "function", "function": fn}
+
+
+def tools_for_mode(mode: str, simulate_many: bool = False) -> list[dict]:
+    """intuition/pieces = rank_moves; blind = none; memory = intuition + macros;
+    lookahead = intuition + k-ply lookahead. simulate_many adds the batched
+    simulate tool (without value estimates in blind/pieces)."""
     if mode == "blind":
-        return [t for t in TOOLS if t["function"]["name"] != "rank_moves"]
-    if mode == "memory":
-        return TOOLS + MACRO_TOOLS
-    return TOOLS  # intuition, pieces
+        tools = [t for t in TOOLS if t["function"]["name"] != "rank_moves"]
+    elif mode == "memory":
+        tools = TOOLS + MACRO_TOOLS
+    elif mode == "lookahead":
+        tools = TOOLS + LOOKAHEAD_TOOLS
+    else:
+        tools = TOOLS  # intuition, pieces
+    if not simulate_many:
+        return tools
+    if mode in ("blind", "pieces"):
+        return tools + [_without_values(t) for t in SIMULATE_MANY_TOOLS]
+    return tools + SIMULATE_MANY_TOOLS
 
 
-def prompt_for_mode(mode: str) -> str:
+# Observation encoding per mode (cube_tools.ENCODINGS); --encoding overrides.
+# All modes default to the readable net the published runs used.
+MODE_ENCODINGS = {"intuition": "net", "blind": "net", "memory": "net",
+                  "pieces": "net", "lookahead": "net"}
+
+# Appended to the system prompt when the observations are not the net.
+ENCODING_NOTES = {
+    "facelets":
+        "\nObservations show the cube as a 54-letter facelet string instead of "
+        "a net: the U, R, F, D, L, B faces in that order, 9 letters each, row by "
+        "row; each letter names the face whose center color that sticker has "
+        "(a solved cube is UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB).",
+    "pieces":
+        "\nObservations list the unsolved pieces instead of a net, as SLOT=STICKERS: "
+        "a slot is named by its faces (e.g. RUF is the right-up-front corner) and "
+        "STICKERS names the home faces of the stickers now in it, in the same "
+        "order. A piece is solved when they match (RUF=RUF).",
+    "diff":
+        "\nObservations list only what changed since the previous observation, "
+        "as SLOT=STICKERS: a slot is named by its faces (e.g. RUF is the "
+        "right-up-front corner) and STICKERS names the home faces of the "
+        "stickers now in it, in the same order (solved: RUF=RUF). The first "
+        "observation lists every unsolved piece; simulate shows what the moves "
+        "would change.",
+}
+
+
+def prompt_for_mode(mode: str, encoding: str = "net",
+                    simulate_many: bool = False) -> str:
     # 'pieces' uses the same prompt as intuition — the agent is not told the
     # ranking heuristic is worse; only the harness swaps the underlying signal.
-    return {"blind": BLIND_PROMPT, "memory": MEMORY_PROMPT}.get(mode, INTUITION_PROMPT)
+    return ({"blind": BLIND_PROMPT, "memory": MEMORY_PROMPT,
+             "lookahead": LOOKAHEAD_PROMPT}.get(mode, INTUITION_PROMPT)
+            + (SIMULATE_MANY_NOTE if simulate_many else "")
+            + ENCODING_NOTES.get(encoding, ""))
 
 
 # ---------------------------------------------------------------------------
 # Ollama chat
 # ---------------------------------------------------------------------------
 
-def ollama_chat(messages: list[dict], tools: list[dict], model: str,
-                host: str, think: bool = False, timeout: int = 600) -> dict:
-    """One non-streaming /api/chat call. Returns the assistant message dict."""
-    url = f"http://{host}/api/chat"
-    payload = {
+def _chat_payload(messages: list[dict], tools: list[dict], model: str,
+                  think: bool) -> dict:
+    return {
         "model": model,
         "messages": messages,
         "tools": tools,
@@ -252,12 +369,85 @@ def ollama_chat(messages: list[dict], tools: list[dict], model: str,
         "think": think,
         "options": {"temperature": 0.7},
     }
-    data = json.dumps(payload).encode()
+
+
+def _message(body: dict) -> dict:
+    """The assistant message of an /api/chat response, with the server's
+    token counts (when it reports them) under "usage"."""
+    msg = body.get("message", {})
+    if "prompt_eval_count" in body:
+        msg["usage"] = {"prompt_tokens": body["prompt_eval_count"],
+                        "output_tokens": body.get("eval_count")}
+    return msg
+
+
+def ollama_chat(messages: list[dict], tools: list[dict], model: str,
+                host: str, think: bool = False, timeout: int = 600) -> dict:
+    """One non-streaming /api/chat call. Returns the assistant message dict."""
+    url = f"http://{host}/api/chat"
+    data = json.dumps(_chat_payload(messages, tools, model, think)).encode()
     req = urllib.request.Request(url, data=data,
                                  headers={"Content-Type": "application/json"})
     with urllib.request.urlopen(req, timeout=timeout) as resp:
         body = json.loads(resp.read().decode())
-    return body.get("message", {})
+    return _message(body)
+
+
+class ChatPool:
+    """Keep-alive HTTP connections to one chat host, for concurrent episodes.
+
+    chat() blocks until one of `size` connections is free, so at most `size`
+    requests are in flight; a connection the server has dropped is reopened
+    and the request retried once.
+    """
+
+    def __init__(self, host: str, size: int = 4, timeout: int = 600):
+        import queue
+        self.host = host
+        self.timeout = timeout
+        self._free: "queue.Queue[http.client.HTTPConnection]" = queue.Queue()
+        for _ in range(size):
+            self._free.put(http.client.HTTPConnection(host, timeout=timeout))
+
+    def chat(self, messages: list[dict], tools: list[dict], model: str,
+             think: bool = False) -> dict:
+        """Same request and return value as ollama_chat."""
+        body = json.dumps(_chat_payload(messages, tools, model, think)).encode()
+        conn = self._free.get()
+        try:
+            for attempt in (0, 1):
+                try:
+                    conn.request("POST", "/api/chat", body=body,
+                                 headers={"Content-Type": "application/json"})
+                    resp = conn.getresponse()
+                    data = resp.read()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionError,
+                        http.client.CannotSendRequest):
+                    conn.close()
+                    if attempt:
+                        raise
+            if resp.status != 200:
+                raise RuntimeError(f"/api/chat HTTP {resp.status}: {data[:200]!r}")
+            return _message(json.loads(data.decode()))
+        except Exception:
+            conn.close()   # reopened on next use
+            raise
+        finally:
+            self._free.put(conn)
+
+    def close(self) -> None:
+        while not self._free.empty():
+            self._free.get_nowait().close()
+
+
+def _cached(cache: "ChatCache | None", send, messages: list[dict],
+            tools: list[dict], model: str, think: bool) -> dict:
+    """send(messages, tools, model, think), through cache when one is given."""
+    if cache is None:
+        return send(messages, tools, model, think)
+    return cache.call(_chat_payload(messages, tools, model, think),
+                      lambda: send(messages, tools, model, think))
 
 
 # ---------------------------------------------------------------------------
@@ -272,11 +462,20 @@ def dispatch(session: CubeSession, name: str, args: dict, mode: str = "intuition
             return session.apply(args.get("moves", ""))
         if name == "simulate":
             return session.simulate(args.get("moves", ""))
+        if name == "simulate_many":
+            cands = args.get("candidates", [])
+            if isinstance(cands, str):
+                cands = [c for c in cands.replace(";", ",").split(",") if c.strip()]
+            # no value estimates where the mode has no (or a deliberately worse) intuition
+            values = bool(args.get("values")) and mode not in ("blind", "pieces")
+            return session.simulate_many(cands, values=values)
         if name == "inverse":
             return session.inverse(args.get("moves", ""))
         if name == "rank_moves":
             # 'pieces' ablation: same tool name, worse (pieces-based) heuristic.
             return session.rank_moves_pieces() if mode == "pieces" else session.rank_moves()
+        if name == "lookahead":
+            return session.lookahead(int(args.get("depth", 2)), int(args.get("top", 5)))
         if name == "save_macro":
             return session.save_macro(args.get("name", ""), args.get("moves", ""),
                                       args.get("note", ""))
@@ -313,6 +512,25 @@ def _fmt_obs(d: dict) -> str:
             else:
                 lines.append(f"  {r['move']:>3}: pieces={r['pieces_solved']}{tag}")
         return "\n".join(lines)
+    if "results" in d:
+        lines = [f"pieces_solved_before={d['pieces_solved_before']} (not committed):"]
+        for r in d["results"]:
+            if "error" in r:
+                lines.append(f"  {r['moves']}: error: {r['error']}")
+                continue
+            est = (f" est={r['estimated_moves_to_solve']}"
+                   if "estimated_moves_to_solve" in r else "")
+            tag = " <-SOLVES" if r["would_solve"] else ""
+            lines.append(f"  {r['moves']}: delta={r['delta_pieces_solved']:+d}{est}{tag}")
+        return "\n".join(lines)
+    if "sequences" in d:
+        lines = [f"current_estimate={d['current_estimate']} ({d['leaves_scored']} "
+                 f"{d['depth']}-move sequences searched, lower est=better):"]
+        for r in d["sequences"]:
+            tag = " <-SOLVES" if r["would_solve"] else ""
+            lines.append(f"  {r['moves']}: est={r['estimated_moves_to_solve']} "
+                         f"pieces={r['pieces_solved']}{tag}")
+        return "\n".join(lines)
     net = d.pop("net", None) or d.pop("net_after", None)
     parts = [f"{k}={v}" for k, v in d.items()]
     s = "  ".join(parts)
@@ -321,21 +539,206 @@ def _fmt_obs(d: dict) -> str:
     return s
 
 
+# ---------------------------------------------------------------------------
+# Speculative intuition
+# ---------------------------------------------------------------------------
+
+SPECULATABLE = ("rank_moves", "lookahead")
+
+
+class Speculator:
+    """Computes intuition tool results for the current state while the chat
+    call is in flight, so the model's next rank_moves (or lookahead) returns
+    without waiting for a value forward.
+
+    start() snapshots the session and submits the tools to one worker thread;
+    lookup() serves a call whose tool, arguments, state and last move match a
+    submitted job (a hit, waiting for it if it is still running) or returns
+    None (a miss, and the caller dispatches as usual). Only tools the mode
+    offers, with a learned heuristic behind them, are speculated.
+    """
+
+    def __init__(self, session: CubeSession, mode: str,
+                 tools: tuple[str, ...] = ("rank_moves",)):
+        from concurrent.futures import ThreadPoolExecutor
+        offered = {t["function"]["name"] for t in tools_for_mode(mode)}
+        self.session = session
+        self.mode = mode
+        self.tools = [t for t in tools if t in offered and mode not in ("blind", "pieces")]
+        self.hits = 0
+        self.misses = 0
+        self._jobs: dict[tuple, object] = {}
+        self._pool = ThreadPoolExecutor(max_workers=1) if self.tools else None
+
+    def _key(self, name: str, args: dict) -> tuple:
+        if name == "lookahead":
+            name = (name, int(args.get("depth", 2)), int(args.get("top", 5)))
+        return (name, tuple(map(tuple, self.session.cube)),
+                tuple(self.session.history[-1:]))
+
+    def start(self) -> None:
+        if self._pool is None:
+            return
+        snap = copy.copy(self.session)            # moves replace cube, never mutate it
+        snap.history = self.session.history[-1:]  # rank_moves reads the last move
+        keys = [self._key(name, {}) for name in self.tools]
+        # jobs for earlier states can never hit again; keep only this state's
+        for key in [k for k in self._jobs if k[1:] != keys[0][1:]]:
+            self._jobs.pop(key).cancel()
+        for name, key in zip(self.tools, keys):
+            if key not in self._jobs:
+                self._jobs[key] = self._pool.submit(dispatch, snap, name, {}, self.mode)
+
+    def lookup(self, name: str, args: dict) -> dict | None:
+        if name not in self.tools:
+            return None
+        job = self._jobs.get(self._key(name, args))
+        if job is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(job.result())
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        self._jobs.clear()
+
+
+# ---------------------------------------------------------------------------
+# Context compaction
+# ---------------------------------------------------------------------------
+
+def _approx_tokens(msgs: list[dict]) -> int:
+    """Rough prompt size (~4 characters per token) for budgeting and logs."""
+    n = 0
+    for m in msgs:
+        n += 4 + len(m.get("content") or "") // 4
+        if m.get("tool_calls"):
+            n += len(json.dumps(m["tool_calls"])) // 4
+    return n
+
+
+def _digest(name: str, args: dict, result: dict) -> tuple[str, bool]:
+    """One-line summary of a tool result, and whether it observed the board."""
+    if "error" in result:
+        return f"{name}({args}) -> error: {result['error']}", False
+    if "applied" in result:
+        return (f"{name} {result.get('macro', result['applied'])} -> "
+                f"pieces_solved={result['pieces_solved']}"
+                f"{' SOLVED' if result['is_solved'] else ''}"), True
+    if name == "observe":
+        return f"observe -> pieces_solved={result['pieces_solved']}", True
+    if "pieces_solved_after" in result:
+        return (f"{name} {result['moves']} -> pieces_solved "
+                f"{result['pieces_solved_before']}->{result['pieces_solved_after']} "
+                f"(not committed)"), False
+    if "ranked_moves" in result and result["ranked_moves"]:
+        top = result["ranked_moves"][0]
+        if "current_estimate" in result:
+            return (f"{name} -> estimate={result['current_estimate']}, best "
+                    f"{top['move']} est={top['estimated_moves_to_solve']}"), False
+        return f"{name} -> best {top['move']} pieces={top['pieces_solved']}", False
+    if result.get("sequences"):
+        top = result["sequences"][0]
+        return (f"{name} -> estimate={result['current_estimate']}, best "
+                f"{top['moves']} est={top['estimated_moves_to_solve']}"), False
+    line = _fmt_obs(dict(result)).splitlines()
+    return f"{name} -> {line[-1][:120] if line else ''}", False
+
+
+class ContextCompactor:
+    """Bounds the prompt of a long episode while keeping its prefix stable.
+
+    view(messages) is what gets sent instead of the full history: the system
+    prompt, the latest board observation and the current turn stay verbatim;
+    older tool results (and the initial observation) are replaced by their
+    one-line digest. The model has to see each result in full once, so the
+    previous turn's results (and the observation a newer one superseded) are
+    swapped for their digests in the next request: consecutive requests share
+    their prefix up to the earlier of the previous turn and the previous
+    latest observation, and the server's prompt cache matches that far. When
+    the view still exceeds `budget` tokens, whole old turns are dropped from
+    the front down to 3/4 of the budget at once, so the cut moves rarely
+    rather than every turn.
+    """
+
+    def __init__(self, budget: int = 4096):
+        self.budget = budget
+        self._digests: dict[int, tuple[str, bool]] = {}   # message index -> digest
+        self._cut = 2   # first message after the task still sent
+
+    def add(self, index: int, digest: tuple[str, bool]) -> None:
+        self._digests[index] = digest
+
+    def view(self, messages: list[dict]) -> list[dict]:
+        asst = [i for i, m in enumerate(messages) if m["role"] == "assistant"]
+        current = asst[-1] if asst else len(messages)
+        obs = [i for i, (_, is_obs) in self._digests.items() if is_obs]
+        latest_obs = max(obs) if obs else 1
+
+        def shown(i: int) -> dict:
+            m = messages[i]
+            if i >= current or i == latest_obs or i not in self._digests:
+                return m
+            return {**m, "content": self._digests[i][0]}
+
+        head = [shown(0), shown(1)]
+        body = [shown(i) for i in range(self._cut, len(messages))]
+        if _approx_tokens(head + body) > self.budget:
+            # turns that may go: those wholly before the latest observation
+            # and the current turn
+            starts = [i for i in asst if self._cut < i <= min(current, latest_obs)]
+            for i in starts:
+                body = [shown(j) for j in range(i, len(messages))]
+                self._cut = i
+                if _approx_tokens(head + body) <= self.budget * 3 // 4:
+                    break
+        if self._cut > 2:
+            n = sum(1 for i in asst if i < self._cut)
+            head.append({"role": "user", "content":
+                         f"({n} earlier turns omitted; the latest state is below.)"})
+        return head + body
+
+
+def _compactor(session: CubeSession, context_budget: int) -> ContextCompactor | None:
+    """The episode's compactor (None for budget 0). Diff observations cannot
+    be compacted: once the earlier deltas are digested the cube is lost."""
+    if context_budget <= 0:
+        return None
+    if session.encoding == "diff":
+        raise ValueError("context compaction needs full observations; "
+                         "use another encoding than 'diff' with context_budget")
+    return ContextCompactor(context_budget)
+
+
 # ---------------------------------------------------------------------------
 # Episode loop
 # ---------------------------------------------------------------------------
 
-def run_episode(session: CubeSession, model: str, host: str,
-                max_turns: int = 15, think: bool = False,
-                mode: str = "intuition", log=lambda *_: None) -> dict:
-    """Run one solve attempt. Returns a result dict."""
-    tools = tools_for_mode(mode)
+def _episode(session: CubeSession, max_turns: int, mode: str, log,
+             compactor: ContextCompactor | None = None,
+             speculator: Speculator | None = None,
+             simulate_many: bool = False):
+    """The episode loop as a generator: yields the message list for each chat
+    call and is sent the assistant message back (or thrown the chat error).
+    Returns the result dict. run_episode / run_episodes_async drive it.
+
+    With a compactor, the full history is still kept in `messages` but each
+    request sends compactor.view(messages) instead. With a speculator, its
+    jobs for the current state are started just before each chat call.
+    simulate_many offers the batched simulate tool (see tools_for_mode)."""
+    tools = tools_for_mode(mode, simulate_many)
     obs = session.observe()
     messages = [
-        {"role": "system", "content": prompt_for_mode(mode)},
+        {"role": "system", "content": prompt_for_mode(mode, session.encoding,
+                                                     simulate_many)},
         {"role": "user", "content":
             "Here is the scrambled cube. Solve it.\n" + _fmt_obs(dict(obs))},
     ]
+    if compactor is not None:
+        compactor.add(1, ("Here is the scrambled cube. Solve it. "
+                          f"(pieces_solved={obs['pieces_solved']})", True))
 
     turns = 0
     tool_calls_made = 0
@@ -344,17 +747,36 @@ def run_episode(session: CubeSession, model: str, host: str,
     last_rank1 = None
     applies_tracked = 0
     applies_rank1 = 0
+    prompt_tokens = 0
+    # rendered-cube tokens per observation (initial one included)
+    obs_counts = [_approx_tokens([{"content": obs["net"]}])]
+    chat_secs = 0.0
     t0 = time.time()
     while turns < max_turns:
-        if session.observe()["is_solved"]:
+        if session.solved_counts()["is_solved"]:
             break
         turns += 1
+        request = compactor.view(messages) if compactor is not None else messages
+        sent = _approx_tokens(request)
+        if speculator is not None:
+            speculator.start()
+        t_chat = time.time()
         try:
-            msg = ollama_chat(messages, tools, model, host, think=think)
+            msg = yield request, tools
         except Exception as exc:  # noqa: BLE001
             log(f"[turn {turns}] chat error: {exc}")
             return {"solved": False, "turns": turns, "error": str(exc),
                     "tool_calls": tool_calls_made, "secs": time.time() - t0}
+        dt = time.time() - t_chat
+        chat_secs += dt
+        usage = msg.pop("usage", None) or {}
+        prompt_tokens += usage.get("prompt_tokens") or sent
+        line = f"[turn {turns}] chat {dt:.2f}s | prompt ~{sent} tok"
+        if request is not messages:
+            line += f" (full history ~{_approx_tokens(messages)})"
+        if usage.get("prompt_tokens") is not None:
+            line += f", server evaluated {usage['prompt_tokens']}"
+        log(line)
 
         messages.append(msg)
         content = (msg.get("content") or "").strip()
@@ -364,7 +786,7 @@ def run_episode(session: CubeSession, model: str, host: str,
         tcs = msg.get("tool_calls") or []
         if not tcs:
             # No tool call. If it claims solved, verify; else nudge.
-            if "SOLVED" in content.upper() and session.observe()["is_solved"]:
+            if "SOLVED" in content.upper() and session.solved_counts()["is_solved"]:
                 break
             messages.append({"role": "user", "content":
                 "Use a tool (observe/simulate/apply/inverse) to make progress. "
@@ -380,7 +802,9 @@ def run_episode(session: CubeSession, model: str, host: str,
                     args = json.loads(args)
                 except Exception:  # noqa: BLE001
                     args = {"moves": args}
-            result = dispatch(session, name, args, mode=mode)
+            result = speculator.lookup(name, args) if speculator is not None else None
+            if result is None:
+                result = dispatch(session, name, args, mode=mode)
             tool_calls_made += 1
             # adherence tracking
             if name == "rank_moves" and result.get("ranked_moves"):
@@ -391,15 +815,25 @@ def run_episode(session: CubeSession, model: str, host: str,
                 if toks and toks[0] == last_rank1.upper():
                     applies_rank1 += 1
                 last_rank1 = None  # only score the apply immediately after a rank
-            log(f"[turn {turns}] tool {name}({args}) -> "
-                f"pieces_solved={result.get('pieces_solved', result.get('pieces_solved_after','?'))}"
-                f"{' SOLVED' if result.get('is_solved') else ''}")
+            line = (f"[turn {turns}] tool {name}({args}) -> "
+                    f"pieces_solved={result.get('pieces_solved', result.get('pieces_solved_after','?'))}"
+                    f"{' SOLVED' if result.get('is_solved') else ''}")
+            rendered = result.get("net") or result.get("net_after")
+            if rendered:
+                n = _approx_tokens([{"content": rendered}])
+                obs_counts.append(n)
+                line += f" | {session.encoding} observation ~{n} tok"
+            log(line)
+            if compactor is not None:
+                compactor.add(len(messages), _digest(name, args, result))
             messages.append({"role": "tool", "tool_name": name,
                              "content": _fmt_obs(dict(result))})
             if result.get("is_solved"):
                 break
 
-    solved = session.observe()["is_solved"]
+    solved = session.solved_counts()["is_solved"]
+    spec = ({"spec_hits": speculator.hits, "spec_misses": speculator.misses}
+            if speculator is not None else {})
     return {
         "solved": solved,
         "turns": turns,
@@ -408,6 +842,138 @@ def run_episode(session: CubeSession, model: str, host: str,
         "secs": round(time.time() - t0, 1),
         "applies_tracked": applies_tracked,
         "applies_rank1": applies_rank1,
+        "prompt_tokens": prompt_tokens,
+        "chat_secs": round(chat_secs, 1),
+        "encoding": session.encoding,
+        "obs_tokens": round(sum(obs_counts) / len(obs_counts), 1),
+        **spec,
+    }
+
+
+def _drive(gen, chat) -> dict:
+    """Run an _episode generator to completion with a blocking chat(messages, tools)."""
+    try:
+        req = next(gen)
+        while True:
+            try:
+                msg = chat(*req)
+            except Exception as exc:  # noqa: BLE001
+                req = gen.throw(exc)
+            else:
+                req = gen.send(msg)
+    except StopIteration as stop:
+        return stop.value
+
+
+def run_episode(session: CubeSession, model: str, host: str,
+                max_turns: int = 15, think: bool = False,
+                mode: str = "intuition", log=lambda *_: None,
+                pool: "ChatPool | None" = None,
+                cache: "ChatCache | None" = None,
+                context_budget: int = 0,
+                speculate: tuple[str, ...] = (),
+                simulate_many: bool = False) -> dict:
+    """Run one solve attempt. Returns a result dict.
+
+    With a ChatCache, each chat call goes through it: in replay mode the
+    episode runs entirely from recorded responses and host is never contacted.
+    context_budget > 0 compacts the history to about that many prompt tokens
+    (see ContextCompactor); 0 sends it in full. speculate names the tools
+    (of SPECULATABLE) to precompute while each chat call is in flight; the
+    result then counts spec_hits / spec_misses. simulate_many also offers the
+    batched simulate tool; off, every mode keeps its original tool set.
+    """
+    if pool is not None:
+        send = pool.chat
+    else:
+        def send(messages, tools, model, think):
+            return ollama_chat(messages, tools, model, host, think=think)
+
+    def chat(messages, tools):
+        return _cached(cache, send, messages, tools, model, think)
+    compactor = _compactor(session, context_budget)
+    speculator = Speculator(session, mode, speculate) if speculate else None
+    try:
+        return _drive(_episode(session, max_turns, mode, log, compactor, speculator,
+                               simulate_many), chat)
+    finally:
+        if speculator is not None:
+            speculator.close()
+
+
+async def run_episodes_async(sessions: list[CubeSession], model: str, host: str,
+                             max_turns: int = 15, think: bool = False,
+                             mode: str = "intuition", concurrency: int = 4,
+                             log=lambda *_: None,
+                             cache: "ChatCache | None" = None,
+                             context_budget: int = 0,
+                             speculate: tuple[str, ...] = (),
+                             simulate_many: bool = False) -> list[dict]:
+    """Run one episode per session concurrently; results in session order.
+
+    Up to `concurrency` chat requests are in flight at once, each on a
+    keep-alive connection from a ChatPool of that size, run on a dedicated
+    executor of as many threads (the loop's default executor would cap it at
+    its own size). Everything else — tool dispatch, value forwards, logging —
+    stays on the event-loop thread, so sessions never run model code in
+    parallel. cache, context_budget, speculate and simulate_many work as in
+    run_episode; speculative forwards run on each episode's worker thread,
+    serialized with the rest by cube_tools' model lock.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool = ChatPool(host, size=concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    loop = asyncio.get_running_loop()
+
+    async def one(k: int, session: CubeSession) -> dict:
+        speculator = Speculator(session, mode, speculate) if speculate else None
+        gen = _episode(session, max_turns, mode,
+                       lambda m, k=k: log(f"[ep {k}] {m}"),
+                       _compactor(session, context_budget),
+                       speculator, simulate_many)
+        try:
+            req = next(gen)
+            while True:
+                try:
+                    msg = await loop.run_in_executor(executor, _cached, cache,
+                                                     pool.chat, *req, model, think)
+                except Exception as exc:  # noqa: BLE001
+                    req = gen.throw(exc)
+                else:
+                    req = gen.send(msg)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            if speculator is not None:
+                speculator.close()
+
+    try:
+        return list(await asyncio.gather(*(one(k, s) for k, s in enumerate(sessions))))
+    finally:
+        executor.shutdown(wait=True)
+        pool.close()
+
+
+def summarize(results: list[dict]) -> dict:
+    """Aggregate episode results (the SUMMARY line of main)."""
+    n = len(results)
+    tracked = sum(r.get("applies_tracked", 0) for r in results)
+    rank1 = sum(r.get("applies_rank1", 0) for r in results)
+    hits = sum(r.get("spec_hits", 0) for r in results)
+    looked = hits + sum(r.get("spec_misses", 0) for r in results)
+    return {
+        "solved": sum(1 for r in results if r["solved"]),
+        "episodes": n,
+        "avg_turns": sum(r["turns"] for r in results) / n,
+        "avg_secs": sum(r["secs"] for r in results) / n,
+        "avg_prompt_tokens": sum(r.get("prompt_tokens", 0) for r in results) / n,
+        "avg_obs_tokens": sum(r.get("obs_tokens", 0) for r in results) / n,
+        "applies_tracked": tracked,
+        "applies_rank1": rank1,
+        "rank1_adherence": f"{rank1/tracked:.2f}" if tracked else "n/a",
+        "spec_hit_rate": f"{hits/looked:.2f}" if looked else "n/a",
     }
 
 
@@ -421,15 +987,41 @@ def main() -> None:
     ap.add_argument("--seed", type=int, default=0)
     ap.add_argument("--think", action="store_true", help="enable model thinking")
     ap.add_argument("--mode",
-                    choices=["intuition", "blind", "memory", "pieces"],
+                    choices=["intuition", "blind", "memory", "pieces", "lookahead"],
                     default="intuition",
                     help="intuition = value rank_moves; blind = none; "
                          "memory = + macro store; pieces = rank_moves by pieces_solved "
-                         "(bad-heuristic ablation)")
+                         "(bad-heuristic ablation); lookahead = + k-ply lookahead tool")
     ap.add_argument("--macro-file", default="runs/llm/macros.json",
                     help="persistent macro memory path (mode=memory)")
     ap.add_argument("--out", default="", help="optional transcript log file")
+    ap.add_argument("--concurrency", type=int, default=1,
+                    help="episodes run concurrently over keep-alive connections "
+                         "(1 = one after another; in memory mode, concurrent "
+                         "episodes only see macros saved before they look)")
+    ap.add_argument("--chat-cache", default="",
+                    help="record/replay cache path prefix (.jsonl + .idx)")
+    ap.add_argument("--cache-mode", choices=CACHE_MODES, default="record",
+                    help="record = reuse hits, store misses; replay = cache "
+                         "only, a miss is an error; passthrough = ignore cache")
+    ap.add_argument("--encoding", choices=ENCODINGS, default=None,
+                    help="how observations render the cube: net (colored net), "
+                         "facelets (54 letters), pieces (unsolved pieces), diff "
+                         "(what changed); default per mode, see MODE_ENCODINGS")
+    ap.add_argument("--speculate", nargs="*", choices=SPECULATABLE, default=[],
+                    help="precompute these intuition tools for the current state "
+                         "while the model is thinking (e.g. --speculate rank_moves)")
+    ap.add_argument("--simulate-many", action="store_true",
+                    help="also offer simulate_many (preview many candidate "
+                         "sequences in one call); off keeps each mode's tools")
+    ap.add_argument("--context-budget", type=int, default=0,
+                    help="compact older turns to one-line digests and keep the "
+                         "prompt near this many tokens (0 = full history)")
     args = ap.parse_args()
+    encoding = args.encoding or MODE_ENCODINGS[args.mode]
+    if encoding == "diff" and args.context_budget > 0:
+        ap.error("--context-budget cannot be combined with the diff encoding "
+                 "(compacted deltas no longer describe the cube)")
 
     logf = open(args.out, "a") if args.out else None
 
@@ -440,33 +1032,60 @@ def main() -> None:
             logf.flush()
 
     log(f"=== LLM cube agent | model={args.model} mode={args.mode} "
+        f"encoding={encoding} "
         f"depth={args.depth} episodes={args.episodes} ===")
     # Shared, persistent macro memory across episodes (memory mode only).
     memory = MacroMemory(args.macro_file) if args.mode == "memory" else None
     if memory is not None:
         log(f"macro memory: {args.macro_file} ({len(memory.macros)} macros loaded)")
+    cache = ChatCache(args.chat_cache, args.cache_mode) if args.chat_cache else None
+    if cache is not None:
+        log(f"chat cache: {args.chat_cache} ({len(cache)} responses, mode={cache.mode})")
 
-    results = []
+    sessions = []
     for ep in range(args.episodes):
-        session = CubeSession(seed=args.seed + ep, memory=memory)
-        obs = session.scramble(args.depth)
-        log(f"\n--- episode {ep} | scramble: {obs['scramble']} "
+        session = CubeSession(seed=args.seed + ep, memory=memory, encoding=encoding)
+        obs = session.scramble(args.depth, render=False)
+        log(f"--- episode {ep} | scramble: {obs['scramble']} "
             f"(pieces_solved={obs['pieces_solved']}) ---")
-        res = run_episode(session, args.model, args.host,
-                          max_turns=args.max_turns, think=args.think,
-                          mode=args.mode, log=log)
-        log(f"--- episode {ep} result: {res} ---")
-        results.append(res)
+        sessions.append(session)
 
-    n_solved = sum(1 for r in results if r["solved"])
-    tracked = sum(r.get("applies_tracked", 0) for r in results)
-    rank1 = sum(r.get("applies_rank1", 0) for r in results)
-    adh = f"{rank1/tracked:.2f}" if tracked else "n/a"
+    if args.concurrency > 1:
+        import asyncio
+        results = asyncio.run(run_episodes_async(
+            sessions, args.model, args.host, max_turns=args.max_turns,
+            think=args.think, mode=args.mode, concurrency=args.concurrency, log=log,
+            cache=cache, context_budget=args.context_budget,
+            speculate=tuple(args.speculate), simulate_many=args.simulate_many))
+        for ep, res in enumerate(results):
+            log(f"--- episode {ep} result: {res} ---")
+    else:
+        results = []
+        pool = ChatPool(args.host, size=1)
+        for ep, session in enumerate(sessions):
+            log(f"\n--- episode {ep} ---")
+            res = run_episode(session, args.model, args.host,
+                              max_turns=args.max_turns, think=args.think,
+                              mode=args.mode, log=log, pool=pool,
+                              cache=cache, context_budget=args.context_budget,
+                              speculate=tuple(args.speculate),
+                              simulate_many=args.simulate_many)
+            log(f"--- episode {ep} result: {res} ---")
+            results.append(res)
+        pool.close()
+
+    sm = summarize(results)
     log(f"\n=== SUMMARY {args.model} mode={args.mode} depth={args.depth}: "
-        f"solved {n_solved}/{len(results)} | "
-        f"avg turns {sum(r['turns'] for r in results)/len(results):.1f} | "
-        f"avg secs {sum(r['secs'] for r in results)/len(results):.1f} | "
-        f"rank1_adherence {adh} ({rank1}/{tracked}) ===")
+        f"solved {sm['solved']}/{sm['episodes']} | "
+        f"avg turns {sm['avg_turns']:.1f} | "
+        f"avg secs {sm['avg_secs']:.1f} | "
+        f"avg prompt tokens {sm['avg_prompt_tokens']:.0f} | "
+        f"avg observation tokens {sm['avg_obs_tokens']:.0f} | "
+        f"rank1_adherence {sm['rank1_adherence']} "
+        f"({sm['applies_rank1']}/{sm['applies_tracked']}) | "
+        f"speculation hit rate {sm['spec_hit_rate']} ===")
+    if cache is not None:
+        log(f"chat cache: {cache.stats()}")
     if logf:
         logf.close()
 
@@ -0,0 +1,274 @@
+"""Offline commutator / conjugate macro discovery with an effect index.
+
+Instead of leaving the agent to find useful macros by trial and error (one
+simulate per try, see cube_tools.MacroMemory), this enumerates short
+
+    commutators   [A, B]    = A B A' B'
+    conjugates    C [A, B] C'
+
+and files each under its *effect*: which corner and edge slots it changes,
+the cycle type of the corner and edge permutations, and how many pieces end
+up twisted / flipped. Sequences are first reduced to their distinct effects
+(48-point permutations from group.py), so commutators are combined from two
+precomputed halves — a meet-in-the-middle over the A and B tables — rather
+than searched move by move, and conjugates reuse the commutator table the
+same way.
+
+    index = build_index(max_a=3, max_b=1, max_c=1)
+    index.find(edges=(5, 6, 7), edge_cycles=(3,), flipped=0)[0]["moves"]
+    index.save("runs/macros.json");  MacroIndex.load("runs/macros.json")
+
+    uv run python source/macros.py --out runs/macros.json
+
+Slot numbering is cfop's: corners C0..C7 (C0-C3 in U), edges E0..E11
+(E0-E3 middle layer, E4-E7 U layer, E8-E11 D layer).
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import sys
+import time
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parent
+for _d in (str(_SRC), str(_SRC / "cube")):
+    if _d not in sys.path:
+        sys.path.insert(0, _d)
+
+from cube_tools import NOTATION, parse_moves       # noqa: E402
+from data import _INV_IDX, _MOVES_PY, _allowed, _join_moves  # noqa: E402
+from group import _inv, _mul, perm_from_state, state_from_perm  # noqa: E402
+
+_MOVE_PERMS = [perm_from_state(m) for m in _MOVES_PY]
+_ID = tuple(range(48))
+
+
+# ---------------------------------------------------------------------------
+# Sequences and their effects
+# ---------------------------------------------------------------------------
+
+def _invert(seq: list[int]) -> list[int]:
+    return [_INV_IDX[m] for m in reversed(seq)]
+
+
+def _effect(seq: list[int]) -> tuple:
+    p = _ID
+    for m in seq:
+        p = _mul(p, _MOVE_PERMS[m])
+    return p
+
+
+def _sequences(max_len: int) -> dict[tuple, list[int]]:
+    """{effect: shortest sequence} over canonical sequences of 1..max_len
+    moves (no face twice in a row, commuting opposite faces in U/L/F-first
+    order), identity excluded."""
+    out: dict[tuple, list[int]] = {}
+    frontier: list[tuple[list[int], tuple]] = [([], _ID)]
+    for _ in range(max_len):
+        nxt = []
+        for seq, eff in frontier:
+            last = seq[-1] if seq else -1
+            for m in range(18):
+                if not _allowed(m, last):
+                    continue
+                ne = _mul(eff, _MOVE_PERMS[m])
+                if ne not in out:
+                    out[ne] = seq + [m]
+                    nxt.append((seq + [m], ne))
+        frontier = nxt
+    out.pop(_ID, None)
+    return out
+
+
+def _fmt(seq: list[int]) -> str:
+    return ' '.join(NOTATION[m] for m in seq)
+
+
+# ---------------------------------------------------------------------------
+# Effect classification
+# ---------------------------------------------------------------------------
+
+def _cycle_type(perm: list[int]) -> tuple[int, ...]:
+    """Lengths of the non-trivial cycles, longest first."""
+    seen = [False] * len(perm)
+    out = []
+    for i in range(len(perm)):
+        n = 0
+        j = i
+        while not seen[j]:
+            seen[j] = True
+            j = perm[j]
+            n += 1
+        if n > 1:
+            out.append(n)
+    return tuple(sorted(out, reverse=True))
+
+
+def classify(effect: tuple) -> dict:
+    """Effect signature of a 48-point permutation (see group.perm_from_state)."""
+    cp, ct, ep, ef = state_from_perm(effect)
+    return {
+        "corners": [i for i in range(8) if cp[i] != i or ct[i]],
+        "edges": [i for i in range(12) if ep[i] != i or ef[i]],
+        "corner_cycles": list(_cycle_type(cp)),
+        "edge_cycles": list(_cycle_type(ep)),
+        "twisted": sum(1 for t in ct if t),
+        "flipped": sum(ef),
+    }
+
+
+def _n_pieces(effect: tuple) -> int:
+    # a corner moves iff its twist-0 point moves, an edge iff its flip-0 point
+    return (sum(1 for i in range(0, 24, 3) if effect[i] != i)
+            + sum(1 for i in range(24, 48, 2) if effect[i] != i))
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+def _mask(slots) -> int:
+    return sum(1 << i for i in slots)
+
+
+class MacroIndex:
+    """Macros filed by the exact set of corner and edge slots they change.
+
+    Entries are dicts {"moves", "len", "form", "corners", "edges",
+    "corner_cycles", "edge_cycles", "twisted", "flipped"}; per piece set they
+    are kept shortest first, so find() is a dict lookup plus a short filter.
+    """
+
+    def __init__(self, entries: list[dict] | None = None):
+        self.entries: list[dict] = []
+        self._by_pieces: dict[tuple[int, int], list[dict]] = {}
+        for e in entries or []:
+            self.add(e)
+
+    def add(self, entry: dict) -> None:
+        self.entries.append(entry)
+        bucket = self._by_pieces.setdefault(
+            (_mask(entry["corners"]), _mask(entry["edges"])), [])
+        bisect.insort(bucket, entry, key=lambda e: e["len"])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def find(self, corners=(), edges=(), corner_cycles=None, edge_cycles=None,
+             twisted: int | None = None, flipped: int | None = None,
+             limit: int = 1) -> list[dict]:
+        """Shortest macros changing exactly these slots (and nothing else),
+        optionally with the given cycle types / twist and flip counts."""
+        out = []
+        for e in self._by_pieces.get((_mask(corners), _mask(edges)), []):
+            if corner_cycles is not None and tuple(e["corner_cycles"]) != tuple(corner_cycles):
+                continue
+            if edge_cycles is not None and tuple(e["edge_cycles"]) != tuple(edge_cycles):
+                continue
+            if twisted is not None and e["twisted"] != twisted:
+                continue
+            if flipped is not None and e["flipped"] != flipped:
+                continue
+            out.append(e)
+            if len(out) >= limit:
+                break
+        return out
+
+    def summary(self) -> dict:
+        """Entry counts per (corner cycles, edge cycles) class."""
+        counts: dict[str, int] = {}
+        for e in self.entries:
+            k = f"c{e['corner_cycles']} e{e['edge_cycles']}"
+            counts[k] = counts.get(k, 0) + 1
+        return dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+
+    def save(self, path: str | Path) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(self.entries, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "MacroIndex":
+        return cls(json.loads(Path(path).read_text()))
+
+
+def build_index(max_a: int = 3, max_b: int = 1, max_c: int = 1,
+                max_pieces: int = 6, verbose: bool = False) -> MacroIndex:
+    """Enumerate [A, B] (|A| <= max_a, |B| <= max_b) and C [A, B] C'
+    (|C| <= max_c) and index every distinct effect that changes at most
+    max_pieces pieces, keeping the shortest sequence per effect."""
+    t0 = time.time()
+    a_table = _sequences(max_a)
+    b_table = a_table if max_b == max_a else _sequences(max_b)
+    best: dict[tuple, tuple[list[int], str]] = {}
+
+    def offer(eff, seq, form):
+        if eff == _ID or _n_pieces(eff) > max_pieces:
+            return
+        if eff not in best or len(seq) < len(best[eff][0]):
+            best[eff] = (seq, form)
+
+    for pa, sa in a_table.items():
+        ia = _inv(pa)
+        for pb, sb in b_table.items():
+            eff = _mul(_mul(_mul(pa, pb), ia), _inv(pb))
+            if eff == _ID:
+                continue
+            seq = _join_moves(_join_moves(_join_moves(sa, sb), _invert(sa)), _invert(sb))
+            offer(eff, seq, f"[{_fmt(sa)}, {_fmt(sb)}]")
+    n_comm = len(best)
+    if verbose:
+        print(f"macros: {len(a_table)} x {len(b_table)} halves -> {n_comm} "
+              f"commutators ({time.time() - t0:.1f}s)", flush=True)
+
+    if max_c > 0:
+        comms = list(best.items())
+        for pc, sc in _sequences(max_c).items():
+            ic = _inv(pc)
+            for eff, (seq, form) in comms:
+                ceff = _mul(_mul(pc, eff), ic)
+                offer(ceff, _join_moves(_join_moves(sc, seq), _invert(sc)),
+                      f"{_fmt(sc)} {form} {_fmt(_invert(sc))}")
+        if verbose:
+            print(f"macros: +{len(best) - n_comm} conjugates "
+                  f"({time.time() - t0:.1f}s)", flush=True)
+
+    index = MacroIndex()
+    for eff, (seq, form) in sorted(best.items(), key=lambda kv: len(kv[1][0])):
+        index.add({"moves": _fmt(seq), "len": len(seq), "form": form,
+                   **classify(eff)})
+    return index
+
+
+def effect_of(moves: str) -> dict:
+    """Classify a move string the same way index entries are."""
+    return classify(_effect(parse_moves(moves)))
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build the commutator/conjugate macro index")
+    ap.add_argument("--max-a", type=int, default=3, help="max length of A (default: 3)")
+    ap.add_argument("--max-b", type=int, default=1, help="max length of B (default: 1)")
+    ap.add_argument("--max-c", type=int, default=1,
+                    help="max conjugating setup length, 0 = none (default: 1)")
+    ap.add_argument("--max-pieces", type=int, default=6,
+                    help="keep effects changing at most this many pieces (default: 6)")
+    ap.add_argument("--out", default="runs/macros.json")
+    args = ap.parse_args()
+
+    index = build_index(args.max_a, args.max_b, args.max_c, args.max_pieces,
+                        verbose=True)
+    index.save(args.out)
+    print(f"macros: {len(index)} effects -> {args.out}")
+    for k, v in list(index.summary().items())[:12]:
+        print(f"  {v:6}  {k}")
+
+
+if __name__ == "__main__":
+    main()
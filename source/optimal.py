@@ -0,0 +1,409 @@
+"""Korf-style optimal solver: IDA* over memory-mapped pattern databases.
+
+Used to measure how far the learned searches (and the CFOP / Kociemba
+teachers) are from optimal:
+
+    optimal_length(states, node_budget=...)  -> [int | None, ...]
+
+Pattern databases
+-----------------
+A pattern tracks a set of corner or edge pieces: the index is the rank of
+their partial permutation (which slots they occupy) times their orientations
+(the last orientation is implied when the full set is tracked). Korf's set:
+
+    corners   all 8 corners     8! * 3^7        = 88,179,840 entries (42 MB)
+    edges6a   edges 0..5        12!/6! * 2^6    = 42,577,920 entries (21 MB)
+    edges6b   edges 6..11       (same)
+    edges7a / edges7b           12!/5! * 2^7    = 510,935,040 entries (255 MB)
+
+Tables are built once by a multi-process level-synchronous BFS over a shared
+byte array (one byte per entry), then packed to 4-bit nibbles (0xF = not
+reached, read as 0) and memory-mapped. The builder is pure Python: the small
+test patterns take seconds, the full Korf tables take many hours.
+
+    uv run python source/optimal.py build --tables corners,edges6a,edges6b --workers 8
+    uv run python source/optimal.py solve --n 5 --depth 10 --node-budget 2000000
+"""
+
+import argparse
+import math
+import multiprocessing as mp
+import sys
+import time
+from multiprocessing import shared_memory
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from data import _IDENTITY, _MOVES_PY, _allowed, _compose  # noqa: E402
+from kociemba import _NibbleTable, _write_atomic  # noqa: E402
+
+_PDB_DIR = Path(__file__).parent / ".optimal_pdb"
+_NIB_UNKNOWN = 0xF
+
+
+# ---------------------------------------------------------------------------
+# Piece patterns
+# ---------------------------------------------------------------------------
+
+class PiecePattern:
+    """Coordinate over a subset of corner or edge pieces (see module doc)."""
+
+    def __init__(self, name: str, kind: str, pieces: tuple[int, ...]):
+        if kind not in ("corner", "edge"):
+            raise ValueError(f"Unknown piece kind: {kind!r}")
+        self.name = name
+        self.kind = kind
+        self.pieces = tuple(pieces)
+        self.n_slots = 8 if kind == "corner" else 12
+        self.n_ori = 3 if kind == "corner" else 2
+        k = len(self.pieces)
+        # with every piece tracked, the last orientation follows from the rest
+        self.k_ori = k - 1 if k == self.n_slots else k
+        self.n_perm = math.perm(self.n_slots, k)
+        self.n_oris = self.n_ori ** self.k_ori
+        self.size = self.n_perm * self.n_oris
+        # per move: piece at slot src goes to dest[src] with ori + add[src]
+        self.dest, self.add = [], []
+        for bcp, bct, bep, bef in _MOVES_PY:
+            perm, ori = (bcp, bct) if kind == "corner" else (bep, bef)
+            dest = [0] * self.n_slots
+            add = [0] * self.n_slots
+            for i in range(self.n_slots):
+                dest[perm[i]] = i
+                add[perm[i]] = ori[i]
+            self.dest.append(dest)
+            self.add.append(add)
+
+    def __repr__(self) -> str:
+        return f"PiecePattern({self.name!r}, {self.kind!r}, {self.pieces})"
+
+    def encode(self, slots: list[int], oris: list[int]) -> int:
+        rank = 0
+        for i, s in enumerate(slots):
+            rank = rank * (self.n_slots - i) + s - sum(1 for t in slots[:i] if t < s)
+        o = 0
+        for i in range(self.k_ori - 1, -1, -1):
+            o = o * self.n_ori + oris[i]
+        return rank * self.n_oris + o
+
+    def decode(self, idx: int) -> tuple[list[int], list[int]]:
+        rank, o = divmod(idx, self.n_oris)
+        k = len(self.pieces)
+        oris = []
+        for _ in range(self.k_ori):
+            o, d = divmod(o, self.n_ori)
+            oris.append(d)
+        if self.k_ori < k:
+            oris.append((-sum(oris)) % self.n_ori)
+        digits = []
+        for i in range(k - 1, -1, -1):
+            rank, d = divmod(rank, self.n_slots - i)
+            digits.append(d)
+        digits.reverse()
+        free = list(range(self.n_slots))
+        slots = [free.pop(d) for d in digits]
+        return slots, oris
+
+    def index(self, state: tuple) -> int:
+        cp, ct, ep, ef = state
+        perm, ori = (cp, ct) if self.kind == "corner" else (ep, ef)
+        slots = [perm.index(p) for p in self.pieces]
+        return self.encode(slots, [ori[s] for s in slots])
+
+    def neighbours(self, idx: int) -> list[int]:
+        """Indices after each of the 18 moves."""
+        slots, oris = self.decode(idx)
+        n_ori = self.n_ori
+        out = []
+        for dest, add in zip(self.dest, self.add):
+            out.append(self.encode([dest[s] for s in slots],
+                                   [(o + add[s]) % n_ori for s, o in zip(slots, oris)]))
+        return out
+
+
+KORF_PATTERNS = {
+    "corners": PiecePattern("corners", "corner", tuple(range(8))),
+    "edges6a": PiecePattern("edges6a", "edge", tuple(range(6))),
+    "edges6b": PiecePattern("edges6b", "edge", tuple(range(6, 12))),
+    "edges7a": PiecePattern("edges7a", "edge", tuple(range(7))),
+    "edges7b": PiecePattern("edges7b", "edge", tuple(range(5, 12))),
+}
+DEFAULT_TABLES = ("corners", "edges6a", "edges6b")
+
+
+# ---------------------------------------------------------------------------
+# Multi-process BFS builder
+# ---------------------------------------------------------------------------
+
+_W: dict = {}   # per-worker: attached shared memory + pattern
+
+
+def _bfs_worker_init(shm_name: str, pattern: PiecePattern) -> None:
+    _W["shm"] = shared_memory.SharedMemory(name=shm_name)
+    _W["pattern"] = pattern
+
+
+def _bfs_expand(task: tuple[int, int, int]) -> int:
+    """Expand every depth-d entry in [lo, hi); returns entries newly set.
+
+    Concurrent writers only ever store the same value d+1 into a 0xFF cell,
+    so the unsynchronised writes are benign."""
+    lo, hi, d = task
+    buf = _W["shm"].buf
+    pattern = _W["pattern"]
+    chunk = bytes(buf[lo:hi])
+    needle = bytes([d])
+    nd = d + 1
+    new = 0
+    pos = chunk.find(needle)
+    while pos >= 0:
+        for j in pattern.neighbours(lo + pos):
+            if buf[j] == 0xFF:
+                buf[j] = nd
+                new += 1
+        pos = chunk.find(needle, pos + 1)
+    return new
+
+
+def _pack_nibbles(dist: bytes) -> bytes:
+    """One byte per entry (0xFF = unreached) -> two entries per byte, low
+    nibble first. Done with bytes.translate + big-int OR to stay in C."""
+    nib = bytes(_NIB_UNKNOWN if v == 0xFF else min(v, _NIB_UNKNOWN - 1)
+                for v in range(256))
+    if len(dist) % 2:
+        dist += b"\xff"
+    lo = dist[0::2].translate(nib)
+    hi = dist[1::2].translate(bytes((b << 4) & 0xFF for b in nib))
+    n = len(lo)
+    return (int.from_bytes(lo, "little") | int.from_bytes(hi, "little")).to_bytes(n, "little")
+
+
+def build_pdb(pattern: PiecePattern, path: str | Path, workers: int = 1,
+              chunk: int = 1 << 20, verbose: bool = True) -> Path:
+    """Distance-to-solved for every pattern index, written nibble-packed to path."""
+    n = pattern.size
+    shm = shared_memory.SharedMemory(create=True, size=n)
+    try:
+        shm.buf[:n] = b"\xff" * n
+        shm.buf[pattern.index(_IDENTITY)] = 0
+        ranges = [(lo, min(n, lo + chunk)) for lo in range(0, n, chunk)]
+        t0 = time.time()
+        ctx = mp.get_context("spawn")
+        pool = (ctx.Pool(workers, initializer=_bfs_worker_init,
+                         initargs=(shm.name, pattern)) if workers > 1 else None)
+        if pool is None:
+            _bfs_worker_init(shm.name, pattern)
+        try:
+            depth, total = 0, 1
+            while True:
+                tasks = [(lo, hi, depth) for lo, hi in ranges]
+                counts = (pool.map(_bfs_expand, tasks) if pool is not None
+                          else [_bfs_expand(t) for t in tasks])
+                if not sum(counts):
+                    break
+                depth += 1
+                total += sum(counts)
+                if verbose:
+                    print(f"  [{pattern.name}] depth {depth:2}: {total:>11}/{n} "
+                          f"({time.time() - t0:7.1f}s)", flush=True)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            else:
+                _W["shm"].close()
+                _W.clear()
+        data = _pack_nibbles(bytes(shm.buf[:n]))
+    finally:
+        shm.close()
+        shm.unlink()
+    path = Path(path)
+    _write_atomic(path, data)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# IDA* solver
+# ---------------------------------------------------------------------------
+
+class PatternDB:
+    """A memory-mapped table plus the pattern that indexes it."""
+
+    def __init__(self, pattern: PiecePattern, path: str | Path):
+        self.pattern = pattern
+        self.path = Path(path)
+        self.table = _NibbleTable(self.path)
+
+    def h(self, state: tuple) -> int:
+        return self.table[self.pattern.index(state)]
+
+
+def load_pdbs(names: tuple[str, ...] = DEFAULT_TABLES,
+              root: str | Path = _PDB_DIR) -> list[PatternDB]:
+    """Open the named Korf tables under root (they are never built implicitly)."""
+    root = Path(root)
+    missing = [nm for nm in names if not (root / f"{nm}.nib").exists()]
+    if missing:
+        raise FileNotFoundError(
+            f"missing pattern databases {missing} under {root}; build them with "
+            f"`python source/optimal.py build --tables {','.join(missing)}`")
+    return [PatternDB(KORF_PATTERNS[nm], root / f"{nm}.nib") for nm in names]
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def solve_optimal(state: tuple, pdbs: list[PatternDB],
+                  node_budget: int | None = None) -> tuple[list[int] | None, int]:
+    """IDA* with h = max over pdbs. Returns (optimal moves or None if the node
+    budget ran out, nodes expanded)."""
+    nodes = 0
+
+    def h(s):
+        best = 0
+        for db in pdbs:
+            v = db.h(s)
+            if v > best:
+                best = v
+        return best
+
+    def dfs(s, g, bound, last, path):
+        nonlocal nodes
+        nodes += 1
+        if node_budget is not None and nodes > node_budget:
+            raise _BudgetExceeded
+        f = g + h(s)
+        if f > bound:
+            return f
+        if s == _IDENTITY:
+            return True
+        best = None
+        for m in range(18):
+            if not _allowed(m, last):
+                continue
+            path.append(m)
+            t = dfs(_compose(s, _MOVES_PY[m]), g + 1, bound, m, path)
+            if t is True:
+                return True
+            path.pop()
+            if best is None or t < best:
+                best = t
+        return best if best is not None else math.inf
+
+    bound = h(state)
+    try:
+        while True:
+            path: list[int] = []
+            t = dfs(state, 0, bound, -1, path)
+            if t is True:
+                return path, nodes
+            bound = t
+    except _BudgetExceeded:
+        return None, nodes
+
+
+_OPT_W: dict = {}
+
+
+def _opt_worker_init(names, root):
+    _OPT_W["pdbs"] = load_pdbs(names, root)
+
+
+def _opt_worker(task):
+    state, budget = task
+    moves, _ = solve_optimal(state, _OPT_W["pdbs"], budget)
+    return None if moves is None else len(moves)
+
+
+def optimal_length(states: list[tuple], pdbs: list[PatternDB] | None = None,
+                   node_budget: int | None = None,
+                   workers: int = 1) -> list[int | None]:
+    """Optimal solution length of every state (None where the budget ran out).
+
+    pdbs defaults to the Korf tables (load_pdbs()). workers > 1 solves the
+    states in a process pool, each worker mapping the same table files.
+    """
+    if pdbs is None:
+        pdbs = load_pdbs()
+    if workers <= 1 or len(states) <= 1:
+        out = []
+        for s in states:
+            moves, _ = solve_optimal(s, pdbs, node_budget)
+            out.append(None if moves is None else len(moves))
+        return out
+    names = tuple(db.pattern.name for db in pdbs)
+    root = pdbs[0].path.parent
+    if any(db.pattern is not KORF_PATTERNS.get(db.pattern.name) for db in pdbs):
+        raise ValueError("workers > 1 needs named Korf tables (see load_pdbs)")
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(workers, initializer=_opt_worker_init, initargs=(names, root)) as pool:
+        return pool.map(_opt_worker, [(s, node_budget) for s in states])
+
+
+def optimality_gap(states: list[tuple], solved_mask: list[bool], steps: list[int],
+                   pdbs: list[PatternDB] | None = None,
+                   node_budget: int | None = None, workers: int = 1) -> dict:
+    """Compare rollout lengths of the solved states with their optimal lengths.
+
+    Returns n_known (optimum found within budget), avg_optimal, avg_gap,
+    median_gap, max_gap and frac_optimal (gap 0) over those states.
+    """
+    idx = [i for i, ok in enumerate(solved_mask) if ok]
+    opt = optimal_length([states[i] for i in idx], pdbs, node_budget, workers)
+    pairs = [(steps[i], o) for i, o in zip(idx, opt) if o is not None]
+    gaps = sorted(st - o for st, o in pairs)
+    if not gaps:
+        return {"n_known": 0, "n_unknown": len(idx)}
+    return {
+        "n_known": len(gaps), "n_unknown": len(idx) - len(gaps),
+        "avg_optimal": sum(o for _, o in pairs) / len(pairs),
+        "avg_gap": sum(gaps) / len(gaps), "median_gap": gaps[len(gaps) // 2],
+        "max_gap": gaps[-1], "frac_optimal": sum(g == 0 for g in gaps) / len(gaps),
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Korf optimal solver / PDB builder.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="Build pattern databases.")
+    p_build.add_argument("--tables", default=",".join(DEFAULT_TABLES),
+                         help=f"Comma list from {sorted(KORF_PATTERNS)}.")
+    p_build.add_argument("--workers", type=int, default=mp.cpu_count())
+    p_build.add_argument("--dir", default=str(_PDB_DIR))
+    p_solve = sub.add_parser("solve", help="Optimally solve random scrambles.")
+    p_solve.add_argument("--n", type=int, default=5)
+    p_solve.add_argument("--depth", type=int, default=10)
+    p_solve.add_argument("--seed", type=int, default=0)
+    p_solve.add_argument("--node-budget", type=int, default=None)
+    p_solve.add_argument("--tables", default=",".join(DEFAULT_TABLES))
+    p_solve.add_argument("--dir", default=str(_PDB_DIR))
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        for name in args.tables.split(","):
+            pattern = KORF_PATTERNS[name]
+            print(f"building {name}: {pattern.size:,} entries, "
+                  f"{args.workers} workers", flush=True)
+            build_pdb(pattern, Path(args.dir) / f"{name}.nib", workers=args.workers)
+        return
+
+    import random
+
+    from data import generate_walk_states
+    pdbs = load_pdbs(tuple(args.tables.split(",")), args.dir)
+    for i, s in enumerate(generate_walk_states(args.n, args.depth,
+                                               random.Random(args.seed))):
+        t0 = time.time()
+        moves, nodes = solve_optimal(s, pdbs, args.node_budget)
+        length = "budget" if moves is None else f"{len(moves):2} moves"
+        print(f"  scramble {i}: {length}  {nodes:>10} nodes  "
+              f"({time.time() - t0:.1f}s)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent / "cube"))
 
 from data import (  # noqa: E402
+    SCRAMBLE_GENERATORS,
+    TEACHERS,
     generate_batch,
     generate_batch_hindsight,
     generate_batch_value_iter,
@@ -236,11 +238,14 @@ def train(args: argparse.Namespace) -> None:
     if args.resume:
         log(f"resumed from: {args.resume}", logfile)
     if args.data == "cfop":
-        log(f"pool-size: {args.pool_size}, scramble-depth: {args.scramble_depth}",
-            logfile)
+        log(f"pool-size: {args.pool_size}, scramble-depth: {args.scramble_depth}, "
+            f"scramble-gen: {args.scramble_gen}, teacher: {args.teacher}, "
+            f"cross-faces: {args.cross_faces} ({args.cross_pick})", logfile)
         if getattr(args, 'diverse_pool', False):
             log(f"diverse-pool: ON  (min-depth={args.min_depth}, "
-                f"max-depth={args.scramble_depth}, randomize=True)", logfile)
+                f"max-depth={args.scramble_depth}, "
+                + (f"k={args.diverse_k} solutions/scramble)" if args.diverse_k > 1
+                   else "randomize=True)"), logfile)
     log(f"value-weight: {args.value_weight}, feed-t: {not args.no_t}", logfile)
     if args.data in ("hindsight", "value"):
         log(f"t-cap: {args.t_cap}, identity-goal-frac: {args.identity_goal_frac}",
@@ -266,7 +271,14 @@ def train(args: argparse.Namespace) -> None:
             cache_path=pool_cache,
             verbose=True,
             min_depth=args.min_depth if use_diverse else None,
-            randomize=use_diverse,
+            randomize=use_diverse and args.diverse_k == 1,
+            scramble_gen=args.scramble_gen,
+            stats_path=args.pool_stats,
+            teacher=args.teacher,
+            cross_faces=args.cross_faces,
+            cross_pick=args.cross_pick,
+            workers=args.pool_workers,
+            diverse_k=args.diverse_k if use_diverse else 1,
         )
         total_rows = pool['t'].shape[0]
         log(f"pool ready: {total_rows} samples", logfile)
@@ -475,11 +487,33 @@ def main() -> None:
     parser.add_argument("--ckpt-every",    type=int, default=0)
     parser.add_argument("--pool-size",     type=int, default=200_000)
     parser.add_argument("--scramble-depth", type=int, default=25)
+    parser.add_argument("--scramble-gen",  choices=sorted(SCRAMBLE_GENERATORS), default="walk",
+                        help="CFOP pool scrambles: random walks of --scramble-depth "
+                             "moves (default) or uniformly random states")
+    parser.add_argument("--teacher",       choices=list(TEACHERS), default="cfop",
+                        help="solver that labels the BC pool: CFOP (~60 moves, default) "
+                             "or the two-phase Kociemba solver (~21 moves)")
+    parser.add_argument("--cross-faces",   type=str, default="D",
+                        help="faces the CFOP teacher may build its cross on, e.g. "
+                             "D (default), UD, or UDLRFB for color neutral")
+    parser.add_argument("--cross-pick",    choices=["cross", "cross+f2l"], default="cross",
+                        help="pick the cross face by shortest cross (default) or "
+                             "shortest Cross+F2L")
+    parser.add_argument("--pool-workers",  type=int, default=1,
+                        help="processes for the CFOP F2L searches when the pool "
+                             "is (re)built (default: 1 = in-process)")
+    parser.add_argument("--pool-stats",    type=str, default=None,
+                        help="when the CFOP pool is (re)built, write solver stage "
+                             "timing / node-count histograms to this JSON path")
     parser.add_argument("--resume",        type=str, default="",
                         help="path to a checkpoint .npz to continue training from")
     parser.add_argument("--diverse-pool",  action="store_true",
                         help="build a diverse CFOP pool with randomized solutions "
                              "and variable scramble depth (requires --data cfop)")
+    parser.add_argument("--diverse-k",     type=int, default=1,
+                        help="with --diverse-pool: take K distinct CFOP solutions "
+                             "per scramble from one shared search (cfop.solve_diverse) "
+                             "instead of one randomized solve (default: 1)")
     parser.add_argument("--min-depth",     type=int, default=1,
                         help="minimum scramble depth when --diverse-pool is active "
                              "(default: 1)")
@@ -1,7 +1,10 @@
 """Make source modules importable from tests."""
+import json
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parent.parent
 SOURCE_DIR = ROOT / "source"
 CUBE_DIR = SOURCE_DIR / "cube"
@@ -9,3 +12,20 @@ CUBE_DIR = SOURCE_DIR / "cube"
 for d in [str(SOURCE_DIR), str(CUBE_DIR)]:
     if d not in sys.path:
         sys.path.insert(0, d)
+
+
+TINY_CFG = {"d_model": 32, "n_layers": 1, "n_heads": 4, "ffn_mult": 2, "t_max": 100}
+
+
+@pytest.fixture(scope="session")
+def tiny_ckpt(tmp_path_factory) -> str:
+    """An untrained tiny checkpoint with its sibling config .json."""
+    import mlx.core as mx
+    from mlx.utils import tree_flatten
+    from model.solver import CubeSolver
+    d = tmp_path_factory.mktemp("ckpt")
+    mx.random.seed(0)
+    path = d / "tiny.npz"
+    mx.savez(str(path), **dict(tree_flatten(CubeSolver(**TINY_CFG).parameters())))
+    (d / "tiny.json").write_text(json.dumps(TINY_CFG))
+    return str(path)
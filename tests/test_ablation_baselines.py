@@ -0,0 +1,15 @@
+"""Tests for the deterministic baselines (source/ablation_baselines.py)."""
+import ablation_baselines as ab
+
+
+def test_lockstep_matches_serial(tiny_ckpt):
+    seeds = list(range(8))
+    for depth in (1, 3):
+        assert ab.greedy_solve_many(seeds, depth, tiny_ckpt) == \
+            [ab.greedy_solve(seed, depth, tiny_ckpt) for seed in seeds]
+        assert ab.greedy_pieces_solve_many(seeds, depth) == \
+            [ab.greedy_pieces_solve(seed, depth) for seed in seeds]
+        assert ab.random_solve_many(seeds, depth) == \
+            [ab.random_solve(seed, depth) for seed in seeds]
+    # depth-1 scrambles are one greedy-pieces move from solved
+    assert all(ab.greedy_pieces_solve_many(seeds, 1))
@@ -0,0 +1,32 @@
+"""Tests for the micro-benchmark runner (source/bench.py)."""
+import json
+
+import bench
+
+
+def _baseline(**medians):
+    return {"meta": {}, "results": {
+        name: {"median_s": m, "min_s": m * 0.9} for name, m in medians.items()}}
+
+
+def test_run_selected_benchmarks():
+    res = bench.run(r"^data\._compose$|^state\.invert$", repeats=2,
+                    min_time=0.001, verbose=False)
+    assert set(res["results"]) == {"data._compose", "state.invert"}
+    for r in res["results"].values():
+        assert r["repeats"] == 2 and r["number"] >= 1
+        assert 0 < r["min_s"] <= r["median_s"]
+    json.dumps(res)  # baselines must be JSON-serialisable
+
+
+def test_compare_flags_only_beyond_threshold():
+    base = _baseline(a=1.0, b=1.0, c=1.0, gone=1.0)
+    new = _baseline(a=1.1, b=1.5, c=0.5)
+    rows = {r["name"]: r["status"] for r in bench.compare(base, new, threshold=0.15)}
+    assert rows == {"a": "ok", "b": "REGRESSION", "c": "faster"}
+
+
+def test_compare_needs_min_to_regress_too():
+    base = _baseline(a=1.0)
+    new = {"meta": {}, "results": {"a": {"median_s": 2.0, "min_s": 0.95}}}
+    assert bench.compare(base, new)[0]["status"] == "ok"
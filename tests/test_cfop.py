@@ -4,6 +4,7 @@ import random
 import pytest
 
 from cfop import (
+    SolveStats,
     _IDENTITY,
     _MOVES_PY,
     _apply_moves,
@@ -133,3 +134,214 @@ def test_stages_concat_equals_solve_length_or_solves():
         assert cube_solved(result), (
             f"scramble {i}: concatenated stage moves do not yield a solved cube"
         )
+
+
+# ---------------------------------------------------------------------------
+# 7. Opt-in instrumentation
+# ---------------------------------------------------------------------------
+
+def test_solve_stats_collected_and_solution_unchanged(tmp_path):
+    """stats= only observes: solutions are identical and every stage / IDA*
+    call is counted; the summary round-trips through JSON."""
+    import json
+
+    stats = SolveStats()
+    for s in _SCRAMBLES[:3]:
+        assert solve(s, stats=stats) == solve(s)
+    solve_stages(_SCRAMBLES[3], stats=stats)
+
+    assert stats.n_solves == 4
+    assert all(len(stats.stage_ms[k]) == 4 for k in SolveStats.STAGES)
+    n_calls = sum(len(v) for v in stats.ida_nodes.values())
+    assert n_calls >= 4 * 4   # at least one successful IDA* per pair per solve
+    assert all(n > 0 for v in stats.ida_nodes.values() for n in v)
+    assert len(stats.bfs_nodes) == sum(stats.deadlock_breaks)
+
+    path = tmp_path / "stats.json"
+    stats.write_json(path)
+    summary = json.loads(path.read_text())
+    assert summary["n_solves"] == 4
+    assert abs(sum(summary["stage_share"].values()) - 1.0) < 1e-3
+    assert summary["ida_nodes"]["count"] == n_calls
+    assert sum(summary["ida_nodes"]["buckets"].values()) == n_calls
+
+
+# ---------------------------------------------------------------------------
+# 8. Multi-piece F2L pattern databases
+# ---------------------------------------------------------------------------
+
+def test_joint_pdbs_same_paths_fewer_nodes():
+    """XCross / pair+pair heuristics are admissible (IDA* returns the very
+    same optimal insertion) and expand far fewer nodes than the pair PDB."""
+    from cfop import SolveStats, _ida_pair, _solvable_now, _solve_cross
+
+    nodes = {True: 0, False: 0}
+    for scrambled in _SCRAMBLES[:3]:
+        s = _apply_moves(scrambled, _solve_cross(scrambled))
+        for pi in range(4):
+            if not _solvable_now(s, pi):
+                continue
+            paths = {}
+            for joint in (True, False):
+                stats = SolveStats()
+                paths[joint] = _ida_pair(s, frozenset(), pi, stats=stats,
+                                         use_joint=joint)
+                nodes[joint] += stats.ida_nodes[pi][0]
+            assert paths[True] == paths[False]
+    assert nodes[True] * 10 < nodes[False]
+
+
+def test_f2l_pdbs_open_on_first_search_not_at_import():
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    src = Path(__file__).resolve().parent.parent / "source"
+    code = (f"import sys; sys.path[:0] = [{str(src)!r}, {str(src / 'cube')!r}]; "
+            "import cfop; assert cfop._F2L_PDBS is None; "
+            "cfop.solve(cfop._MOVES_PY[6]); assert cfop._F2L_PDBS is not None")
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+
+
+def test_nibble_pdb_exact_near_solved_and_unknown_reads_zero(tmp_path):
+    from cfop import (_SLOT_MOVES, NibblePDB, _build_piece_pdb, _f2l_pdbs,
+                      _piece_coords)
+
+    for need, table in _f2l_pdbs()[0]:
+        assert table.h(_IDENTITY) == 0
+        for mi in _SLOT_MOVES[0]:
+            assert table.h(_MOVES_PY[mi]) <= 1
+
+    # A single corner under U only: 4 slots x 1 twist reachable, rest unknown.
+    pieces = ((True, 0),)
+    path = tmp_path / "tiny.nib"
+    path.write_bytes(_build_piece_pdb(pieces, [0, 1, 2]))
+    table = NibblePDB(path, pieces)
+    assert table.h(_IDENTITY) == 0
+    assert table.h(_MOVES_PY[1]) == 1          # U2
+    idx = _piece_coords(_MOVES_PY[6], pieces)   # L takes the corner off the U layer
+    assert (table._mm[idx >> 1] >> ((idx & 1) * 4)) & 0xF == 0xF
+    assert table.lookup(idx) == 0
+
+
+# ---------------------------------------------------------------------------
+# 9. Color-neutral cross
+# ---------------------------------------------------------------------------
+
+def test_rotations_conjugate_moves_onto_faces():
+    """r^-1 . M . r must be a single move, and the face each cross maps to D."""
+    import cfop
+    for face, (r, r_inv, back) in cfop._ROTATIONS.items():
+        assert _compose(r, r_inv) == _IDENTITY
+        for m in range(18):
+            assert _compose(_compose(r_inv, _MOVES_PY[back[m]]), r) == _MOVES_PY[m]
+        assert back[3] // 3 == cfop._FACE_ORDER.index(face)   # frame D -> face
+    assert cfop._ROTATIONS["D"][2] == list(range(18))
+
+
+def test_color_neutral_cross_picks_solved_face_and_solves():
+    """An L turn breaks every cross except R's: color neutral must take it.
+    Picking is never worse than the fixed D cross on the stages it compares."""
+    import cfop
+    s = _MOVES_PY[6]   # L
+    assert len(solve_stages(s)["cross"]) == 1
+    stages = solve_stages(s, cross_faces=cfop.CROSS_FACES)
+    assert stages["cross"] == []
+    for scrambled in _SCRAMBLES[:6]:
+        plain = solve_stages(scrambled)
+        cn = solve_stages(scrambled, cross_faces=cfop.CROSS_FACES)
+        both = solve_stages(scrambled, cross_faces=cfop.CROSS_FACES,
+                            cross_pick="cross+f2l")
+        assert len(cn["cross"]) <= len(plain["cross"])
+        assert (len(both["cross"]) + len(both["f2l"])
+                <= len(plain["cross"]) + len(plain["f2l"]))
+        sol = solve(scrambled, cross_faces="UD")
+        assert cube_solved(_apply_moves(scrambled, sol))
+        assert cube_solved(_apply_moves(scrambled, sum(both.values(), [])))
+    # one timer sample per stage per solve, however many faces were compared
+    stats = SolveStats()
+    for pick in cfop.CROSS_PICKS:
+        solve(_SCRAMBLES[0], stats=stats, cross_faces=cfop.CROSS_FACES, cross_pick=pick)
+    assert all(len(stats.stage_ms[k]) == 2 for k in SolveStats.STAGES)
+    with pytest.raises(ValueError):
+        solve(_SCRAMBLES[0], cross_faces="X")
+
+
+# ---------------------------------------------------------------------------
+# 10. Move-weighted LL tables + pre-AUF
+# ---------------------------------------------------------------------------
+
+def test_ll_tables_weighted_by_moves_and_pre_auf():
+    """A single algorithm's case is solved in at most its own length, from any
+    AUF; the pre-AUF lookup is never longer than the plain one."""
+    import cfop
+    for name in ("Sune", "T-perm", "Jb-perm"):
+        alg = cfop._seq(cfop._GENERATORS_NOTATION[name])
+        case = _apply_moves(_IDENTITY, cfop._invert_seq(alg))
+        for k in range(4):
+            s = _apply_moves(case, [0] * k)
+            for fn in (cfop._solve_oll, cfop._solve_pll):
+                plain = fn(s, pre_auf=False)
+                best = fn(s)
+                assert len(best) <= len(plain)
+                if fn is cfop._solve_pll:
+                    assert cube_solved(_apply_moves(s, best))
+                    assert len(best) <= len(alg) + 2
+                else:
+                    assert oll_solved(_apply_moves(s, best))
+
+
+# ---------------------------------------------------------------------------
+# 11. Batch API
+# ---------------------------------------------------------------------------
+
+def test_solve_many_matches_solve_in_order():
+    import cfop
+    states = _SCRAMBLES[:6] + [_IDENTITY]
+    assert cfop.solve_many(states) == [solve(s) for s in states]
+    stats = SolveStats()
+    rngs = [random.Random(i) for i in range(len(states))]
+    many = cfop.solve_many(states, workers=2, randomize=True, rngs=rngs, stats=stats)
+    assert many == [solve(s, randomize=True, rng=random.Random(i))
+                    for i, s in enumerate(states)]
+    assert stats.n_solves == len(states)
+    assert all(len(stats.stage_ms[st]) == len(states) for st in SolveStats.STAGES)
+    # the pool (and its loaded tables) is kept for the next call
+    pool = cfop.worker_pool(2)
+    assert cfop.solve_many(states, workers=2) == [solve(s) for s in states]
+    assert cfop.worker_pool(2) is pool
+
+
+def test_solve_diverse_distinct_solutions_first_matches_solve():
+    import cfop
+    stats = SolveStats()
+    for scrambled in _SCRAMBLES[:4]:
+        sols = cfop.solve_diverse(scrambled, 6, stats=stats)
+        assert sols[0] == solve(scrambled)
+        assert 1 < len(sols) <= 6
+        assert len({tuple(s) for s in sols}) == len(sols)
+        for s in sols:
+            assert cube_solved(_apply_moves(scrambled, s))
+    assert stats.n_solves == 4
+    with pytest.raises(ValueError):
+        cfop.solve_diverse(_SCRAMBLES[0], 0)
+
+
+def test_solve_diverse_many_matches_serial():
+    import cfop
+    states = _SCRAMBLES[:3]
+    stats = SolveStats()
+    many = cfop.solve_diverse_many(states, 4, workers=2, stats=stats)
+    assert many == [cfop.solve_diverse(s, 4) for s in states]
+    assert stats.n_solves == 3
+
+
+def test_pool_with_diverse_k_repeats_scrambles():
+    from data import build_cfop_pool
+    pool = build_cfop_pool(400, diverse_k=4, verbose=False)
+    starts = [i for i, t in enumerate(pool["t"].tolist())
+              if i == 0 or t > pool["t"][i - 1].item()]
+    first = pool["cep"][starts[0]].tolist()
+    assert [pool["cep"][i].tolist() for i in starts[:4]].count(first) > 1
+    with pytest.raises(ValueError):
+        build_cfop_pool(10, diverse_k=2, randomize=True, verbose=False)
@@ -0,0 +1,61 @@
+"""Tests for the chat record/replay cache (source/chat_cache.py)."""
+import pytest
+
+from chat_cache import CacheMiss, ChatCache, request_key
+
+
+def _payload(text, **kw):
+    return {"model": "m", "messages": [{"role": "user", "content": text}],
+            "tools": [], "think": False, "options": {"temperature": 0.7}, **kw}
+
+
+def test_record_then_replay(tmp_path):
+    sent = []
+
+    def send(text):
+        sent.append(text)
+        return {"role": "assistant", "content": text.upper()}
+
+    rec = ChatCache(tmp_path / "c", mode="record")
+    assert rec.call(_payload("a"), lambda: send("a"))["content"] == "A"
+    assert rec.call(_payload("a"), lambda: send("a"))["content"] == "A"
+    assert sent == ["a"] and rec.stats()["hits"] == 1
+
+    rep = ChatCache(tmp_path / "c", mode="replay")
+    assert len(rep) == 1
+    assert rep.call(_payload("a"), lambda: send("x"))["content"] == "A"
+    with pytest.raises(CacheMiss):
+        rep.call(_payload("a", think=True), lambda: send("x"))
+    assert sent == ["a"]
+
+    ChatCache(tmp_path / "c", mode="passthrough").call(_payload("a"), lambda: send("a"))
+    assert sent == ["a", "a"]
+    assert request_key({"b": 1, "a": 2}) == request_key({"a": 2, "b": 1})
+
+
+def test_index_rebuilt_and_torn_line_tolerated(tmp_path):
+    c = ChatCache(tmp_path / "c")
+    for t in "abc":
+        c.put(_payload(t), {"content": t})
+    c.idx_path.write_text("")            # lost index
+    with open(c.log_path, "a") as f:
+        f.write('{"key": "trunc')         # interrupted append
+    again = ChatCache(tmp_path / "c")
+    assert [again.get(_payload(t))["content"] for t in "abc"] == list("abc")
+    again.put(_payload("d"), {"content": "d"})
+    assert ChatCache(tmp_path / "c", mode="replay").get(_payload("d")) == {"content": "d"}
+
+
+def test_bad_index_offset_is_a_miss_that_rebuilds(tmp_path):
+    c = ChatCache(tmp_path / "c")
+    for t in "ab":
+        c.put(_payload(t), {"content": t})
+    ka, kb = request_key(_payload("a")), request_key(_payload("b"))
+    offs = {k: int(o) for k, o in (ln.split() for ln in c.idx_path.read_text().splitlines())}
+    # swapped offsets, a pointer into the middle of a record, and garbage
+    c.idx_path.write_text(f"{ka} {offs[kb]}\n{kb} 3\nnot an-offset\n")
+    again = ChatCache(tmp_path / "c", mode="replay")
+    assert again.get(_payload("a")) == {"content": "a"}
+    assert again.get(_payload("b")) == {"content": "b"}
+    assert {int(ln.split()[1]) for ln in c.idx_path.read_text().splitlines()} == \
+        set(offs.values())
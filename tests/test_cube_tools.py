@@ -98,3 +98,129 @@ def test_apply_macro_matches_raw_moves(tmp_path):
     b.apply("R U2 F'")
     assert a.observe()["pieces_solved"] == b.observe()["pieces_solved"]
     assert a.observe()["net"] == b.observe()["net"]
+
+
+def test_value_models_load_once_per_checkpoint(tiny_ckpt, tmp_path):
+    from pathlib import Path
+    path = Path(tiny_ckpt)
+    reg = ct.ModelRegistry()
+    [rep] = reg.preload(str(path))
+    assert rep["hits"] == 1 and rep["param_mb"] > 0
+    old = ct.VALUE_MODELS
+    ct.VALUE_MODELS = reg
+    try:
+        sessions = [CubeSession(seed=i, value_ckpt=str(path)) for i in range(3)]
+        for s in sessions:
+            s.scramble(2)
+            assert len(s.rank_moves()["ranked_moves"]) == 18
+    finally:
+        ct.VALUE_MODELS = old
+    assert len({id(s._value_model) for s in sessions}) == 1
+    assert reg.report()[0]["hits"] == 4
+    # a copy at another path is a separate entry, but the same hash
+    copy = tmp_path / "copy.npz"
+    copy.write_bytes(path.read_bytes())
+    (tmp_path / "copy.json").write_bytes(path.with_suffix(".json").read_bytes())
+    reg.get(str(copy))
+    hashes = [r["hash"] for r in reg.report()]
+    assert len(hashes) == 2 and hashes[0] == hashes[1]
+
+
+def test_integer_kernel_matches_mlx_state():
+    from vis_util import state_to_net
+    rng = random.Random(5)
+    s = CubeSession(seed=5)
+    ref = ct.State()
+    for _ in range(60):
+        i = rng.randrange(18)
+        s.apply(NOTATION[i], render=False)
+        ref = ref @ ct._MOVE_STATES[i]
+        assert s.state == ref
+        assert s.solved_counts() == ct._solved_counts(ref)
+    assert ct._net(s.cube) == state_to_net(ref).tolist()
+    assert "net" not in s.observe(render=False)
+    assert s.observe()["net"] == ct.readable_observation(ref)
+    pieces = s.rank_moves_pieces()["ranked_moves"]
+    for r in pieces:
+        child = ref @ ct._MOVE_STATES[ct.parse_moves(r["move"])[0]]
+        assert r["pieces_solved"] == ct._solved_counts(child)["pieces_solved"]
+
+
+def test_rank_moves_counts_match_full_rescan(tiny_ckpt):
+    s = CubeSession(seed=2, value_ckpt=tiny_ckpt)
+    s.apply("R U F' L2", render=False)
+    for r in s.rank_moves()["ranked_moves"]:
+        child = ct._apply_indices(s.cube, parse_moves(r["move"]))
+        c = ct._solved_counts(child)
+        assert (r["pieces_solved"], r["would_solve"]) == (c["pieces_solved"],
+                                                          c["is_solved"])
+
+
+def test_rank_moves_many_matches_rank_moves(tiny_ckpt):
+    sessions = [CubeSession(seed=k, value_ckpt=tiny_ckpt) for k in range(3)]
+    for k, s in enumerate(sessions):
+        s.scramble(k + 2, render=False)
+    assert CubeSession.rank_moves_many(sessions) == [s.rank_moves() for s in sessions]
+    assert CubeSession.rank_moves_many([]) == []
+    with pytest.raises(ValueError):
+        CubeSession.rank_moves_many([sessions[0], CubeSession(value_ckpt="other")])
+
+
+def test_lookahead_finds_solving_sequences_and_ranks_leaves(tiny_ckpt):
+    s = CubeSession(seed=1, value_ckpt=tiny_ckpt)
+    s.apply("R U", render=False)
+    out = s.lookahead(depth=2, top=4)
+    assert out["sequences"][0] == {"moves": "U' R'", "estimated_moves_to_solve": 0.0,
+                                   "pieces_solved": 20, "would_solve": True}
+    # canonical pairs: 18 x 15, minus the 27 commuting ones in reverse order
+    assert out["leaves_scored"] == 18 * 15 - 27 - 1
+    ests = [r["estimated_moves_to_solve"] for r in out["sequences"][1:]]
+    assert ests == sorted(ests)
+    leaf = ct._apply_indices(s.cube, parse_moves(out["sequences"][1]["moves"]))
+    assert round(s._value_batch([leaf])[0], 2) == ests[0]
+    assert len(s.lookahead(depth=3, top=7)["sequences"]) == 7
+    assert "error" in s.lookahead(depth=4)
+
+
+def test_simulate_many_matches_simulate(tiny_ckpt):
+    s = CubeSession(seed=2, value_ckpt=tiny_ckpt)
+    s.scramble(3, render=False)
+    undo = invert_moves(' '.join(NOTATION[i] for i in s.scramble_moves))
+    cands = ["R U R' U'", "F2", undo, "R X", ""]
+    out = s.simulate_many(cands, values=True)
+    rows = out["results"]
+    assert len(rows) == 5 and "error" in rows[3]
+    for cand, row in zip(cands, rows):
+        if "error" in row:
+            continue
+        ref = s.simulate(cand)
+        assert row["delta_pieces_solved"] == ref["delta_pieces_solved"]
+        assert row["would_solve"] == ref["would_solve"]
+        assert "estimated_moves_to_solve" in row
+    assert rows[2]["would_solve"] and not out["committed"]
+    assert s.solved_counts()["pieces_solved"] == out["pieces_solved_before"]
+    assert "estimated_moves_to_solve" not in s.simulate_many(["R"])["results"][0]
+
+
+def test_compact_encodings_agree_with_the_net():
+    s = CubeSession(seed=5)
+    s.scramble(6)
+    fl = ct.facelet_string(s.cube)
+    net = ct._net(s.cube)
+    assert len(fl) == 54 and fl == ''.join(
+        ct.ITOA[net[f][r][c]] for f in (ct.U, ct.R, ct.F, ct.D, ct.L, ct.B)
+        for r in range(3) for c in range(3))
+    assert ct.facelet_string(CubeSession().cube) == ''.join(c * 9 for c in "URFDLB")
+
+    # pieces lists exactly the unsolved slots; diff only the changed ones
+    n_wrong = len(ct.piece_list(s.cube).split()) - 1
+    assert n_wrong == 20 - s.observe()["pieces_solved"]
+    d = CubeSession(seed=5, encoding="diff")
+    d.scramble(6, render=False)
+    assert d.observe()["net"] == ct.piece_list(s.cube)    # no baseline yet
+    assert d.observe()["net"] == "no change"
+    assert len(d.simulate("U")["net_after"].split()) == 1 + 8
+    assert d.observe()["net"] == "no change"              # simulate commits nothing
+    assert len(d.apply("U2")["net"].split()) == 1 + 8
+    with pytest.raises(ValueError):
+        CubeSession(encoding="json")
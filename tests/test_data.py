@@ -0,0 +1,50 @@
+"""Tests for the scramble samplers in data.py."""
+import random
+
+import mlx.core as mx
+
+from data import _IDENTITY, _MOVES_PY, _compose, generate_walk_states
+
+
+# ---------------------------------------------------------------------------
+# uniform random-state sampler
+# ---------------------------------------------------------------------------
+
+def test_uniform_states_are_valid_group_elements():
+    """Permutations are complete, parities match, twist/flip sums vanish."""
+    from data import _parity, uniform_state_arrays
+    cp, ct, ep, ef = uniform_state_arrays(256, seed=0)
+    assert cp.shape == (256, 8) and ep.shape == (256, 12)
+    assert mx.all(mx.sort(cp, axis=1) == mx.arange(8)).item()
+    assert mx.all(mx.sort(ep, axis=1) == mx.arange(12)).item()
+    assert mx.all(_parity(cp) == _parity(ep)).item()
+    assert mx.all(mx.sum(ct, axis=1) % 3 == 0).item()
+    assert mx.all(mx.sum(ef, axis=1) % 2 == 0).item()
+
+
+def test_uniform_states_seeded_and_solvable():
+    from cfop import _apply_moves, cube_solved, solve
+    from data import generate_uniform_states
+    a = generate_uniform_states(8, seed=3)
+    assert a == generate_uniform_states(8, seed=3)
+    assert a != generate_uniform_states(8, seed=4)
+    for s in a[:3]:
+        assert cube_solved(_apply_moves(s, solve(s)))
+
+
+# ---------------------------------------------------------------------------
+# random-walk sampler
+# ---------------------------------------------------------------------------
+
+def test_walk_states_follow_the_rng():
+    rng = random.Random(5)
+    moves = [rng.randrange(18) for _ in range(2 * 4)]
+    expected = []
+    for k in range(2):
+        state = _IDENTITY
+        for m in moves[4 * k:4 * k + 4]:
+            state = _compose(state, _MOVES_PY[m])
+        expected.append(state)
+    assert generate_walk_states(2, 4, random.Random(5)) == expected
+    random.seed(5)
+    assert generate_walk_states(2, 4) == expected
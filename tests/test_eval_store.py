@@ -0,0 +1,49 @@
+"""Tests for the persistent scramble / result store (source/eval_store.py)."""
+import random
+import shutil
+
+from data import generate_walk_states
+from eval_store import EvalStore
+
+
+def test_scramble_suite_round_trip(tmp_path):
+    store = EvalStore(tmp_path)
+    calls = []
+
+    def make():
+        calls.append(1)
+        return generate_walk_states(5, 7, random.Random(3))
+
+    first = store.scramble_suite("walk", 7, 3, 5, make)
+    again = EvalStore(tmp_path).scramble_suite("walk", 7, 3, 5, make)
+    assert len(calls) == 1
+    assert [tuple(map(list, s)) for s in again] == [tuple(map(list, s)) for s in first]
+
+
+def test_results_keyed_by_content_hash(tmp_path):
+    ckpt = tmp_path / "a.npz"
+    ckpt.write_bytes(b"weights-a")
+    cfg = {"n": 10, "scramble_depth": 4, "search": "greedy"}
+    store = EvalStore(tmp_path / "store")
+    assert store.get_result(str(ckpt), cfg) is None
+    store.put_result(str(ckpt), cfg, {"n_solved": 3})
+
+    # a copy with identical content hits, a different config does not
+    copy = tmp_path / "b.npz"
+    shutil.copy(ckpt, copy)
+    reopened = EvalStore(tmp_path / "store")
+    assert reopened.get_result(str(copy), cfg) == {"n_solved": 3}
+    assert reopened.get_result(str(ckpt), {**cfg, "n": 11}) is None
+
+    # retraining into the same path invalidates the entry
+    ckpt.write_bytes(b"weights-a, retrained")
+    assert EvalStore(tmp_path / "store").get_result(str(ckpt), cfg) is None
+    assert [r["ckpt"] for r in reopened.records()] == [str(ckpt)]
+
+
+def test_torn_line_is_ignored(tmp_path):
+    store = EvalStore(tmp_path)
+    store.put_result(None, {"n": 1}, {"n_solved": 1})
+    with open(store.results_path, "a") as f:
+        f.write('{"key": "trunc')
+    assert EvalStore(tmp_path).get_result(None, {"n": 1}) == {"n_solved": 1}
@@ -0,0 +1,64 @@
+"""Tests for the Schreier–Sims toolkit (source/group.py)."""
+import random
+
+import pytest
+
+import cfop
+from data import _IDENTITY, _MOVES_PY, _compose
+from group import PermGroup, perm_from_state, state_from_perm
+
+_CUBE_ORDER = 43252003274489856000
+
+
+def _random_state(rng, length=30):
+    s = _IDENTITY
+    for _ in range(length):
+        s = _compose(s, _MOVES_PY[rng.randrange(18)])
+    return s
+
+
+def test_perm_from_state_is_a_homomorphism():
+    rng = random.Random(0)
+    for _ in range(20):
+        a, b = _random_state(rng), _random_state(rng)
+        pa, pb = perm_from_state(a), perm_from_state(b)
+        assert perm_from_state(_compose(a, b)) == tuple(pa[x] for x in pb)
+        assert state_from_perm(pa) == a
+
+
+def test_group_orders():
+    assert PermGroup.from_states(_MOVES_PY[0::3]).order() == _CUBE_ORDER
+    g1 = PermGroup.from_states([_MOVES_PY[m] for m in (6, 9, 1, 4, 13, 16)])
+    assert g1.order() == 8 * 7 * 6 * 5 * 4 * 3 * 2 * 40320 * 24 // 2
+    assert PermGroup.from_states([_MOVES_PY[0]]).order() == 4
+    assert PermGroup([]).order() == 1
+
+
+def test_ll_generators_span_the_ll_group():
+    gens = cfop._build_generators()
+    ll = PermGroup.from_states(eff for eff, _ in gens)
+    assert ll.order() == cfop._LL_ORDER == len(cfop._LL_FULL)
+    assert [size for _, _, size in ll.stabilizer_chain()][-1] == 1
+    for key in list(cfop._LL_FULL)[:200]:
+        assert ll.contains_state(cfop._ll_state_from_key(key))
+    assert not ll.contains_state(_MOVES_PY[3])
+    # U + T-perm alone reach just a sliver of the LL
+    perms = PermGroup.from_states(cfop._apply_moves(_IDENTITY, cfop._seq(a))
+                                  for a in (cfop._GENERATORS_NOTATION["U"],
+                                            cfop._GENERATORS_NOTATION["T-perm"]))
+    assert perms.order() == 96
+
+
+def test_membership_and_subgroups():
+    rng = random.Random(1)
+    cube = PermGroup.from_states(_MOVES_PY[0::3])
+    half = PermGroup.from_states([_MOVES_PY[m] for m in (1, 4, 7, 10, 13, 16)])
+    assert half.is_subgroup_of(cube) and not cube.is_subgroup_of(half)
+    assert cube.contains_state(_random_state(rng))
+    twisted = (list(range(8)), [1] + [0] * 7, list(range(12)), [0] * 12)
+    assert not cube.contains_state(twisted)
+    assert perm_from_state(_IDENTITY) in half
+    assert half.order() == 663552
+    assert half.orbit(0) == {0, 6, 15, 21}   # a corner tetrad, never twisted
+    with pytest.raises(ValueError):
+        PermGroup([(0, 0, 1)], n=3)
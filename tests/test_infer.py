@@ -0,0 +1,145 @@
+"""Tests for the evaluation harness (source/infer.py)."""
+import json
+
+import pytest
+
+import infer
+
+
+def test_parse_search_spec():
+    assert infer.parse_search_spec("greedy") == ("greedy", 0)
+    assert infer.parse_search_spec("beam:4") == ("beam", 4)
+    assert infer.parse_search_spec("value-astar") == ("value-astar", 8)
+    with pytest.raises(ValueError):
+        infer.parse_search_spec("beam")
+    with pytest.raises(ValueError):
+        infer.parse_search_spec("dfs:3")
+
+
+def test_sweep_matches_evaluate(tiny_ckpt, tmp_path):
+    """Chunked sweep cells aggregate to exactly the serial evaluate() result."""
+    jsonl = tmp_path / "sweep.jsonl"
+    rows = infer.sweep([tiny_ckpt], [2, 3], ["greedy", "beam:2"], n=6,
+                       max_steps=6, workers=1, chunk_size=4,
+                       jsonl_path=str(jsonl), verbose=False)
+    assert len(rows) == 4
+    lines = [json.loads(line) for line in jsonl.read_text().splitlines()]
+    assert len(lines) == 4
+    for row in rows:
+        ref = infer.evaluate(tiny_ckpt, n=6, scramble_depth=row["scramble_depth"],
+                             max_steps=6, beam_width=row["beam_width"],
+                             search=row["search"])
+        for key in ("n_solved", "n", "search", "beam_width", "scramble_depth"):
+            assert row[key] == ref[key]
+
+
+def test_sweep_process_pool_with_baseline(tiny_ckpt):
+    rows = infer.sweep([tiny_ckpt], [1], ["greedy"], n=4, max_steps=4,
+                       baseline=True, workers=2, chunk_size=2, verbose=False)
+    assert [r["search"] for r in rows] == ["greedy", infer.CFOP_SEARCH]
+    assert rows[1]["n_solved"] == 4
+
+
+def test_sweep_store_skips_cached_cells(tiny_ckpt, tmp_path):
+    store_dir = str(tmp_path / "store")
+    kw = dict(n=4, max_steps=4, baseline=True, workers=1, chunk_size=2,
+              verbose=False, store_dir=store_dir)
+    first = infer.sweep([tiny_ckpt], [2], ["greedy"], **kw)
+    assert not any(r["cached"] for r in first)
+    again = infer.sweep([tiny_ckpt], [2], ["greedy"], **kw)
+    assert all(r["cached"] for r in again)
+    for a, b in zip(first, again):
+        assert a["n_solved"] == b["n_solved"]
+    # evaluate() with the same settings is served by the sweep's entry
+    store = infer.EvalStore(store_dir)
+    ref = infer.evaluate(tiny_ckpt, n=4, scramble_depth=2, max_steps=4,
+                         search="greedy", store=store)
+    assert ref == store.get_result(tiny_ckpt, infer._eval_config(
+        4, 2, 4, 0, "greedy", 0, "countdown", 2, "walk", {}))
+    assert len(infer.report_rows(store)) == 2
+
+
+def test_wilson_interval():
+    lo, hi = infer.wilson_interval(0, 10)
+    assert lo == 0.0 and 0.2 < hi < 0.35
+    lo, hi = infer.wilson_interval(93, 100)
+    assert lo < 0.93 < hi and hi <= 1.0
+    # more samples -> narrower interval
+    assert (infer.wilson_interval(930, 1000)[1] - infer.wilson_interval(930, 1000)[0]
+            < hi - lo)
+
+
+def test_adaptive_stops_early_and_matches_prefix(tiny_ckpt):
+    """Depth-1 cubes with a 1-move budget are decided fast; an early stop
+    must equal a plain run on the same number of scrambles."""
+    res = infer.evaluate(tiny_ckpt, n=400, scramble_depth=1, max_steps=1,
+                         adaptive=True, adaptive_batch=20, ci_width=0.5)
+    assert res["stopped_early"] and res["n"] < 400
+    assert res["ci_high"] - res["ci_low"] <= 0.5
+    plain = infer.evaluate(tiny_ckpt, n=res["n"], scramble_depth=1, max_steps=1)
+    assert plain["n_solved"] == res["n_solved"]
+
+
+def test_compare_adaptive_same_ckpt_not_separated(tiny_ckpt):
+    a, b = infer.compare_adaptive(tiny_ckpt, tiny_ckpt, n=60, scramble_depth=1,
+                                  max_steps=1, adaptive_batch=20, ci_width=0.3)
+    assert not a["separated"]
+    assert a["n_solved"] == b["n_solved"] and a["n"] == b["n"]
+
+
+def test_cfop_baseline_store_keyed_by_solver_version(tmp_path, monkeypatch):
+    import cfop
+    store = infer.EvalStore(tmp_path / "store")
+    first = infer.cfop_baseline(3, 4, seed=1, store=store)
+    calls = []
+    real = infer._cfop_solve_chunk
+    monkeypatch.setattr(infer, "_cfop_solve_chunk",
+                        lambda *a, **kw: calls.append(1) or real(*a, **kw))
+    assert infer.cfop_baseline(3, 4, seed=1, store=store) == first
+    assert calls == []
+    monkeypatch.setattr(cfop, "_CACHE_VERSION", cfop._CACHE_VERSION + 1)
+    infer.cfop_baseline(3, 4, seed=1, store=store)
+    assert calls == [1]
+
+
+def test_adaptive_empty_suite(tiny_ckpt):
+    res = infer.evaluate(tiny_ckpt, n=0, scramble_depth=1, adaptive=True)
+    assert res["n"] == 0 and not res["stopped_early"]
+    a, b = infer.compare_adaptive(tiny_ckpt, tiny_ckpt, n=0, scramble_depth=1)
+    assert a["n"] == b["n"] == 0 and not a["separated"]
+
+
+def test_optimal_without_tables_fails_before_evaluating(tiny_ckpt, monkeypatch, capsys):
+    import optimal
+
+    def missing(*a, **kw):
+        raise FileNotFoundError("missing pattern databases ['corners']")
+
+    monkeypatch.setattr(optimal, "load_pdbs", missing)
+    monkeypatch.setattr(infer, "evaluate", lambda *a, **kw: pytest.fail("evaluated"))
+    monkeypatch.setattr("sys.argv", ["infer.py", "--ckpt", tiny_ckpt, "--optimal"])
+    with pytest.raises(SystemExit):
+        infer.main()
+    assert "missing pattern databases" in capsys.readouterr().err
+
+
+def test_adaptive_flags_rejected_where_ignored(tiny_ckpt, monkeypatch, capsys):
+    monkeypatch.setattr(infer, "sweep", lambda *a, **kw: pytest.fail("swept"))
+    for argv in (["--adaptive", "--sweep-depths", "2,3"],
+                 ["--reference", "0.1,0.2"],
+                 ["--adaptive", "--reference", "0.1"]):
+        monkeypatch.setattr("sys.argv", ["infer.py", "--ckpt", tiny_ckpt] + argv)
+        with pytest.raises(SystemExit):
+            infer.main()
+    seen = {}
+
+    def fake_evaluate(*a, **kw):
+        seen.update(kw)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(infer, "evaluate", fake_evaluate)
+    monkeypatch.setattr("sys.argv", ["infer.py", "--ckpt", tiny_ckpt, "--adaptive",
+                                     "--reference", "0.2,0.4"])
+    with pytest.raises(KeyboardInterrupt):
+        infer.main()
+    assert seen["reference"] == (0.2, 0.4)
@@ -0,0 +1,45 @@
+"""Tests for the two-phase solver (source/kociemba.py)."""
+import random
+
+import pytest
+
+import kociemba
+from cfop import cube_solved
+from data import (_IDENTITY, _MOVES_PY, _compose, build_cfop_pool,
+                  generate_uniform_states, generate_walk_states)
+
+
+def _apply(state, moves):
+    for m in moves:
+        state = _compose(state, _MOVES_PY[m])
+    return state
+
+
+def test_g1_moves_keep_phase1_solved():
+    for m in kociemba._G1_MOVES:
+        assert kociemba.phase1_coords(_MOVES_PY[m]) == kociemba._SOLVED1
+    for m in set(range(18)) - set(kociemba._G1_MOVES):
+        assert kociemba.phase1_coords(_MOVES_PY[m]) != kociemba._SOLVED1
+
+
+def test_solve_identity_and_single_move():
+    assert kociemba.solve(_IDENTITY) == []
+    for m in (0, 7, 14):
+        assert len(kociemba.solve(_MOVES_PY[m])) == 1
+
+
+@pytest.mark.parametrize("scramble", (
+    generate_walk_states(3, 25, random.Random(7)) + generate_uniform_states(2, seed=3)))
+def test_solves_short(scramble):
+    sol = kociemba.solve(scramble, max_length=24, timeout=5.0)
+    assert cube_solved(_apply(scramble, sol))
+    assert len(sol) <= 30
+
+
+def test_pool_with_kociemba_teacher():
+    pool = build_cfop_pool(40, teacher="kociemba", verbose=False)
+    assert pool["t"].shape == (40,)
+    # one trajectory is ~21 moves, far shorter than a CFOP one
+    assert int(pool["t"].max().item()) <= 30
+    with pytest.raises(ValueError):
+        build_cfop_pool(1, teacher="kociemba", randomize=True, verbose=False)
@@ -0,0 +1,235 @@
+"""Tests for the LLM agent harness (source/llm_agent.py) against a stand-in
+/api/chat server."""
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import llm_agent
+from cube_tools import CubeSession
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """Plays the model: asks rank_moves, then applies a move marked <-SOLVES."""
+
+    protocol_version = "HTTP/1.1"   # keep-alive
+    stats = {"connections": 0, "requests": 0, "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            self.stats["connections"] += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        assert self.path == "/api/chat"
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"],
+                                              self.stats["in_flight"])
+        time.sleep(0.02)
+        last = req["messages"][-1]
+        hit = re.search(r"^\s*(\S+): .*<-SOLVES", last["content"], re.M)
+        if last["role"] == "tool" and hit:
+            call = {"name": "apply", "arguments": {"moves": hit.group(1)}}
+        else:
+            call = {"name": "rank_moves", "arguments": {}}
+        body = json.dumps({"message": {"role": "assistant", "content": "",
+                                       "tool_calls": [{"function": call}]}}).encode()
+        with self.lock:
+            self.stats["in_flight"] -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    for k in _StandIn.stats:
+        _StandIn.stats[k] = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+
+
+def _sessions(n, **kw):
+    out = []
+    for ep in range(n):
+        s = CubeSession(seed=ep, **kw)
+        s.scramble(1, render=False)
+        out.append(s)
+    return out
+
+
+def test_async_runner_matches_sequential(server):
+    seq = [llm_agent.run_episode(s, "stand-in", server, max_turns=4, mode="pieces")
+           for s in _sessions(6)]
+    assert _StandIn.stats["connections"] == 12   # urllib: one per request
+    _StandIn.stats["connections"] = 0
+
+    conc = asyncio.run(llm_agent.run_episodes_async(
+        _sessions(6), "stand-in", server, max_turns=4, mode="pieces", concurrency=3))
+    assert all(r["solved"] and r["turns"] == 2 for r in conc)
+    assert _StandIn.stats["connections"] <= 3
+    assert 1 < _StandIn.stats["max_in_flight"] <= 3
+    drop = ("secs", "chat_secs")
+    assert [{k: v for k, v in r.items() if k not in drop} for r in conc] == \
+        [{k: v for k, v in r.items() if k not in drop} for r in seq]
+    sm = llm_agent.summarize(conc)
+    assert sm["solved"] == 6 and sm["avg_turns"] == 2
+
+
+def test_async_runner_not_capped_by_default_executor(server):
+    from concurrent.futures import ThreadPoolExecutor
+
+    async def run():
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(1))
+        return await llm_agent.run_episodes_async(
+            _sessions(4), "stand-in", server, max_turns=4, mode="pieces",
+            concurrency=4)
+
+    assert all(r["solved"] for r in asyncio.run(run()))
+    assert _StandIn.stats["max_in_flight"] > 1
+
+
+def test_chat_errors_end_the_episode():
+    pool = llm_agent.ChatPool("127.0.0.1:9", size=1, timeout=2)   # discard port
+    s = _sessions(1)[0]
+    res = llm_agent.run_episode(s, "stand-in", "127.0.0.1:9", max_turns=3,
+                                mode="pieces", pool=pool)
+    assert not res["solved"] and "error" in res
+
+
+def test_replay_needs_no_server(server, tmp_path):
+    from chat_cache import ChatCache
+    rec = ChatCache(tmp_path / "chat", mode="record")
+    live = [llm_agent.run_episode(s, "stand-in", server, max_turns=4,
+                                  mode="pieces", cache=rec) for s in _sessions(3)]
+    assert _StandIn.stats["requests"] == 6
+
+    rep = ChatCache(tmp_path / "chat", mode="replay")
+    replayed = asyncio.run(llm_agent.run_episodes_async(
+        _sessions(3), "stand-in", "127.0.0.1:9", max_turns=4, mode="pieces",
+        concurrency=2, cache=rep))
+    assert rep.stats()["hits"] == 6 and rep.stats()["misses"] == 0
+    assert _StandIn.stats["requests"] == 6
+    drop = ("secs", "chat_secs")
+    assert [{k: v for k, v in r.items() if k not in drop} for r in replayed] == \
+        [{k: v for k, v in r.items() if k not in drop} for r in live]
+
+
+def _grow(session, compactor, messages, name, args):
+    result = llm_agent.dispatch(session, name, args, mode="pieces")
+    messages.append({"role": "assistant", "content": "",
+                     "tool_calls": [{"function": {"name": name, "arguments": args}}]})
+    compactor.add(len(messages), llm_agent._digest(name, args, result))
+    messages.append({"role": "tool", "tool_name": name,
+                     "content": llm_agent._fmt_obs(dict(result))})
+
+
+def test_compaction_keeps_prefix_stable_and_budget():
+    session = CubeSession(seed=0)
+    obs = session.scramble(3)
+    messages = [{"role": "system", "content": "sys"},
+                {"role": "user", "content": llm_agent._fmt_obs(dict(obs))}]
+    comp = llm_agent.ContextCompactor(budget=600)
+    comp.add(1, ("start", True))
+    views = []
+    for k in range(30):
+        _grow(session, comp, messages, *(("apply", {"moves": "R"}) if k % 2
+                                         else ("rank_moves", {})))
+        views.append(comp.view(messages))
+        assert views[-1][-1] is messages[-1]      # current turn verbatim
+
+    for v in views:
+        assert v[0]["content"] == "sys"
+        assert llm_agent._approx_tokens(v) <= 600
+    latest_apply = max(i for i, m in enumerate(messages)
+                       if m.get("tool_name") == "apply")
+    assert messages[latest_apply] in views[-1]    # latest observation verbatim
+    assert views[-1][1]["content"] == "start"
+    assert any(m["content"].startswith("apply R -> pieces_solved=")
+               for m in views[-1])
+    # consecutive requests share everything before the previous turn (its
+    # assistant message and tool result, plus the superseded observation),
+    # except on the rare turns where old turns are cut
+    extends = sum(v[:len(u) - 3] == u[:len(u) - 3] for u, v in zip(views, views[1:]))
+    assert extends >= len(views) - 4
+    assert llm_agent._approx_tokens(messages) > 3 * 600
+
+
+def test_speculation_serves_rank_moves(server, tiny_ckpt):
+    kw = dict(max_turns=4, mode="intuition")
+    plain = [llm_agent.run_episode(s, "stand-in", server, **kw)
+             for s in _sessions(3, value_ckpt=tiny_ckpt)]
+    spec = asyncio.run(llm_agent.run_episodes_async(
+        _sessions(3, value_ckpt=tiny_ckpt), "stand-in", server, concurrency=3,
+        speculate=("rank_moves", "lookahead"), **kw))
+    assert all(r["spec_hits"] == 1 and r["spec_misses"] == 0 for r in spec)
+    drop = ("secs", "chat_secs", "spec_hits", "spec_misses")
+    assert [{k: v for k, v in r.items() if k not in drop} for r in spec] == \
+        [{k: v for k, v in r.items() if k not in drop} for r in plain]
+    assert llm_agent.summarize(spec)["spec_hit_rate"] == "1.00"
+
+    # a speculated result is the one dispatch would give in that state
+    s = _sessions(1, value_ckpt=tiny_ckpt)[0]
+    sp = llm_agent.Speculator(s, "lookahead", ("rank_moves", "lookahead"))
+    sp.start()
+    assert sp.lookup("lookahead", {"depth": 2}) == \
+        llm_agent.dispatch(s, "lookahead", {"depth": 2})
+    assert sp.lookup("lookahead", {"depth": 3}) is None
+    s.apply("R")
+    assert sp.lookup("rank_moves", {}) is None
+    sp.start()
+    assert sp.lookup("rank_moves", {}) == llm_agent.dispatch(s, "rank_moves", {})
+    assert (sp.hits, sp.misses) == (2, 2)
+    assert len(sp._jobs) == 2            # the pre-R jobs were dropped
+    sp.close()
+
+
+def test_encodings_shrink_observations(server):
+    res = {}
+    for enc in ("net", "facelets", "pieces", "diff"):
+        s = CubeSession(seed=0, encoding=enc)
+        s.scramble(1, render=False)
+        res[enc] = llm_agent.run_episode(s, "stand-in", server, max_turns=4,
+                                         mode="pieces")
+        assert res[enc]["solved"] and res[enc]["encoding"] == enc
+    assert res["net"]["obs_tokens"] > 3 * max(res[e]["obs_tokens"]
+                                              for e in ("facelets", "pieces", "diff"))
+    assert "54-letter" in llm_agent.prompt_for_mode("blind", "facelets")
+    assert llm_agent.prompt_for_mode("blind") == llm_agent.BLIND_PROMPT
+
+
+def test_compaction_rejects_diff_encoding():
+    s = CubeSession(seed=0, encoding="diff")
+    s.scramble(1, render=False)
+    with pytest.raises(ValueError):
+        llm_agent.run_episode(s, "stand-in", "127.0.0.1:9", mode="pieces",
+                              context_budget=1000)
+
+
+def test_simulate_many_is_opt_in():
+    def names(tools):
+        return [t["function"]["name"] for t in tools]
+
+    for mode in ("intuition", "blind", "memory", "pieces", "lookahead"):
+        assert "simulate_many" not in names(llm_agent.tools_for_mode(mode))
+        assert "simulate_many" not in llm_agent.prompt_for_mode(mode)
+        extra = llm_agent.tools_for_mode(mode, simulate_many=True)
+        assert names(extra)[-1] == "simulate_many"
+        props = extra[-1]["function"]["parameters"]["properties"]
+        assert ("values" in props) == (mode not in ("blind", "pieces"))
+    assert "values" in llm_agent.SIMULATE_MANY_TOOLS[0]["function"]["parameters"]["properties"]
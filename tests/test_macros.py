@@ -0,0 +1,37 @@
+"""Tests for the macro discovery engine (source/macros.py)."""
+import pytest
+
+import macros
+from cube_tools import CubeSession
+
+
+@pytest.fixture(scope="module")
+def index():
+    return macros.build_index(max_a=3, max_b=1, max_c=1)
+
+
+def test_entries_match_their_moves(index):
+    assert len(index) > 1000
+    for e in index.entries[::97]:
+        eff = macros.effect_of(e["moves"])
+        assert {k: e[k] for k in eff} == eff
+        assert len(e["corners"]) + len(e["edges"]) <= 6
+
+
+def test_find_is_shortest_and_exact(index):
+    hits = index.find(edges=(0, 2, 3), edge_cycles=(3,), flipped=0, limit=5)
+    assert hits and hits[0]["edges"] == [0, 2, 3] and not hits[0]["corners"]
+    assert [h["len"] for h in hits] == sorted(h["len"] for h in hits)
+    s = CubeSession()
+    s.apply(hits[0]["moves"])
+    assert s.observe()["pieces_solved"] == 17
+    assert index.find(corners=(0, 1, 2), edges=tuple(range(12))) == []
+
+
+def test_save_load_roundtrip(index, tmp_path):
+    path = tmp_path / "macros.json"
+    index.save(path)
+    loaded = macros.MacroIndex.load(path)
+    assert len(loaded) == len(index)
+    q = dict(corners=(1, 2, 3), corner_cycles=(3,))
+    assert loaded.find(**q) == index.find(**q)
@@ -0,0 +1,74 @@
+"""Tests for the Korf-style optimal solver (source/optimal.py).
+
+The real Korf tables take hours to build, so these use small patterns
+(three corners / three edges) that build in about a second.
+"""
+import random
+
+import pytest
+
+import optimal
+from cfop import cube_solved
+from data import _IDENTITY, _MOVES_PY, _compose, generate_walk_states
+
+C3 = optimal.PiecePattern("c3", "corner", (0, 1, 2))
+E3 = optimal.PiecePattern("e3", "edge", (4, 5, 6))
+
+
+def _apply(state, moves):
+    for m in moves:
+        state = _compose(state, _MOVES_PY[m])
+    return state
+
+
+@pytest.fixture(scope="module")
+def small_pdbs(tmp_path_factory):
+    root = tmp_path_factory.mktemp("pdb")
+    return [optimal.PatternDB(p, optimal.build_pdb(p, root / f"{p.name}.nib",
+                                                    verbose=False))
+            for p in (C3, E3)]
+
+
+def test_encode_decode_roundtrip():
+    rng = random.Random(0)
+    full = optimal.KORF_PATTERNS["corners"]
+    for pattern in (C3, E3, full):
+        for idx in rng.sample(range(pattern.size), 200):
+            assert pattern.encode(*pattern.decode(idx)) == idx
+    # neighbours agree with composing the move on a real state
+    for s in generate_walk_states(5, 6, rng):
+        for m in range(18):
+            assert E3.neighbours(E3.index(s))[m] == E3.index(_compose(s, _MOVES_PY[m]))
+
+
+def test_parallel_build_matches_serial(tmp_path, small_pdbs):
+    par = optimal.build_pdb(E3, tmp_path / "e3.nib", workers=2,
+                            chunk=1 << 12, verbose=False)
+    assert par.read_bytes() == small_pdbs[1].path.read_bytes()
+    assert small_pdbs[1].h(_IDENTITY) == 0
+    assert {small_pdbs[1].h(m) for m in _MOVES_PY} == {0, 1}
+
+
+def test_optimal_matches_plain_iddfs(small_pdbs):
+    for s in generate_walk_states(6, 4, random.Random(3)):
+        moves, nodes = optimal.solve_optimal(s, small_pdbs)
+        plain, plain_nodes = optimal.solve_optimal(s, [])
+        assert cube_solved(_apply(s, moves))
+        assert len(moves) == len(plain)
+        assert nodes <= plain_nodes
+
+
+def test_node_budget_and_gap(small_pdbs):
+    s = _apply(_IDENTITY, [0, 3, 4, 7, 12, 16, 1])
+    assert optimal.solve_optimal(s, small_pdbs, node_budget=100) == (None, 101)
+    states = [_MOVES_PY[0], _apply(_IDENTITY, [0, 3]), s]
+    gap = optimal.optimality_gap(states, [True, True, False], [1, 4, 0],
+                                 pdbs=small_pdbs)
+    assert gap["n_known"] == 2 and gap["n_unknown"] == 0
+    assert gap["avg_optimal"] == 1.5 and gap["max_gap"] == 2
+    assert gap["frac_optimal"] == 0.5
+
+
+def test_load_pdbs_missing(tmp_path):
+    with pytest.raises(FileNotFoundError, match="optimal.py build"):
+        optimal.load_pdbs(("corners",), tmp_path)